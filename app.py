@@ -1,20 +1,42 @@
 import os
 import sys
-import subprocess
-from urllib.request import urlopen
-from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QStackedWidget, QFocusFrame, QProgressBar, QTabWidget
-from PySide6.QtCore import Qt, QTimer, QSize
-from PySide6.QtGui import QIcon, QPixmap, QColor, QImage
-from terminal_widget import TerminalWidget
-from config_pages import (NetworkConfig, BluetoothConfig, SoundConfig, BrightnessConfig, TimeConfig, UpdateConfig)
-from styles import get_stylesheet
+import gc
+import time
+import ctypes
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QStackedWidget, QFocusFrame, QProgressBar, QListView
+from PySide6.QtCore import Qt, QTimer, QSize, QAbstractAnimation, Signal, SIGNAL
+from PySide6.QtGui import QIcon, QPixmap, QColor, QPixmapCache
+import styles
+from styles import THEMES, apply_theme
+from page_registry import PageRegistry, LazyTabWidget
+from instrumentation import tracer, rss_kb
+from launcher_supervisor import LauncherSupervisor
+from image_loader import ImageLoader
+from launcher_catalog import LauncherCatalog, LauncherListModel, BUILTIN_LAUNCHERS
+from launcher_prewarm import LauncherPrewarm
+from banner import BannerWidget
+from system_services import PowerBackend
+from gamepad_input import GamepadInput
+from transitions import TransitionController
+from system_status import StatusSampler, StatusStrip
+
+PREBUILD_DELAY_MS = 2000
+PREWARM_DELAY_MS = 15000
 
 class MainApp(QMainWindow):
+    # Handled by main.py, which rebuilds the window inside the running QApplication
+    restart_requested = Signal()
+
     def __init__(self):
         super().__init__()
+        # One worker reads /proc and /sys for every status widget; it slows down when nobody is looking
+        self.system_status = StatusSampler(parent=self)
+        self.system_status.start()
+        QApplication.instance().focusChanged.connect(self.system_status.touch)
         self.setWindowTitle("LegendaryOS Session")
         self.showFullScreen()
-        self.setStyleSheet(get_stylesheet())
+        with tracer.phase("stylesheet"):
+            apply_theme(QApplication.instance())
         # Enable focus policy for gamepad/keyboard navigation
         self.setFocusPolicy(Qt.StrongFocus)
         central_widget = QWidget(self)
@@ -25,10 +47,10 @@ class MainApp(QMainWindow):
         sidebar = QWidget()
         sidebar_layout = QVBoxLayout(sidebar)
         sidebar.setFixedWidth(450)
-        sidebar.setStyleSheet("background-color: #1B2838; border-right: 8px solid #2A475E;")
+        sidebar.setObjectName("sidebar")
         title_label = QLabel("LegendaryOS Session")
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("font-size: 42px; color: #66C0F4; border-bottom: 8px solid #2A475E; padding: 35px;")
+        title_label.setObjectName("sessionTitle")
         sidebar_layout.addWidget(title_label)
         self.home_btn = QPushButton(QIcon(self.create_pixel_icon("#FFFFFF")), "Strona Główna")
         self.home_btn.clicked.connect(self.show_home)
@@ -50,7 +72,7 @@ class MainApp(QMainWindow):
         # Add version footer
         version_label = QLabel("v1.0.0")
         version_label.setAlignment(Qt.AlignCenter)
-        version_label.setStyleSheet("font-size: 18px; color: #C7D5E0; padding: 10px;")
+        version_label.setObjectName("versionLabel")
         sidebar_layout.addWidget(version_label)
         main_layout.addWidget(sidebar)
         # Content area container
@@ -61,62 +83,73 @@ class MainApp(QMainWindow):
         header_layout = QHBoxLayout()
         header_layout.addStretch()
         logo_label = QLabel()
-        logo_path = "/usr/share/LegendaryOS/Icons/LegendaryOS-nobackground.png"
-        logo_pixmap = QPixmap(logo_path)
-        if logo_pixmap.isNull():
-            logo_pixmap = QPixmap(100, 100)  # Fallback empty pixmap
-            logo_pixmap.fill(Qt.transparent)
-        logo_label.setPixmap(logo_pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        logo_label.setStyleSheet("padding: 10px;")
+        with tracer.phase("logo"):
+            logo_path = "/usr/share/LegendaryOS/Icons/LegendaryOS-nobackground.png"
+            logo_pixmap = QPixmap(logo_path)
+            if logo_pixmap.isNull():
+                logo_pixmap = QPixmap(100, 100)  # Fallback empty pixmap
+                logo_pixmap.fill(Qt.transparent)
+            logo_label.setPixmap(logo_pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        logo_label.setObjectName("logo")
         header_layout.addWidget(logo_label)
         content_layout.addLayout(header_layout)
         # Content stack
         self.content_stack = QStackedWidget()
-        self.content_stack.setStyleSheet("background-color: #0F1E2B;")
+        self.content_stack.setObjectName("content")
         content_layout.addWidget(self.content_stack)
         main_layout.addWidget(content_container)
-        # Home page enhanced
-        self.home_page = self.create_home_page()
-        self.content_stack.addWidget(self.home_page)
-        # Settings page
-        self.settings_page = self.create_settings_page()
-        self.content_stack.addWidget(self.settings_page)
-        # Launchers page
-        self.launchers_page = self.create_launchers_page()
-        self.content_stack.addWidget(self.launchers_page)
-        # Legendary menu page
-        self.legendary_page = self.create_legendary_page()
-        self.content_stack.addWidget(self.legendary_page)
+        self.images = ImageLoader(parent=self)
+        with tracer.phase("launcher_index"):
+            self.catalog = LauncherCatalog(parent=self)
+        # Pages are built on first show; only the home page is needed for the first frame
+        self.pages = PageRegistry(self.content_stack, self)
+        self.pages.register("home", self.create_home_page, pinned=True)
+        self.pages.register("settings", self.create_settings_page)
+        self.pages.register("launchers", self.create_launchers_page)
+        self.pages.register("legendary", self.create_legendary_page)
+        self.content_stack.setCurrentWidget(self.pages.get("home"))
+        QTimer.singleShot(PREBUILD_DELAY_MS, self, lambda: self.pages.prebuild(["launchers", "legendary", "settings"]))
+        # Once the pages are built and the session has settled, warm the page cache for likely launches
+        self.prewarm = LauncherPrewarm(self.catalog, parent=self)
+        QTimer.singleShot(PREWARM_DELAY_MS, self, self.start_prewarm)
         # Progress bar for loading/operations
         self.progress_bar = QProgressBar(self)
-        self.progress_bar.setStyleSheet("QProgressBar { background-color: #1B2838; border: 4px solid #2A475E; height: 20px; } QProgressBar::chunk { background-color: #66C0F4; }")
-        self.progress_bar.setRange(0, 0)  # Indeterminate
+        self.progress_bar.setObjectName("operationProgress")
         self.progress_bar.hide()
         self.statusBar().addWidget(self.progress_bar, 1)
+        # Only work that outlasts the threshold shows the bar; ready pages switch at once
+        self.transitions = TransitionController(self.content_stack, self.pages, self.progress_bar, parent=self)
+        self.transitions.switched.connect(self.system_status.touch)
+        self.launch_operation = None
+        self.power_operation = None
+        self.update_job = None
+        self.update_operation = None
+        self.suspended = False
+        self.paused_timers = []
+        self.paused_animations = []
+        self.suspend_history = []
+        # Launchers run under supervision so the session can come back when they exit
+        self.power = PowerBackend(parent=self)
+        self.power.succeeded.connect(self.on_power_done)
+        self.power.failed.connect(self.on_power_failed)
+        self.launcher = LauncherSupervisor(self)
+        self.launcher.first_window.connect(self.on_launcher_window)
+        self.launcher.finished.connect(self.on_launcher_finished)
+        self.launcher.failed.connect(self.on_launcher_failed)
         # Focus frame
         self.focus_frame = QFocusFrame(self)
         self.focus_frame.setWidget(self)
+        # Pads are read straight from evdev; B/Select goes home, Start opens the Legendary menu
+        self.gamepad = GamepadInput(self)
+        self.gamepad.back.connect(self.show_home)
+        self.gamepad.menu.connect(self.show_legendary_menu)
+        self.gamepad.start()
 
     def create_pixel_icon(self, color):
         pixmap = QPixmap(32, 32)
         pixmap.fill(QColor(color))
         return pixmap
 
-    def load_pixmap_from_url(self, url):
-        try:
-            data = urlopen(url).read()
-            image = QImage.fromData(data)
-            pixmap = QPixmap.fromImage(image)
-            if pixmap.isNull():
-                pixmap = QPixmap(64, 64)
-                pixmap.fill(Qt.transparent)
-            return pixmap
-        except Exception as e:
-            print(f"Error loading image from {url}: {e}")
-            pixmap = QPixmap(64, 64)
-            pixmap.fill(Qt.transparent)
-            return pixmap
-
     def create_home_page(self):
         home_page = QWidget()
         home_layout = QVBoxLayout(home_page)
@@ -124,68 +157,62 @@ class MainApp(QMainWindow):
         home_layout.setSpacing(20)
         welcome_label = QLabel("Witaj w LegendaryOS Session!")
         welcome_label.setAlignment(Qt.AlignCenter)
-        welcome_label.setStyleSheet("font-size: 40px; color: #EBEBEB;")
+        welcome_label.setProperty("role", "heading")
         home_layout.addWidget(welcome_label)
         sub_label = QLabel("Konfiguruj system z łatwością za pomocą gamepada lub klawiatury.")
         sub_label.setAlignment(Qt.AlignCenter)
-        sub_label.setStyleSheet("font-size: 26px; color: #66C0F4;")
+        sub_label.setProperty("role", "subheading")
         home_layout.addWidget(sub_label)
-        # Enhanced pixel art with fixed escape sequences using raw string
-        ascii_art = QLabel(r"""
- .--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--.
-/ .. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \
-\ \/\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ \/ /
- \/ /`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'\/ /
- / /\                                                                                                        / /\
-/ /\ \                                                                                                      / /\ \
-\ \/ /                                                                                                      \ \/ /
- \/ /                                                                                                        \/ /
- / /\      ██▓    ▓█████   ▄████ ▓█████  ███▄    █ ▓█████▄  ▄▄▄       ██▀███ ▓██   ██▓ ▒█████    ██████      / /\
-/ /\ \    ▓██▒    ▓█   ▀  ██▒ ▀█▒▓█   ▀  ██ ▀█   █ ▒██▀ ██▌▒████▄    ▓██ ▒ ██▒▒██  ██▒▒██▒  ██▒▒██    ▒     / /\ \
-\ \/ /    ▒██░    ▒███   ▒██░▄▄▄░▒███   ▓██  ▀█ ██▒░██   █▌▒██  ▀█▄  ▓██ ░▄█ ▒ ▒██ ██░▒██░  ██▒░ ▓██▄       \ \/ /
- \/ /     ▒██░    ▒▓█  ▄ ░▓█  ██▓▒▓█  ▄ ▓██▒  ▐▌██▒░▓█▄   ▌░██▄▄▄▄██ ▒██▀▀█▄   ░ ▐██▓░▒██   ██░  ▒   ██▒     \/ /
- / /\     ░██████▒░▒████▒░▒▓███▀▒░▒████▒▒██░   ▓██░░▒████▓  ▓█   ▓██▒░██▓ ▒██▒ ░ ██▒▓░░ ████▓▒░▒██████▒▒     / /\
-/ /\ \    ░ ▒░▓  ░░░ ▒░ ░ ░▒   ▒ ░░ ▒░ ░░ ▒░   ▒ ▒  ▒▒▓  ▒  ▒▒   ▓▒█░░ ▒▓ ░▒▓░  ██▒▒▒ ░ ▒░▒░▒░ ▒ ▒▓▒ ▒ ░    / /\ \
-\ \/ /    ░ ░ ▒  ░ ░ ░  ░  ░   ░  ░ ░  ░░ ░░   ░ ▒░ ░ ▒  ▒   ▒   ▒▒ ░  ░▒ ░ ▒░▓██ ░▒░   ░ ▒ ▒░ ░ ░▒  ░ ░    \ \/ /
- \/ /       ░ ░      ░   ░ ░   ░    ░      ░   ░ ░  ░ ░  ░   ░   ▒     ░░   ░ ▒ ▒ ░░  ░ ░ ░ ▒  ░  ░  ░       \/ /
- / /\         ░  ░   ░  ░      ░    ░  ░         ░    ░          ░  ░   ░     ░ ░         ░ ░        ░       / /\
-/ /\ \                                              ░                         ░ ░                           / /\ \
-\ \/ /      ██████ ▓█████   ██████   ██████  ██▓ ▒█████   ███▄    █                                         \ \/ /
- \/ /     ▒██    ▒ ▓█   ▀ ▒██    ▒ ▒██    ▒ ▓██▒▒██▒  ██▒ ██ ▀█   █                                          \/ /
- / /\     ░ ▓██▄   ▒███   ░ ▓██▄   ░ ▓██▄   ▒██▒▒██░  ██▒▓██  ▀█ ██▒                                         / /\
-/ /\ \      ▒   ██▒▒▓█  ▄   ▒   ██▒  ▒   ██▒░██░▒██   ██░▓██▒  ▐▌██▒                                        / /\ \
-\ \/ /    ▒██████▒▒░▒████▒▒██████▒▒▒██████▒▒░██░░ ████▓▒░▒██░   ▓██░                                        \ \/ /
- \/ /     ▒ ▒▓▒ ▒ ░░░ ▒░ ░▒ ▒▓▒ ▒ ░▒ ▒▓▒ ▒ ░░▓  ░ ▒░▒░▒░ ░ ▒░   ▒ ▒                                          \/ /
- / /\     ░ ░▒  ░ ░ ░ ░  ░░ ░▒  ░ ░░ ░▒  ░ ░ ▒ ░  ░ ▒ ▒░ ░ ░░   ░ ▒░                                         / /\
-/ /\ \    ░  ░  ░     ░   ░  ░  ░  ░  ░  ░   ▒ ░░ ░ ░ ▒     ░   ░ ░                                         / /\ \
-\ \/ /          ░     ░  ░      ░        ░   ░      ░ ░           ░                                         \ \/ /
- \/ /                                                                                                        \/ /
- / /\                                                                                                        / /\
-/ /\ \                                                                                                      / /\ \
-\ \/ /                                                                                                      \ \/ /
- \/ /                                                                                                        \/ /
- / /\.--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--./ /\
-/ /\ \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \/\ \
-\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `' /
- `--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'
-        """)
-        ascii_art.setAlignment(Qt.AlignCenter)
-        ascii_art.setStyleSheet("font-family: monospace; color: #2A475E; background-color: #1B2838; padding: 25px; border: 8px solid #66C0F4; border-radius: 0px;")
-        home_layout.addWidget(ascii_art)
-        home_layout.addStretch()
+        # Pre-rendered once and cached on disk; repaints just blit the image
+        ascii_art = BannerWidget()
+        home_layout.addWidget(ascii_art, 1)
+        home_layout.addWidget(StatusStrip(self.system_status))
         return home_page
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.system_status.set_visible(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.system_status.set_visible(False)
+
     def create_settings_page(self):
-        settings_page = QTabWidget()
-        settings_page.setStyleSheet("QTabWidget { background-color: #0F1E2B; } QTabBar { font-size: 26px; }")
-        settings_page.addTab(NetworkConfig(self), "Sieć")
-        settings_page.addTab(BluetoothConfig(self), "Bluetooth")
-        settings_page.addTab(SoundConfig(self), "Dźwięk")
-        settings_page.addTab(BrightnessConfig(self), "Jasność")
-        settings_page.addTab(TimeConfig(self), "Czas")
-        settings_page.addTab(UpdateConfig(self), "Aktualizacja")
+        # Config pages pull in their backends; nothing on the first frame needs them
+        from config_pages import (NetworkConfig, BluetoothConfig, SoundConfig, BrightnessConfig, TimeConfig, UpdateConfig)
+        settings_page = LazyTabWidget()
+        settings_page.setObjectName("settings")
+        settings_page.add_lazy_tab(lambda: NetworkConfig(self), "Sieć")
+        settings_page.add_lazy_tab(lambda: BluetoothConfig(self), "Bluetooth")
+        settings_page.add_lazy_tab(lambda: SoundConfig(self), "Dźwięk")
+        settings_page.add_lazy_tab(lambda: BrightnessConfig(self), "Jasność")
+        settings_page.add_lazy_tab(lambda: TimeConfig(self), "Czas")
+        settings_page.add_lazy_tab(lambda: UpdateConfig(self), "Aktualizacja")
+        self.track_update_job()
         return settings_page
 
+    def track_update_job(self):
+        # The update outlives its tab; while it runs the status bar shows how far it got on every page
+        from update_job import get_update_job
+        if self.update_job is not None:
+            return
+        self.update_job = get_update_job()
+        self.update_job.state_changed.connect(self.sync_update_operation)
+        self.update_job.progress.connect(self.show_update_progress)
+        self.sync_update_operation(self.update_job.is_running())
+
+    def sync_update_operation(self, running):
+        if running and self.update_operation is None:
+            self.update_operation = self.transitions.begin("update")
+            self.show_update_progress(*self.update_job.current_progress())
+        elif not running and self.update_operation:
+            self.update_operation.finish()
+            self.update_operation = None
+
+    def show_update_progress(self, phase, value, maximum):
+        if self.update_operation:
+            self.update_operation.progress(value, maximum)
+
     def create_launchers_page(self):
         launchers_page = QWidget()
         launchers_layout = QVBoxLayout(launchers_page)
@@ -193,41 +220,34 @@ class MainApp(QMainWindow):
         launchers_layout.setSpacing(30)
         launchers_label = QLabel("Launchery")
         launchers_label.setAlignment(Qt.AlignCenter)
-        launchers_label.setStyleSheet("font-size: 40px; color: #EBEBEB;")
+        launchers_label.setProperty("role", "heading")
         launchers_layout.addWidget(launchers_label)
         grid_layout = QHBoxLayout()
         grid_layout.setSpacing(50)
-        # Use local fallback icons to avoid HTTP 403 errors
-        lutris_pixmap = QPixmap(64, 64)
-        lutris_pixmap.fill(Qt.transparent)  # Fallback icon
-        lutris_btn = QPushButton(QIcon(lutris_pixmap), "Lutris")
-        lutris_btn.setIconSize(QSize(64, 64))
-        lutris_btn.clicked.connect(self.launch_lutris)
-        lutris_btn.setMinimumWidth(350)
-        grid_layout.addWidget(lutris_btn)
-        heroic_pixmap = QPixmap(64, 64)
-        heroic_pixmap.fill(Qt.transparent)
-        heroic_btn = QPushButton(QIcon(heroic_pixmap), "Heroic Games")
-        heroic_btn.setIconSize(QSize(64, 64))
-        heroic_btn.clicked.connect(self.launch_heroic)
-        heroic_btn.setMinimumWidth(350)
-        grid_layout.addWidget(heroic_btn)
-        steam_pixmap = QPixmap(64, 64)
-        steam_pixmap.fill(Qt.transparent)
-        steam_btn = QPushButton(QIcon(steam_pixmap), "Steam")
-        steam_btn.setIconSize(QSize(64, 64))
-        steam_btn.clicked.connect(self.launch_steam)
-        steam_btn.setMinimumWidth(350)
-        grid_layout.addWidget(steam_btn)
-        brave_pixmap = QPixmap(64, 64)
-        brave_pixmap.fill(Qt.transparent)
-        brave_btn = QPushButton(QIcon(brave_pixmap), "Brave")
-        brave_btn.setIconSize(QSize(64, 64))
-        brave_btn.clicked.connect(self.launch_brave)
-        brave_btn.setMinimumWidth(350)
-        grid_layout.addWidget(brave_btn)
+        # Tiles show a placeholder until the loader has decoded the art off the GUI thread
+        for name, launcher in BUILTIN_LAUNCHERS.items():
+            btn = QPushButton(launcher.label)
+            btn.setIconSize(QSize(64, 64))
+            btn.setIcon(QIcon(self.images.request(list(launcher.icons), 64, lambda pixmap, btn=btn: btn.setIcon(QIcon(pixmap)))))
+            btn.clicked.connect(lambda checked=False, name=name: self.launch(name))
+            btn.setMinimumWidth(350)
+            grid_layout.addWidget(btn)
         launchers_layout.addLayout(grid_layout)
-        launchers_layout.addStretch()
+        # Games found in .desktop files, Flatpak exports and Steam libraries, straight from the saved index
+        games = QListView()
+        games.setObjectName("launcherCatalog")
+        games.setViewMode(QListView.IconMode)
+        games.setResizeMode(QListView.Adjust)
+        games.setMovement(QListView.Static)
+        games.setUniformItemSizes(True)
+        games.setIconSize(QSize(96, 96))
+        games.setGridSize(QSize(260, 200))
+        games.setWordWrap(True)
+        games.setFocusPolicy(Qt.StrongFocus)
+        games.setModel(LauncherListModel(self.catalog, self.images, 96, games))
+        games.activated.connect(lambda index: self.launch(index.data(LauncherListModel.EntryRole).id))
+        launchers_layout.addWidget(games, 1)
+        self.catalog.start()
         return launchers_page
 
     def create_legendary_page(self):
@@ -237,7 +257,7 @@ class MainApp(QMainWindow):
         legendary_layout.setSpacing(30)
         legendary_label = QLabel("Legendary Menu")
         legendary_label.setAlignment(Qt.AlignCenter)
-        legendary_label.setStyleSheet("font-size: 40px; color: #EBEBEB;")
+        legendary_label.setProperty("role", "heading")
         legendary_layout.addWidget(legendary_label)
         shutdown_btn = QPushButton("Wyłącz Komputer")
         shutdown_btn.clicked.connect(self.shutdown)
@@ -245,53 +265,166 @@ class MainApp(QMainWindow):
         reboot_btn = QPushButton("Uruchom Ponownie Komputer")
         reboot_btn.clicked.connect(self.reboot)
         legendary_layout.addWidget(reboot_btn)
+        suspend_btn = QPushButton("Uśpij Komputer")
+        suspend_btn.clicked.connect(self.suspend_system)
+        legendary_layout.addWidget(suspend_btn)
+        theme_btn = QPushButton("Zmień Motyw")
+        theme_btn.clicked.connect(self.cycle_theme)
+        legendary_layout.addWidget(theme_btn)
         restart_app_btn = QPushButton("Uruchom Ponownie Aplikację")
         restart_app_btn.clicked.connect(self.restart_app)
         legendary_layout.addWidget(restart_app_btn)
         legendary_layout.addStretch()
         return legendary_page
 
-    def show_page_with_animation(self, page):
-        self.content_stack.setCurrentWidget(page)
-        self.progress_bar.show()
-        QTimer.singleShot(500, self.progress_bar.hide)
+    def cycle_theme(self):
+        names = list(THEMES)
+        apply_theme(QApplication.instance(), names[(names.index(styles.current_theme) + 1) % len(names)])
 
     def show_home(self):
-        self.show_page_with_animation(self.home_page)
+        self.transitions.switch_to("home")
 
     def show_settings(self):
-        self.show_page_with_animation(self.settings_page)
+        self.transitions.switch_to("settings")
 
     def show_launchers(self):
-        self.show_page_with_animation(self.launchers_page)
+        self.transitions.switch_to("launchers")
 
     def show_legendary_menu(self):
-        self.show_page_with_animation(self.legendary_page)
+        self.transitions.switch_to("legendary")
+
+    def launch(self, name):
+        entry = self.catalog.entry(name)
+        if entry is None:
+            return
+        program, *args = entry.command
+        if self.launcher.launch(name, program, args):
+            self.prewarm.stop()
+            self.prewarm.record_launch(name)
+            self.launch_operation = self.transitions.begin(f"launch.{name}")
+
+    def start_prewarm(self):
+        if not self.launcher.is_running():
+            self.prewarm.start()
 
-    def launch_lutris(self):
-        self.progress_bar.show()
-        QTimer.singleShot(1000, lambda: [self.close(), subprocess.run(["cage", "lutris"]), self.progress_bar.hide()])
+    def on_launcher_window(self, name, elapsed_ms):
+        # The launcher is on screen now; step aside without tearing anything down
+        self.end_launch_operation()
+        if elapsed_ms >= 0:
+            self.prewarm.record_first_window(name, elapsed_ms)
+        self.suspend_session()
 
-    def launch_heroic(self):
-        self.progress_bar.show()
-        QTimer.singleShot(1000, lambda: [self.close(), subprocess.run(["cage", "flatpak", "run", "com.heroicgameslauncher.hgl"]), self.progress_bar.hide()])
+    def end_launch_operation(self):
+        if self.launch_operation:
+            self.launch_operation.finish()
+            self.launch_operation = None
 
-    def launch_steam(self):
-        self.progress_bar.show()
-        QTimer.singleShot(1000, lambda: [self.close(), subprocess.run(["gamescope-session-plus", "steam"]), self.progress_bar.hide()])
+    def on_launcher_finished(self, name, exit_code, runtime):
+        self.end_launch_operation()
+        self.resume_session()
+        if exit_code != 0:
+            self.statusBar().showMessage(f"{name} zakończył się z kodem {exit_code}", 10000)
 
-    def launch_brave(self):
-        self.progress_bar.show()
-        QTimer.singleShot(1000, lambda: [self.close(), subprocess.run(["cage", "brave"]), self.progress_bar.hide()])
+    def on_launcher_failed(self, name, error):
+        self.end_launch_operation()
+        self.resume_session()
+        self.statusBar().showMessage(f"Nie udało się uruchomić {name}: {error}", 10000)
+
+    def suspend_session(self):
+        if self.suspended:
+            return
+        self.suspended = True
+        rss_before = rss_kb()
+        self.hide()
+        self.pages.release_idle(keep=0)
+        # The launcher owns the pads now
+        self.gamepad.stop()
+        # Stop everything that would wake the process, except the launcher's own watchdog
+        launcher_timers = set(self.launcher.findChildren(QTimer))
+        self.paused_timers = [timer for timer in self.findChildren(QTimer)
+                              if timer.isActive() and timer not in launcher_timers]
+        for timer in self.paused_timers:
+            timer.stop()
+        self.paused_animations = [animation for animation in self.findChildren(QAbstractAnimation)
+                                  if animation.state() == QAbstractAnimation.Running]
+        for animation in self.paused_animations:
+            animation.pause()
+        QPixmapCache.clear()
+        self.images.clear()
+        self.suspend_history.append({"rss_before_kb": rss_before, "rss_suspended_kb": None})
+        # Released pages are only deleted once the event loop runs again
+        QTimer.singleShot(0, self, self.trim_memory)
+
+    def trim_memory(self):
+        if not self.suspended:
+            return
+        gc.collect()
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+        self.suspend_history[-1]["rss_suspended_kb"] = rss_kb()
+
+    def resume_session(self):
+        if not self.suspended:
+            self.showFullScreen()
+            self.activateWindow()
+            return
+        start = time.perf_counter()
+        self.suspended = False
+        for timer in self.paused_timers:
+            timer.start()
+        for animation in self.paused_animations:
+            animation.resume()
+        self.paused_timers = []
+        self.paused_animations = []
+        self.gamepad.start()
+        self.showFullScreen()
+        self.activateWindow()
+        self.repaint()
+        entry = self.suspend_history[-1]
+        entry["restore_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        tracer.record("suspend", self.suspend_history)
+        if tracer.enabled:
+            print(f"Session restored in {entry['restore_ms']} ms "
+                  f"(RSS {entry['rss_before_kb']} kB before, {entry['rss_suspended_kb']} kB while suspended)")
 
     def shutdown(self):
-        self.progress_bar.show()
-        QTimer.singleShot(1000, lambda: [subprocess.run(["sudo", "shutdown", "0"]), self.progress_bar.hide()])
+        self.begin_power_operation("poweroff")
+        self.power.power_off()
 
     def reboot(self):
-        self.progress_bar.show()
-        QTimer.singleShot(1000, lambda: [subprocess.run(["sudo", "reboot"]), self.progress_bar.hide()])
+        self.begin_power_operation("reboot")
+        self.power.reboot()
+
+    def suspend_system(self):
+        self.begin_power_operation("suspend")
+        self.power.suspend()
+
+    def begin_power_operation(self, action):
+        if self.power_operation is None:
+            self.power_operation = self.transitions.begin(f"power.{action}")
+
+    def end_power_operation(self):
+        if self.power_operation:
+            self.power_operation.finish()
+            self.power_operation = None
+
+    def on_power_done(self, action):
+        self.end_power_operation()
+
+    def on_power_failed(self, action, error):
+        self.end_power_operation()
+        self.statusBar().showMessage(f"Nie udało się wykonać {action}: {error}", 10000)
 
     def restart_app(self):
-        self.progress_bar.show()
-        QTimer.singleShot(1000, lambda: [self.close(), os.execl(sys.executable, sys.executable, *sys.argv), self.progress_bar.hide()])
+        self.transitions.begin("restart")
+        if self.receivers(SIGNAL("restart_requested()")):
+            # Let the click handler return before this window is torn down
+            QTimer.singleShot(0, self, self.restart_requested.emit)
+        else:
+            self.hard_restart()
+
+    def hard_restart(self):
+        self.close()
+        os.execl(sys.executable, sys.executable, *sys.argv)
@@ -0,0 +1,173 @@
+import os
+import hashlib
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QSize, QRectF, QEvent
+from PySide6.QtGui import QPainter, QPixmap, QColor, QFont, QFontMetricsF, QPen
+from styles import theme_colors
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "legendaryos-session", "banner")
+SCALE_STEP = 0.05  # fitted scales are quantized so a resize drag doesn't re-render every pixel
+
+# Enhanced pixel art with fixed escape sequences using raw string
+BANNER_TEXT = r"""
+ .--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--.
+/ .. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \
+\ \/\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ \/ /
+ \/ /`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'\/ /
+ / /\                                                                                                        / /\
+/ /\ \                                                                                                      / /\ \
+\ \/ /                                                                                                      \ \/ /
+ \/ /                                                                                                        \/ /
+ / /\      ██▓    ▓█████   ▄████ ▓█████  ███▄    █ ▓█████▄  ▄▄▄       ██▀███ ▓██   ██▓ ▒█████    ██████      / /\
+/ /\ \    ▓██▒    ▓█   ▀  ██▒ ▀█▒▓█   ▀  ██ ▀█   █ ▒██▀ ██▌▒████▄    ▓██ ▒ ██▒▒██  ██▒▒██▒  ██▒▒██    ▒     / /\ \
+\ \/ /    ▒██░    ▒███   ▒██░▄▄▄░▒███   ▓██  ▀█ ██▒░██   █▌▒██  ▀█▄  ▓██ ░▄█ ▒ ▒██ ██░▒██░  ██▒░ ▓██▄       \ \/ /
+ \/ /     ▒██░    ▒▓█  ▄ ░▓█  ██▓▒▓█  ▄ ▓██▒  ▐▌██▒░▓█▄   ▌░██▄▄▄▄██ ▒██▀▀█▄   ░ ▐██▓░▒██   ██░  ▒   ██▒     \/ /
+ / /\     ░██████▒░▒████▒░▒▓███▀▒░▒████▒▒██░   ▓██░░▒████▓  ▓█   ▓██▒░██▓ ▒██▒ ░ ██▒▓░░ ████▓▒░▒██████▒▒     / /\
+/ /\ \    ░ ▒░▓  ░░░ ▒░ ░ ░▒   ▒ ░░ ▒░ ░░ ▒░   ▒ ▒  ▒▒▓  ▒  ▒▒   ▓▒█░░ ▒▓ ░▒▓░  ██▒▒▒ ░ ▒░▒░▒░ ▒ ▒▓▒ ▒ ░    / /\ \
+\ \/ /    ░ ░ ▒  ░ ░ ░  ░  ░   ░  ░ ░  ░░ ░░   ░ ▒░ ░ ▒  ▒   ▒   ▒▒ ░  ░▒ ░ ▒░▓██ ░▒░   ░ ▒ ▒░ ░ ░▒  ░ ░    \ \/ /
+ \/ /       ░ ░      ░   ░ ░   ░    ░      ░   ░ ░  ░ ░  ░   ░   ▒     ░░   ░ ▒ ▒ ░░  ░ ░ ░ ▒  ░  ░  ░       \/ /
+ / /\         ░  ░   ░  ░      ░    ░  ░         ░    ░          ░  ░   ░     ░ ░         ░ ░        ░       / /\
+/ /\ \                                              ░                         ░ ░                           / /\ \
+\ \/ /      ██████ ▓█████   ██████   ██████  ██▓ ▒█████   ███▄    █                                         \ \/ /
+ \/ /     ▒██    ▒ ▓█   ▀ ▒██    ▒ ▒██    ▒ ▓██▒▒██▒  ██▒ ██ ▀█   █                                          \/ /
+ / /\     ░ ▓██▄   ▒███   ░ ▓██▄   ░ ▓██▄   ▒██▒▒██░  ██▒▓██  ▀█ ██▒                                         / /\
+/ /\ \      ▒   ██▒▒▓█  ▄   ▒   ██▒  ▒   ██▒░██░▒██   ██░▓██▒  ▐▌██▒                                        / /\ \
+\ \/ /    ▒██████▒▒░▒████▒▒██████▒▒▒██████▒▒░██░░ ████▓▒░▒██░   ▓██░                                        \ \/ /
+ \/ /     ▒ ▒▓▒ ▒ ░░░ ▒░ ░▒ ▒▓▒ ▒ ░▒ ▒▓▒ ▒ ░░▓  ░ ▒░▒░▒░ ░ ▒░   ▒ ▒                                          \/ /
+ / /\     ░ ░▒  ░ ░ ░ ░  ░░ ░▒  ░ ░░ ░▒  ░ ░ ▒ ░  ░ ▒ ▒░ ░ ░░   ░ ▒░                                         / /\
+/ /\ \    ░  ░  ░     ░   ░  ░  ░  ░  ░  ░   ▒ ░░ ░ ░ ▒     ░   ░ ░                                         / /\ \
+\ \/ /          ░     ░  ░      ░        ░   ░      ░ ░           ░                                         \ \/ /
+ \/ /                                                                                                        \/ /
+ / /\                                                                                                        / /\
+/ /\ \                                                                                                      / /\ \
+\ \/ /                                                                                                      \ \/ /
+ \/ /                                                                                                        \/ /
+ / /\.--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--..--./ /\
+/ /\ \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \.. \/\ \
+\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `'\ `' /
+ `--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'`--'
+        """
+
+class BannerWidget(QWidget):
+    # Renders the text once into a device-pixel-ratio-aware pixmap; paints are a single blit
+    def __init__(self, text=BANNER_TEXT, border_width=8, padding=25, cache_dir=CACHE_DIR, parent=None):
+        super().__init__(parent)
+        self.text = text
+        self.lines = text.split("\n")
+        self.border_width = border_width
+        self.padding = padding
+        self.cache_dir = cache_dir
+        self.pixmap = None
+        self.pixmap_key = None
+        # Shaping ~37 lines and hashing the text is the expensive part; it only changes with the font
+        self.natural = None
+        self.content_key = None
+        self.scale = None
+        self.setObjectName("banner")
+
+    def banner_font(self):
+        font = QFont(self.font())
+        font.setStyleHint(QFont.Monospace)
+        return font
+
+    def natural_size(self):
+        if self.natural is None:
+            self.natural = self.measure()
+        return self.natural
+
+    def measure(self):
+        metrics = QFontMetricsF(self.banner_font())
+        width = max(metrics.horizontalAdvance(line) for line in self.lines)
+        height = metrics.lineSpacing() * len(self.lines)
+        frame = 2 * (self.padding + self.border_width)
+        return QSize(int(width + frame + 1), int(height + frame + 1))
+
+    def sizeHint(self):
+        return self.natural_size()
+
+    def minimumSizeHint(self):
+        return QSize(0, 0)
+
+    def fitted_scale(self):
+        natural = self.natural_size()
+        if natural.width() <= 0 or natural.height() <= 0:
+            return 1.0
+        scale = min(1.0, self.width() / natural.width(), self.height() / natural.height())
+        return max(SCALE_STEP, int(scale / SCALE_STEP) * SCALE_STEP)
+
+    def colors(self):
+        # Follows the active theme; a theme switch changes the key and triggers one re-render
+        theme = theme_colors()
+        return theme["border"], theme["panel"], theme["accent"]
+
+    def cache_key(self, scale, ratio):
+        if self.content_key is None:
+            parts = [self.text, self.banner_font().toString(), str(self.border_width), str(self.padding)]
+            self.content_key = hashlib.sha256("\0".join(parts).encode("utf8")).hexdigest()
+        parts = [self.content_key, *self.colors(), f"{scale:.2f}", f"{ratio:.2f}"]
+        return hashlib.sha256("\0".join(parts).encode("utf8")).hexdigest()
+
+    def ensure_pixmap(self):
+        if self.scale is None:
+            self.scale = self.fitted_scale()
+        scale = self.scale
+        ratio = self.devicePixelRatioF()
+        key = self.cache_key(scale, ratio)
+        if key == self.pixmap_key:
+            return self.pixmap
+        path = os.path.join(self.cache_dir, key + ".png")
+        pixmap = QPixmap()
+        if not pixmap.load(path):
+            pixmap = self.render_pixmap(scale, ratio)
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                pixmap.save(path, "PNG")
+            except OSError as e:
+                print(f"Error caching banner to {path}: {e}")
+        pixmap.setDevicePixelRatio(ratio)
+        self.pixmap = pixmap
+        self.pixmap_key = key
+        return pixmap
+
+    def render_pixmap(self, scale, ratio):
+        natural = self.natural_size()
+        color, background, border = self.colors()
+        pixmap = QPixmap(max(1, round(natural.width() * scale * ratio)), max(1, round(natural.height() * scale * ratio)))
+        pixmap.fill(QColor(background))
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.scale(scale * ratio, scale * ratio)
+        half = self.border_width / 2
+        painter.setPen(QPen(QColor(border), self.border_width))
+        painter.drawRect(QRectF(half, half, natural.width() - self.border_width, natural.height() - self.border_width))
+        painter.setFont(self.banner_font())
+        painter.setPen(QColor(color))
+        metrics = QFontMetricsF(self.banner_font())
+        inset = self.border_width + self.padding
+        width = natural.width() - 2 * inset
+        y = inset
+        for line in self.lines:
+            painter.drawText(QRectF(inset, y, width, metrics.lineSpacing()), Qt.AlignHCenter | Qt.AlignVCenter, line)
+            y += metrics.lineSpacing()
+        painter.end()
+        return pixmap
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.FontChange, QEvent.StyleChange):
+            self.natural = None
+            self.content_key = None
+            self.scale = None
+            self.updateGeometry()
+        super().changeEvent(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.scale = self.fitted_scale()
+
+    def paintEvent(self, event):
+        pixmap = self.ensure_pixmap()
+        ratio = pixmap.devicePixelRatio()
+        x = (self.width() - pixmap.width() / ratio) / 2
+        y = (self.height() - pixmap.height() / ratio) / 2
+        painter = QPainter(self)
+        painter.drawPixmap(int(x), int(y), pixmap)
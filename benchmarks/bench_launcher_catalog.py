@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication
+from launcher_catalog import LauncherCatalog, scan_directory
+
+DESKTOP_TEMPLATE = """[Desktop Entry]
+Type=Application
+Name=Game {index}
+Exec=/usr/games/game-{index} --fullscreen %U
+Icon=game-{index}
+Categories={categories}
+"""
+MANIFEST_TEMPLATE = """"AppState"
+{{
+\t"appid"\t\t"{appid}"
+\t"name"\t\t"Steam Game {appid}"
+\t"installdir"\t\t"Game{appid}"
+}}
+"""
+
+def populate(root, entries):
+    # Half .desktop files (a quarter of them non-games), half Steam manifests
+    applications = os.path.join(root, "applications")
+    steamapps = os.path.join(root, "steamapps")
+    os.makedirs(applications)
+    os.makedirs(steamapps)
+    for index in range(entries // 2):
+        categories = "Utility;" if index % 4 == 0 else "Game;ActionGame;"
+        with open(os.path.join(applications, f"game-{index}.desktop"), "w") as f:
+            f.write(DESKTOP_TEMPLATE.format(index=index, categories=categories))
+    for appid in range(1000, 1000 + entries - entries // 2):
+        with open(os.path.join(steamapps, f"appmanifest_{appid}.acf"), "w") as f:
+            f.write(MANIFEST_TEMPLATE.format(appid=appid))
+    return applications, steamapps
+
+def timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, round((time.perf_counter() - start) * 1000 / repeat, 3)
+
+def measure(entries, repeat):
+    root = tempfile.mkdtemp(prefix="bench-catalog-")
+    try:
+        applications, steamapps = populate(root, entries)
+        index_path = os.path.join(root, "index.json")
+        sources = {"desktop": [applications], "flatpak": [], "steam": [steamapps]}
+        cold, cold_ms = timed(lambda: {applications: scan_directory(applications, "desktop", {}),
+                                       steamapps: scan_directory(steamapps, "steam", {})})
+        catalog = LauncherCatalog(index_path, **sources)
+        catalog.files = cold
+        catalog.entries = catalog._collect()
+        _, save_ms = timed(catalog.save)
+        _, load_ms = timed(lambda: LauncherCatalog(index_path, **sources), repeat)
+        # Reconciling against the index only re-reads what changed since it was written
+        _, warm_ms = timed(lambda: scan_directory(applications, "desktop", cold[applications]), repeat)
+        with open(os.path.join(applications, "game-1.desktop"), "a") as f:
+            f.write("Comment=edited\n")
+        _, one_changed_ms = timed(lambda: scan_directory(applications, "desktop", cold[applications]))
+        return {
+            "entries": entries,
+            "catalog_entries": len(catalog.entries),
+            "index_bytes": os.path.getsize(index_path),
+            "cold_scan_ms": cold_ms,
+            "index_save_ms": save_ms,
+            "index_load_ms": load_ms,
+            "warm_rescan_ms": warm_ms,
+            "rescan_one_changed_ms": one_changed_ms,
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure launcher catalog scan, index and reload costs")
+    parser.add_argument("--entries", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    app = QCoreApplication(sys.argv[:1])
+    report = {"runs": [measure(entries, args.repeat) for entries in args.entries]}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
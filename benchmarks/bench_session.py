@@ -0,0 +1,299 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Stub system tools: fixed, fast answers so runs are comparable between versions and machines
+STUBS = {
+    "nmcli": """#!/bin/sh
+case "$*" in
+  *"wifi list"*)
+    echo '*:AA\\:BB\\:CC\\:DD\\:EE\\:01:Dom:72:WPA2:6'
+    echo ' :AA\\:BB\\:CC\\:DD\\:EE\\:02:Kawiarnia:40::11'
+    echo ' :AA\\:BB\\:CC\\:DD\\:EE\\:03:Sasiad:30:WPA2:1';;
+esac
+""",
+    "pactl": """#!/bin/sh
+case "$1" in
+  info) echo "Server Name: stub";;
+  get-sink-volume) echo "Volume: front-left: 32768 /  50% / -18 dB";;
+  subscribe) exec sleep 3600;;
+esac
+""",
+    "brightnessctl": """#!/bin/sh
+case "$1" in
+  get) echo 50;;
+  max) echo 100;;
+esac
+""",
+    "timedatectl": """#!/bin/sh
+case "$1" in
+  show) echo Europe/Warsaw;;
+esac
+""",
+    "bluetoothctl": """#!{python}
+import sys
+def out(text):
+    sys.stdout.write(text + "\\n")
+    sys.stdout.flush()
+for line in sys.stdin:
+    command = line.split()
+    if command == ["devices"]:
+        out("Device 11:22:33:44:55:66 Sluchawki")
+    elif command == ["scan", "on"]:
+        out("[CHG] Controller 00:00:00:00:00:01 Discovering: yes")
+        out("[NEW] Device AA:BB:CC:DD:EE:FF Pad")
+    elif command == ["scan", "off"]:
+        out("[CHG] Controller 00:00:00:00:00:01 Discovering: no")
+    elif command == ["quit"]:
+        break
+""",
+    "update-system": """#!/bin/sh
+echo ":: Synchronizing package databases..."
+echo ":: Retrieving packages..."
+i=1; while [ $i -le 300 ]; do echo " pkg-$i downloading ($i/300)"; i=$((i+1)); done
+echo ":: Starting full system upgrade..."
+i=1; while [ $i -le 3000 ]; do echo "($i/3000) upgrading pkg-$i"; i=$((i+1)); done
+echo ":: Running post-transaction hooks..."
+""",
+    # Launchers: start, stay up briefly, exit cleanly
+    "gamescope-session-plus": "#!/bin/sh\nsleep 0.2\n",
+    "cage": "#!/bin/sh\nsleep 0.2\n",
+}
+
+def install_stubs(directory):
+    bin_dir = os.path.join(directory, "bin")
+    os.makedirs(bin_dir)
+    for name, text in STUBS.items():
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as f:
+            f.write(text.replace("{python}", sys.executable))
+        os.chmod(path, 0o755)
+    return bin_dir
+
+def prepare_environment(directory):
+    # Must run before the session modules are imported: they resolve cache and log paths at import time
+    os.environ["PATH"] = install_stubs(directory) + os.pathsep + os.environ.get("PATH", "")
+    os.environ["HOME"] = os.path.join(directory, "home")
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    os.environ["LEGENDARYOS_TRACE"] = "1"
+    os.environ["LEGENDARYOS_TRACE_FILE"] = os.path.join(directory, "trace.json")
+    os.environ["LEGENDARYOS_PREWARM"] = "0"
+    os.environ["DBUS_SYSTEM_BUS_ADDRESS"] = "unix:path=" + os.path.join(directory, "no-bus")
+    os.makedirs(os.environ["HOME"])
+
+class Session:
+    def __init__(self, app, window, timeout_ms):
+        self.app = app
+        self.window = window
+        self.timeout_ms = timeout_ms
+        self.samples = {}
+        self.timeouts = []
+
+    def record(self, name, elapsed_ms):
+        self.samples.setdefault(name, []).append(elapsed_ms)
+
+    def wait(self, signal=None, predicate=None):
+        # Runs the real event loop until the signal fires or the predicate holds
+        from PySide6.QtCore import QEventLoop, QTimer
+        loop = QEventLoop()
+        done = []
+
+        def finish(*args):
+            done.append(True)
+            loop.quit()
+
+        if signal is not None:
+            signal.connect(finish)
+        poll = QTimer()
+        if predicate is not None:
+            poll.timeout.connect(lambda: predicate() and finish())
+            poll.start(1)
+        QTimer.singleShot(self.timeout_ms, loop.quit)
+        if not (predicate is not None and predicate()):
+            loop.exec()
+        poll.stop()
+        if signal is not None:
+            signal.disconnect(finish)
+        return bool(done) or (predicate is not None and predicate())
+
+    def measure(self, name, action, signal=None, predicate=None):
+        start = time.perf_counter()
+        action()
+        if (signal is not None or predicate is not None) and not self.wait(signal, predicate):
+            self.timeouts.append(name)
+            return
+        self.record(name, (time.perf_counter() - start) * 1000)
+
+    def wait_for_paint(self, widget):
+        from transitions import PaintWatcher
+        painted = []
+        PaintWatcher(widget, lambda: painted.append(True))
+        return lambda: bool(painted)
+
+    def settle(self, ms=100):
+        from PySide6.QtCore import QEventLoop, QTimer
+        loop = QEventLoop()
+        QTimer.singleShot(ms, loop.quit)
+        loop.exec()
+
+    def page_switches(self):
+        for name, show in (("launchers", self.window.show_launchers), ("legendary", self.window.show_legendary_menu),
+                           ("settings", self.window.show_settings), ("home", self.window.show_home)):
+            switched = []
+            handler = lambda page, elapsed: switched.append(elapsed) if page == name else None
+            self.window.transitions.switched.connect(handler)
+            show()
+            if self.wait(predicate=lambda: bool(switched)):
+                # The controller's own number: request to the first frame of the new page
+                self.record(f"page.{name}", switched[0])
+            else:
+                self.timeouts.append(f"page.{name}")
+            self.window.transitions.switched.disconnect(handler)
+
+    def settings_tabs(self):
+        self.window.show_settings()
+        self.settle()
+        tabs = self.window.pages.get("settings")
+        for index in list(range(1, tabs.count())) + [0]:
+            container = tabs.widget(index)
+            painted = self.wait_for_paint(container)
+            self.measure(f"tab.{index}", lambda: tabs.setCurrentIndex(index), predicate=painted)
+        return tabs
+
+    def drag(self, name, slider, steps):
+        slider.setSliderDown(True)
+        for value in range(0, 101, max(1, 100 // steps)):
+            self.measure(f"drag.{name}", lambda: (slider.setValue(value), self.app.processEvents()))
+        slider.setSliderDown(False)
+
+    def sliders(self, tabs):
+        sound, brightness = tabs.ensure_built(2), tabs.ensure_built(3)
+        self.drag("volume", sound.volume_slider, 50)
+        self.drag("brightness", brightness.bright_slider, 50)
+        self.settle(300)
+
+    def scans(self, tabs):
+        tabs.setCurrentIndex(0)
+        network = tabs.ensure_built(0)
+        self.wait(predicate=lambda: network.wifi_scanner.scan is None)
+        self.measure("scan.wifi", network.wifi_scanner.rescan, signal=network.wifi_scanner.scan_finished)
+        bluetooth = tabs.ensure_built(1)
+        self.measure("scan.bluetooth", bluetooth.controller.start_discovery,
+                     signal=bluetooth.controller.discovering_changed)
+        bluetooth.controller.stop_discovery()
+
+    def timezone_search(self, tabs):
+        time_page = tabs.ensure_built(4)
+        self.wait(predicate=lambda: time_page.zone_index is not None)
+        time_page.search_edit.clear()
+        for length in range(1, len("Europe/Wa") + 1):
+            self.measure("search.timezone", lambda: time_page.search_edit.setText("Europe/Wa"[:length]))
+        time_page.search_edit.clear()
+
+    def update(self, tabs):
+        update_page = tabs.ensure_built(5)
+        self.measure("update.run", update_page.update_system, signal=update_page.job.finished)
+
+    def launch(self):
+        from PySide6.QtCore import QProcess
+        supervisor = self.window.launcher
+        exited = []
+        # QProcess reports NotRunning before finished, so this brackets the session's own resume handling
+        on_state = lambda state: exited.append(time.perf_counter()) if state == QProcess.NotRunning else None
+        on_finished = lambda *args: self.record("launch.resume", (time.perf_counter() - exited[-1]) * 1000)
+        supervisor.process.stateChanged.connect(on_state)
+        supervisor.finished.connect(on_finished)
+        self.measure("launch.start", lambda: self.window.launch("steam"), signal=supervisor.started)
+        if not self.wait(signal=supervisor.finished):
+            self.timeouts.append("launch.resume")
+        supervisor.process.stateChanged.disconnect(on_state)
+        supervisor.finished.disconnect(on_finished)
+        self.settle()
+
+def summarize(samples):
+    result = {}
+    for name, values in sorted(samples.items()):
+        ordered = sorted(values)
+        result[name] = {
+            "count": len(values),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            "max_ms": round(ordered[-1], 3),
+        }
+    return result
+
+def peak_rss_kb():
+    # Linux reports ru_maxrss in kB; children are left out, forks inherit the parent's figure until exec
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def run(rounds, timeout_ms):
+    import instrumentation
+    from instrumentation import tracer
+    from PySide6.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+    import main
+    from command_runner import get_runner
+    start = time.perf_counter()
+    first_frame = []
+    window = main.create_window(app)
+    instrumentation.on_first_paint(window, lambda: first_frame.append((time.perf_counter() - start) * 1000))
+    window.show()
+    session = Session(app, window, timeout_ms)
+    session.wait(predicate=lambda: bool(first_frame))
+    for _ in range(rounds):
+        session.page_switches()
+        tabs = session.settings_tabs()
+        session.sliders(tabs)
+        session.scans(tabs)
+        session.timezone_search(tabs)
+        session.update(tabs)
+        session.launch()
+        window.show_home()
+        session.settle()
+    trace = tracer.report()
+    report = {
+        "rounds": rounds,
+        "first_frame_ms": {
+            "window": round(first_frame[0], 3) if first_frame else None,
+            "since_import": trace["marks"].get("first_frame"),
+        },
+        "interactions": summarize(session.samples),
+        "timeouts": session.timeouts,
+        "event_loop": trace["event_loop"],
+        "commands": get_runner().summary(),
+        "status_sampler": window.system_status.summary(),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+    window.close()
+    app.processEvents()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the session headlessly against stub system tools")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--timeout-ms", type=int, default=5000, help="give up waiting on one interaction after this")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp(prefix="bench-session-")
+    try:
+        prepare_environment(directory)
+        report = run(args.rounds, args.timeout_ms)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
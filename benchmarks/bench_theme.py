@@ -0,0 +1,114 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QSlider, QComboBox,
+                               QAbstractScrollArea)
+from PySide6.QtCore import Qt
+import styles
+
+# The inline sheets the pages used to set on individual widgets before the theme engine
+LEGACY_APP_SHEET = styles.STYLESHEET.substitute(styles.THEMES["steam"])
+LEGACY_CONTAINER = "background-color: #0F1E2B;"
+LEGACY_HEADING = "font-size: 40px; color: #EBEBEB;"
+LEGACY_SUBHEADING = "font-size: 26px; color: #66C0F4;"
+LEGACY_TITLE = "font-size: 36px;"
+LEGACY_TERMINAL = "background-color: #001020; color: #00FF80; border: 6px solid #004080; font-family: 'Courier New'; font-size: 18px;"
+
+def build_page(legacy):
+    page = QWidget()
+    layout = QVBoxLayout(page)
+    heading = QLabel("Nagłówek")
+    subheading = QLabel("Podtytuł")
+    title = QLabel("Tytuł strony")
+    terminal = QAbstractScrollArea()
+    if legacy:
+        page.setStyleSheet(LEGACY_CONTAINER)
+        heading.setStyleSheet(LEGACY_HEADING)
+        subheading.setStyleSheet(LEGACY_SUBHEADING)
+        title.setStyleSheet(LEGACY_TITLE)
+        terminal.setStyleSheet(LEGACY_TERMINAL)
+    else:
+        heading.setProperty("role", "heading")
+        subheading.setProperty("role", "subheading")
+        title.setProperty("role", "page-title")
+        terminal.setObjectName("terminal")
+    for widget in (heading, subheading, title):
+        widget.setAlignment(Qt.AlignCenter)
+        layout.addWidget(widget)
+    for index in range(4):
+        layout.addWidget(QPushButton(f"Przycisk {index}"))
+    slider = QSlider(Qt.Horizontal)
+    layout.addWidget(slider)
+    combo = QComboBox()
+    combo.addItems(["Europe/Warsaw", "Europe/London"])
+    layout.addWidget(combo)
+    layout.addWidget(terminal)
+    page.resize(1280, 900)
+    return page
+
+def polish(widget):
+    widget.ensurePolished()
+    for child in widget.findChildren(QWidget):
+        child.ensurePolished()
+
+def measure(app, legacy, pages):
+    app.setStyleSheet(LEGACY_APP_SHEET if legacy else styles.get_stylesheet())
+    app.processEvents()
+    build = polish_time = paint = 0.0
+    built = []
+    for _ in range(pages):
+        start = time.perf_counter()
+        page = build_page(legacy)
+        build += time.perf_counter() - start
+        start = time.perf_counter()
+        polish(page)
+        polish_time += time.perf_counter() - start
+        start = time.perf_counter()
+        page.grab()
+        paint += time.perf_counter() - start
+        built.append(page)
+    result = {
+        "build_ms": round(build * 1000 / pages, 3),
+        "polish_ms": round(polish_time * 1000 / pages, 3),
+        "first_paint_ms": round(paint * 1000 / pages, 3),
+    }
+    if not legacy:
+        start = time.perf_counter()
+        styles.apply_theme(app, "contrast")
+        for page in built:
+            polish(page)
+        styles.apply_theme(app, "steam")
+        for page in built:
+            polish(page)
+        result["theme_switch_ms"] = round((time.perf_counter() - start) * 1000 / 2, 3)
+    for page in built:
+        page.deleteLater()
+    app.processEvents()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-widget inline stylesheets with the compiled theme")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    app = QApplication(sys.argv[:1])
+    report = {
+        "pages": args.pages,
+        "inline": measure(app, True, args.pages),
+        "theme": measure(app, False, args.pages),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
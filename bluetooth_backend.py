@@ -0,0 +1,229 @@
+import re
+import codecs
+from dataclasses import dataclass, replace
+from PySide6.QtCore import QObject, QProcess, QTimer, Qt, Signal, QAbstractListModel, QModelIndex
+from command_runner import get_runner
+
+DISCOVERY_TIMEOUT_MS = 30000
+QUIT_GRACE_MS = 2000
+ANSI_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]|\x01|\x02")
+PROMPT_RE = re.compile(r"^\[[^\]]*\][#>]\s*")
+MAC = r"([0-9A-F]{2}(?::[0-9A-F]{2}){5})"
+EVENT_RE = re.compile(r"^(?:\[(NEW|DEL|CHG)\]\s+)?Device " + MAC + r"\s*(.*)$")
+CONTROLLER_RE = re.compile(r"^\[CHG\]\s+Controller \S+ Discovering: (yes|no)")
+INFO_RE = re.compile(r"^Device " + MAC + r"(?: \(\w+\))?$")
+PROPERTY_RE = re.compile(r"^(Name|Alias|Paired|Connected|Trusted|RSSI): (.*)$")
+# Current bluetoothctl prints "RSSI: 0xffffffc4 (-60)", older releases just "RSSI: -60"
+RSSI_RE = re.compile(r"\((-?\d+)\)|^(-?\d+)$|^0x([0-9a-fA-F]+)$")
+RESULT_RE = re.compile(r"^(Pairing successful|Connection successful|Successful disconnected|Failed to \w+.*)$")
+
+@dataclass(frozen=True)
+class BluetoothDevice:
+    mac: str
+    name: str
+    paired: bool = False
+    connected: bool = False
+    trusted: bool = False
+    rssi: int = None
+
+    def label(self):
+        state = "połączone" if self.connected else "sparowane" if self.paired else "dostępne"
+        return f"{self.name} [{state}]"
+
+def parse_rssi(value):
+    match = RSSI_RE.search(value.strip())
+    if not match:
+        return None
+    decimal = match.group(1) or match.group(2)
+    if decimal is not None:
+        return int(decimal)
+    number = int(match.group(3), 16) & 0xFFFFFFFF
+    return number - (1 << 32) if number >= 1 << 31 else number  # a bare hex value is a signed 32-bit int
+
+def clean_line(line):
+    return PROMPT_RE.sub("", ANSI_RE.sub("", line).replace("\r", "")).strip()
+
+class BluetoothController(QObject):
+    # One long-lived bluetoothctl session; its event stream keeps the device table current
+    device_changed = Signal(str)
+    device_removed = Signal(str)
+    discovering_changed = Signal(bool)
+    message = Signal(str)
+
+    def __init__(self, program="bluetoothctl", discovery_timeout=DISCOVERY_TIMEOUT_MS, parent=None):
+        super().__init__(parent)
+        self.program = program
+        self.devices = {}
+        self.discovering = False
+        self.info_mac = None
+        self.connect_after_pair = set()
+        self.decoder = codecs.getincrementaldecoder("utf8")(errors="replace")
+        self.pending = ""
+        self.process = self._create_process()
+        self.discovery_timer = QTimer(self)
+        self.discovery_timer.setSingleShot(True)
+        self.discovery_timer.setInterval(discovery_timeout)
+        self.discovery_timer.timeout.connect(self.stop_discovery)
+
+    def start(self):
+        if self.process.state() == QProcess.NotRunning:
+            get_runner().start_process(self.process, self.program)
+            self.send("devices")
+
+    def stop(self):
+        self.discovery_timer.stop()
+        if self.process.state() != QProcess.NotRunning:
+            if self.discovering:
+                self.send("scan off")
+            self.send("quit")
+            # bluetoothctl gets a moment to switch the scan off and quit; nothing here waits for it
+            self.process.readyReadStandardOutput.disconnect(self._handle_output)
+            self.process.errorOccurred.disconnect(self._handle_error)
+            get_runner().retire_process(self.process, QUIT_GRACE_MS)
+            self.process = self._create_process()
+            self.decoder = codecs.getincrementaldecoder("utf8")(errors="replace")
+            self.pending = ""
+            if self.discovering:
+                self.discovering = False
+                self.discovering_changed.emit(False)
+
+    def send(self, command):
+        self.process.write(command.encode("utf8") + b"\n")
+
+    def start_discovery(self):
+        # Never leave the radio scanning: discovery always ends on a timer
+        self.send("scan on")
+        self.discovery_timer.start()
+
+    def stop_discovery(self):
+        self.discovery_timer.stop()
+        self.send("scan off")
+
+    def connect_device(self, mac):
+        device = self.devices.get(mac)
+        if device and not device.paired:
+            self.connect_after_pair.add(mac)
+            self.send(f"pair {mac}")
+        else:
+            self.send(f"connect {mac}")
+
+    def disconnect_device(self, mac):
+        self.send(f"disconnect {mac}")
+
+    def feed(self, text):
+        self.pending += text
+        *lines, self.pending = self.pending.split("\n")
+        for line in lines:
+            self.handle_line(clean_line(line))
+
+    def handle_line(self, line):
+        if not line:
+            return
+        match = CONTROLLER_RE.match(line)
+        if match:
+            self.discovering = match.group(1) == "yes"
+            if not self.discovering:
+                self.discovery_timer.stop()
+            self.discovering_changed.emit(self.discovering)
+            return
+        match = INFO_RE.match(line)
+        if match:
+            # Start of an "info" block; its indented properties follow
+            self.info_mac = match.group(1)
+            return
+        match = PROPERTY_RE.match(line)
+        if match and self.info_mac:
+            self._set_property(self.info_mac, match.group(1), match.group(2))
+            return
+        match = EVENT_RE.match(line)
+        if match:
+            self.info_mac = None
+            kind, mac, rest = match.groups()
+            if kind == "DEL":
+                if self.devices.pop(mac, None):
+                    self.device_removed.emit(mac)
+            elif kind == "CHG":
+                prop = PROPERTY_RE.match(rest)
+                if prop:
+                    self._set_property(mac, prop.group(1), prop.group(2))
+            elif mac not in self.devices:
+                self.devices[mac] = BluetoothDevice(mac, rest or mac)
+                self.device_changed.emit(mac)
+                if kind is None:
+                    # Known from the initial listing: ask once for paired/connected state
+                    self.send(f"info {mac}")
+            return
+        match = RESULT_RE.match(line)
+        if match:
+            self._handle_result(line)
+
+    def _set_property(self, mac, name, value):
+        device = self.devices.get(mac) or BluetoothDevice(mac, mac)
+        if name in ("Name", "Alias"):
+            device = replace(device, name=value)
+        elif name == "RSSI":
+            device = replace(device, rssi=parse_rssi(value))
+        else:
+            device = replace(device, **{name.lower(): value.startswith("yes")})
+        if self.devices.get(mac) != device:
+            self.devices[mac] = device
+            self.device_changed.emit(mac)
+        if name == "Paired" and device.paired and mac in self.connect_after_pair:
+            self.connect_after_pair.discard(mac)
+            self.send(f"trust {mac}")
+            self.send(f"connect {mac}")
+
+    def _handle_result(self, line):
+        if line.startswith("Failed"):
+            self.connect_after_pair.clear()
+        self.message.emit(line)
+
+    def _create_process(self):
+        process = QProcess(self)
+        process.setProperty("monitor", True)
+        process.setProcessChannelMode(QProcess.MergedChannels)
+        process.readyReadStandardOutput.connect(self._handle_output)
+        process.errorOccurred.connect(self._handle_error)
+        return process
+
+    def _handle_output(self):
+        self.feed(self.decoder.decode(bytes(self.process.readAllStandardOutput())))
+
+    def _handle_error(self, error):
+        if error == QProcess.FailedToStart:
+            self.message.emit(f"Nie można uruchomić {self.program}: {self.process.errorString()}")
+
+class BluetoothListModel(QAbstractListModel):
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.order = []
+        controller.device_changed.connect(self._device_changed)
+        controller.device_removed.connect(self._device_removed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole:
+            return self.device(index.row()).label()
+        return None
+
+    def device(self, row):
+        return self.controller.devices[self.order[row]]
+
+    def _device_changed(self, mac):
+        if mac in self.order:
+            index = self.index(self.order.index(mac))
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+        else:
+            self.beginInsertRows(QModelIndex(), len(self.order), len(self.order))
+            self.order.append(mac)
+            self.endInsertRows()
+
+    def _device_removed(self, mac):
+        if mac in self.order:
+            row = self.order.index(mac)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.order[row]
+            self.endRemoveRows()
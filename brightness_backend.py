@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+from PySide6.QtCore import QObject, Signal
+from command_runner import get_runner
+
+BACKLIGHT_ROOT = "/sys/class/backlight"
+# Kernel guidance: prefer firmware over platform over raw interfaces
+BACKLIGHT_TYPES = {"firmware": 0, "platform": 1, "raw": 2}
+MAX_CACHE_S = 3600  # the panel's maximum doesn't change while the session runs
+LEVEL_CACHE_S = 2
+CLI_WRITE_TIMEOUT = 5
+
+def read_int(path):
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+def find_backlight(root=BACKLIGHT_ROOT):
+    try:
+        names = sorted(os.listdir(root))
+    except OSError:
+        return None
+    candidates = []
+    for name in names:
+        path = os.path.join(root, name)
+        if not read_int(os.path.join(path, "max_brightness")):
+            continue
+        try:
+            with open(os.path.join(path, "type")) as f:
+                kind = f.read().strip()
+        except OSError:
+            kind = ""
+        candidates.append((BACKLIGHT_TYPES.get(kind, len(BACKLIGHT_TYPES)), name, path))
+    return min(candidates)[2] if candidates else None
+
+class BrightnessBackend(QObject):
+    brightness_changed = Signal(int)
+
+    def __init__(self, root=BACKLIGHT_ROOT, max_rate=30, parent=None):
+        super().__init__(parent)
+        self.device = find_backlight(root)
+        self.min_interval = 1.0 / max_rate
+        self.max_brightness = None
+        self.level = None
+        self._fd = None
+        if self.device:
+            self.max_brightness = read_int(os.path.join(self.device, "max_brightness"))
+            try:
+                self._fd = os.open(os.path.join(self.device, "brightness"), os.O_RDWR)
+            except OSError:
+                self._fd = None
+            current = read_int(os.path.join(self.device, "actual_brightness"))
+            if current is None:
+                current = read_int(os.path.join(self.device, "brightness"))
+            if current is not None:
+                self.level = self.to_percent(current)
+        self.runner = get_runner()
+        self._cond = threading.Condition()
+        self._pending = None
+        self._refresh = False
+        self._running = True
+        self._last_write = 0.0
+        self._worker = threading.Thread(target=self._run, name="brightness-backend", daemon=True)
+        self._worker.start()
+
+    @property
+    def uses_sysfs(self):
+        return self._fd is not None
+
+    def to_percent(self, raw):
+        return round(raw * 100 / self.max_brightness)
+
+    def to_raw(self, percent):
+        return round(percent * self.max_brightness / 100)
+
+    def set_brightness(self, value):
+        with self._cond:
+            self._pending = value
+            self._cond.notify()
+
+    def refresh(self):
+        # sysfs was read synchronously on construction; only the CLI path needs a worker round-trip
+        if self.uses_sysfs:
+            if self.level is not None:
+                self.brightness_changed.emit(self.level)
+            return
+        with self._cond:
+            self._refresh = True
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._pending is None and not self._refresh:
+                    self._cond.wait()
+                if not self._running:
+                    break
+                # Cap the write rate; values arriving meanwhile replace each other
+                delay = self._last_write + self.min_interval - time.monotonic()
+                if delay > 0 and self._pending is not None:
+                    self._cond.wait(delay)
+                    continue
+                value, self._pending = self._pending, None
+                refresh, self._refresh = self._refresh, False
+            if value is not None:
+                self._apply(value)
+                self._last_write = time.monotonic()
+            if refresh:
+                self._query()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _apply(self, value):
+        if self._fd is not None:
+            try:
+                os.pwrite(self._fd, b"%d\n" % self.to_raw(value), 0)
+                self.level = value
+                return
+            except OSError as e:
+                print(f"Error writing {self.device}: {e}, falling back to brightnessctl")
+                os.close(self._fd)
+                self._fd = None
+        # One write at a time: the worker waits for brightnessctl to finish, so values can't land out of
+        # order, and whatever the slider sent meanwhile is coalesced into the next write
+        done = threading.Event()
+        results = []
+
+        def handle(result):
+            results.append(result)
+            done.set()
+
+        self.runner.run(["brightnessctl", "set", f"{value}%"], handle, timeout=CLI_WRITE_TIMEOUT)
+        if not done.wait(CLI_WRITE_TIMEOUT + 1):
+            print("Error setting brightness: brightnessctl did not answer")
+            return
+        self.runner.invalidate(["brightnessctl", "get"])
+        result = results[0]
+        if result.ok:
+            self.level = value
+        else:
+            print(f"Error setting brightness: {result.error or result.stderr.strip()}")
+
+    def _query(self):
+        # Both answers are needed; the runner delivers them in order on the GUI thread
+        replies = {}
+
+        def collect(key):
+            def handle(result):
+                replies[key] = result
+                if len(replies) == 2:
+                    self._handle_query(replies["get"], replies["max"])
+            return handle
+
+        self.runner.run(["brightnessctl", "get"], collect("get"), timeout=5, cache_ttl=LEVEL_CACHE_S)
+        self.runner.run(["brightnessctl", "max"], collect("max"), timeout=5, cache_ttl=MAX_CACHE_S)
+
+    def _handle_query(self, current, maximum):
+        try:
+            self.max_brightness = int(maximum.stdout.strip())
+            self.level = self.to_percent(int(current.stdout.strip()))
+        except (ValueError, ZeroDivisionError) as e:
+            print(f"Error reading brightness: {current.error or maximum.error or e}")
+            return
+        self.brightness_changed.emit(self.level)
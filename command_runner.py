@@ -0,0 +1,214 @@
+import time
+import threading
+import subprocess
+from dataclasses import dataclass, replace
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, QProcess, QCoreApplication, QTimer, Qt, Signal
+from instrumentation import tracer
+
+MAX_WORKERS = 4
+DEFAULT_TIMEOUT = 30
+
+@dataclass
+class CommandResult:
+    args: tuple
+    exit_code: int = None
+    stdout: str = ""
+    stderr: str = ""
+    elapsed_ms: float = 0.0
+    error: str = None
+    timed_out: bool = False
+    cancelled: bool = False
+    cached: bool = False
+
+    @property
+    def ok(self):
+        return self.exit_code == 0 and not self.error
+
+class CommandHandle:
+    def __init__(self, runner, job, callback):
+        self.runner = runner
+        self.job = job
+        self.callback = callback
+
+    def cancel(self):
+        self.runner.cancel(self)
+
+class Job:
+    def __init__(self, args, timeout, cache_ttl):
+        self.args = args
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.handles = []
+        self.process = None
+        self.cancelled = False
+        self.future = None
+
+class CommandRunner(QObject):
+    # Runs one-shot commands on a bounded pool and delivers results on the GUI thread
+    _completed = Signal(object, object)
+
+    def __init__(self, max_workers=MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="command-runner")
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.cache = {}
+        self.stats = {}
+        self.streams = {}
+        self.spawns = 0
+        # Always queued, so callbacks never run before run() has returned its handle
+        self._completed.connect(self._deliver, Qt.QueuedConnection)
+
+    def run(self, args, callback=None, timeout=DEFAULT_TIMEOUT, cache_ttl=0):
+        # Safe to call from any thread; identical commands already running share one child
+        args = tuple(args)
+        with self.lock:
+            cached = self.cache.get(args)
+            if cache_ttl and cached and time.monotonic() - cached[0] < cache_ttl:
+                job = Job(args, timeout, cache_ttl)
+                handle = CommandHandle(self, job, callback)
+                job.handles.append(handle)
+                self._completed.emit(job, replace(cached[1], cached=True))
+                return handle
+            job = self.in_flight.get(args)
+            if job is None:
+                job = Job(args, timeout, cache_ttl)
+                self.in_flight[args] = job
+                job.future = self.pool.submit(self._execute, job)
+            handle = CommandHandle(self, job, callback)
+            job.handles.append(handle)
+            return handle
+
+    def invalidate(self, args):
+        # Call after a write that changes what a cached query would answer
+        with self.lock:
+            self.cache.pop(tuple(args), None)
+
+    def cancel(self, handle):
+        with self.lock:
+            job = handle.job
+            if handle in job.handles:
+                job.handles.remove(handle)
+            if job.handles or job.cancelled:
+                return
+            # Nobody is waiting for this command any more
+            job.cancelled = True
+            if self.in_flight.get(job.args) is job:
+                del self.in_flight[job.args]
+            process = job.process
+        if job.future:
+            job.future.cancel()
+        if process and process.poll() is None:
+            process.kill()
+
+    def start_process(self, process, program, args=None):
+        # Long-lived and streaming children stay QProcess-driven but are still counted and timed
+        if not process.property("runner_tracked"):
+            process.setProperty("runner_tracked", True)
+            process.finished.connect(lambda *_: self._process_done(process))
+            process.errorOccurred.connect(lambda error: error == QProcess.FailedToStart and self._process_done(process))
+        with self.lock:
+            self.spawns += 1
+            self.streams[id(process)] = ((program, *(args or [])), time.perf_counter())
+        process.start(program, list(args or []))
+
+    def retire_process(self, process, grace_ms=0):
+        # Takes over a child its owner is done with: killed after grace_ms if it hasn't exited by then and
+        # deleted once it has, so nobody waits on it and deleting the owner can't stall in ~QProcess
+        process.setParent(self)
+        if process.state() == QProcess.NotRunning:
+            process.deleteLater()
+            return
+        process.finished.connect(process.deleteLater)
+        if grace_ms:
+            QTimer.singleShot(grace_ms, process, process.kill)
+        else:
+            process.kill()
+
+    def summary(self):
+        with self.lock:
+            return {
+                "spawns": self.spawns,
+                "commands": {name: {**entry, "mean_ms": round(entry["total_ms"] / entry["count"], 3)}
+                             for name, entry in self.stats.items()},
+            }
+
+    def stop(self):
+        with self.lock:
+            jobs = list(self.in_flight.values())
+        for job in jobs:
+            for handle in list(job.handles):
+                self.cancel(handle)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _execute(self, job):
+        result = CommandResult(job.args)
+        start = time.perf_counter()
+        try:
+            with self.lock:
+                if job.cancelled:
+                    return
+                self.spawns += 1
+                job.process = subprocess.Popen(job.args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                               stderr=subprocess.PIPE, text=True, errors="replace")
+            try:
+                result.stdout, result.stderr = job.process.communicate(timeout=job.timeout)
+            except subprocess.TimeoutExpired:
+                job.process.kill()
+                result.stdout, result.stderr = job.process.communicate()
+                result.timed_out = True
+                result.error = f"timed out after {job.timeout} s"
+            result.exit_code = job.process.returncode
+        except OSError as e:
+            result.error = str(e)
+        result.cancelled = job.cancelled
+        result.elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        self._record(job.args, result.elapsed_ms)
+        try:
+            self._completed.emit(job, result)
+        except RuntimeError:
+            pass  # runner deleted during shutdown
+
+    def _process_done(self, process):
+        with self.lock:
+            entry = self.streams.pop(id(process), None)
+        if entry:
+            self._record(entry[0], (time.perf_counter() - entry[1]) * 1000)
+
+    def _record(self, args, elapsed_ms):
+        name = " ".join(args[:2])
+        with self.lock:
+            entry = self.stats.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + elapsed_ms, 3)
+            entry["max_ms"] = max(entry["max_ms"], round(elapsed_ms, 3))
+        tracer.record("commands", self.stats)
+
+    def _deliver(self, job, result):
+        with self.lock:
+            if not result.cached:
+                if self.in_flight.get(job.args) is job:
+                    del self.in_flight[job.args]
+                # Uncached runs of a cached query refresh the entry too, so it never lags a fresher answer
+                if result.ok and (job.cache_ttl or job.args in self.cache):
+                    self.cache[job.args] = (time.monotonic(), result)
+            handles = list(job.handles)
+        if job.cancelled:
+            return
+        for handle in handles:
+            if handle.callback:
+                try:
+                    handle.callback(result)
+                except RuntimeError:
+                    pass  # the widget waiting for it is gone
+
+_runner = None
+
+def get_runner():
+    # One service per process; it outlives soft restarts because main.py doesn't reload this module
+    global _runner
+    if _runner is None:
+        _runner = CommandRunner(parent=QCoreApplication.instance())
+        QCoreApplication.instance().aboutToQuit.connect(_runner.stop)
+    return _runner
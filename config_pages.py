@@ -1,8 +1,14 @@
 import os
-import subprocess
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QSlider, QComboBox, QScrollArea
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QSlider, QScrollArea, QListView, QLineEdit, QProgressBar
 from PySide6.QtCore import Qt
 from terminal_widget import TerminalWidget
+from volume_backend import VolumeBackend
+from brightness_backend import BrightnessBackend
+from network_model import WifiListModel, WifiScanner
+from bluetooth_backend import BluetoothController, BluetoothListModel
+from system_services import TimeBackend
+from update_job import get_update_job
+from timezone_index import TimezoneLoader, TimezoneModel, LetterWheel, system_timezone
 
 class NetworkConfig(QScrollArea):
     def __init__(self, parent=None):
@@ -11,7 +17,7 @@ class NetworkConfig(QScrollArea):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(40, 40, 40, 40)
         label = QLabel("Konfiguracja Internetu")
-        label.setStyleSheet("font-size: 36px;")
+        label.setProperty("role", "page-title")
         layout.addWidget(label)
         btn = QPushButton("Uruchom nmcli")
         btn.clicked.connect(self.config_network)
@@ -19,16 +25,48 @@ class NetworkConfig(QScrollArea):
         scan_btn = QPushButton("Skanuj Sieci WiFi")
         scan_btn.clicked.connect(self.scan_wifi)
         layout.addWidget(scan_btn)
+        # Networks stay in a live model; rescans only touch the rows that changed
+        self.wifi_model = WifiListModel(self)
+        self.wifi_scanner = WifiScanner(self.wifi_model, self)
+        self.wifi_list = QListView()
+        self.wifi_list.setModel(self.wifi_model)
+        self.wifi_list.setMinimumHeight(300)
+        self.wifi_list.setFocusPolicy(Qt.StrongFocus)
+        self.wifi_list.activated.connect(self.connect_wifi)
+        layout.addWidget(self.wifi_list)
+        self.password_edit = QLineEdit()
+        self.password_edit.setEchoMode(QLineEdit.Password)
+        self.password_edit.setPlaceholderText("Hasło (dla nowych zabezpieczonych sieci)")
+        layout.addWidget(self.password_edit)
         self.terminal = TerminalWidget()
         layout.addWidget(self.terminal)
         layout.addStretch()
         self.setWidget(widget)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.wifi_scanner.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.wifi_scanner.stop()
+
     def config_network(self):
         self.terminal.run_command("nmcli")
 
     def scan_wifi(self):
-        self.terminal.run_command("nmcli", ["device", "wifi", "list"])
+        self.wifi_scanner.rescan()
+
+    def connect_wifi(self, index):
+        network = self.wifi_model.network(index.row())
+        password = self.password_edit.text()
+        if network.secured and password:
+            # --ask makes nmcli prompt for the key, which it then reads from stdin
+            self.terminal.run_command("nmcli", ["--ask", "device", "wifi", "connect", network.bssid],
+                                      stdin=password + "\n")
+        else:
+            self.terminal.run_command("nmcli", ["device", "wifi", "connect", network.bssid])
+        self.password_edit.clear()
 
 class BluetoothConfig(QScrollArea):
     def __init__(self, parent=None):
@@ -37,18 +75,49 @@ class BluetoothConfig(QScrollArea):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(40, 40, 40, 40)
         label = QLabel("Konfiguracja Bluetooth")
-        label.setStyleSheet("font-size: 36px;")
+        label.setProperty("role", "page-title")
         layout.addWidget(label)
-        btn = QPushButton("Uruchom bluetoothctl")
-        btn.clicked.connect(self.config_bluetooth)
-        layout.addWidget(btn)
-        self.terminal = TerminalWidget()
-        layout.addWidget(self.terminal)
+        self.scan_btn = QPushButton("Szukaj urządzeń")
+        self.scan_btn.clicked.connect(self.config_bluetooth)
+        layout.addWidget(self.scan_btn)
+        self.controller = BluetoothController(parent=self)
+        self.controller.discovering_changed.connect(self.sync_discovering)
+        self.controller.message.connect(self.show_message)
+        QApplication.instance().aboutToQuit.connect(self.controller.stop)
+        self.device_model = BluetoothListModel(self.controller, self)
+        self.device_list = QListView()
+        self.device_list.setModel(self.device_model)
+        self.device_list.setMinimumHeight(400)
+        self.device_list.setFocusPolicy(Qt.StrongFocus)
+        self.device_list.activated.connect(self.toggle_device)
+        layout.addWidget(self.device_list)
+        self.status_label = QLabel("")
+        self.status_label.setProperty("role", "section")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
         layout.addStretch()
         self.setWidget(widget)
+        self.controller.start()
 
     def config_bluetooth(self):
-        self.terminal.run_command("bluetoothctl")
+        if self.controller.discovering:
+            self.controller.stop_discovery()
+        else:
+            self.controller.start_discovery()
+
+    def sync_discovering(self, discovering):
+        self.scan_btn.setText("Zatrzymaj wyszukiwanie" if discovering else "Szukaj urządzeń")
+
+    def toggle_device(self, index):
+        device = self.device_model.device(index.row())
+        if device.connected:
+            self.controller.disconnect_device(device.mac)
+        else:
+            self.show_message(f"Łączenie z {device.name}...")
+            self.controller.connect_device(device.mac)
+
+    def show_message(self, text):
+        self.status_label.setText(text)
 
 class SoundConfig(QScrollArea):
     def __init__(self, parent=None):
@@ -57,7 +126,7 @@ class SoundConfig(QScrollArea):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(40, 40, 40, 40)
         label = QLabel("Konfiguracja Dźwięku")
-        label.setStyleSheet("font-size: 36px;")
+        label.setProperty("role", "page-title")
         layout.addWidget(label)
         btn = QPushButton("Pokaż info pactl")
         btn.clicked.connect(self.config_sound)
@@ -66,23 +135,33 @@ class SoundConfig(QScrollArea):
         layout.addWidget(self.terminal)
 
         volume_label = QLabel("Głośność")
-        volume_label.setStyleSheet("font-size: 28px;")
+        volume_label.setProperty("role", "section")
         layout.addWidget(volume_label)
         self.volume_slider = QSlider(Qt.Horizontal)
         self.volume_slider.setRange(0, 100)
-        self.volume_slider.setValue(50)
         self.volume_slider.valueChanged.connect(self.set_volume)
         self.volume_slider.setMinimumHeight(70)
         layout.addWidget(self.volume_slider)
+        self.volume_backend = VolumeBackend(parent=self)
+        self.volume_backend.volume_changed.connect(self.sync_volume)
+        QApplication.instance().aboutToQuit.connect(self.volume_backend.stop)
 
         layout.addStretch()
         self.setWidget(widget)
 
     def config_sound(self):
-        self.terminal.run_command("pactl info")
+        self.terminal.run_command("pactl", ["info"])
 
     def set_volume(self, value):
-        subprocess.run(["pactl", "set-sink-volume", "@DEFAULT_SINK@", f"{value}%"])
+        self.volume_backend.set_volume(value)
+
+    def sync_volume(self, value):
+        # Don't yank the handle away while the user is dragging it
+        if self.volume_slider.isSliderDown():
+            return
+        self.volume_slider.blockSignals(True)
+        self.volume_slider.setValue(value)
+        self.volume_slider.blockSignals(False)
 
 class BrightnessConfig(QScrollArea):
     def __init__(self, parent=None):
@@ -91,21 +170,34 @@ class BrightnessConfig(QScrollArea):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(40, 40, 40, 40)
         label = QLabel("Konfiguracja Jasności")
-        label.setStyleSheet("font-size: 36px;")
+        label.setProperty("role", "page-title")
         layout.addWidget(label)
 
         self.bright_slider = QSlider(Qt.Horizontal)
         self.bright_slider.setRange(0, 100)
-        self.bright_slider.setValue(50)
-        self.bright_slider.valueChanged.connect(self.set_brightness)
         self.bright_slider.setMinimumHeight(70)
         layout.addWidget(self.bright_slider)
+        self.brightness_backend = BrightnessBackend(parent=self)
+        self.brightness_backend.brightness_changed.connect(self.sync_brightness)
+        QApplication.instance().aboutToQuit.connect(self.brightness_backend.stop)
+        if self.brightness_backend.level is not None:
+            self.bright_slider.setValue(self.brightness_backend.level)
+        else:
+            self.brightness_backend.refresh()
+        self.bright_slider.valueChanged.connect(self.set_brightness)
 
         layout.addStretch()
         self.setWidget(widget)
 
     def set_brightness(self, value):
-        subprocess.run(["brightnessctl", "set", f"{value}%"])
+        self.brightness_backend.set_brightness(value)
+
+    def sync_brightness(self, value):
+        if self.bright_slider.isSliderDown():
+            return
+        self.bright_slider.blockSignals(True)
+        self.bright_slider.setValue(value)
+        self.bright_slider.blockSignals(False)
 
 class TimeConfig(QScrollArea):
     def __init__(self, parent=None):
@@ -114,24 +206,84 @@ class TimeConfig(QScrollArea):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(40, 40, 40, 40)
         label = QLabel("Konfiguracja Czasu/Kraju/Miasta")
-        label.setStyleSheet("font-size: 36px;")
+        label.setProperty("role", "page-title")
         layout.addWidget(label)
-        self.time_combo = QComboBox()
-        self.time_combo.addItems([
-            "Europe/Warsaw", "Europe/London", "Europe/Paris", "America/New_York",
-            "America/Los_Angeles", "Asia/Tokyo", "Asia/Seoul", "Australia/Sydney",
-            "Africa/Johannesburg", "America/Sao_Paulo", "Europe/Berlin", "Asia/Dubai"
-        ])  # Added more for expansion
-        layout.addWidget(self.time_combo)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Szukaj strefy (np. war, new york)")
+        self.search_edit.textChanged.connect(self.filter_zones)
+        layout.addWidget(self.search_edit)
+        self.letter_wheel = LetterWheel()
+        self.letter_wheel.letter_chosen.connect(lambda letter: self.search_edit.setText(self.search_edit.text() + letter))
+        self.letter_wheel.erase.connect(lambda: self.search_edit.setText(self.search_edit.text()[:-1]))
+        layout.addWidget(self.letter_wheel)
+        # The full zone list is scanned in the background; the view only materialises rows it shows
+        self.zone_index = None
+        self.current_zone = system_timezone()
+        self.zone_model = TimezoneModel(self)
+        self.zone_list = QListView()
+        self.zone_list.setModel(self.zone_model)
+        self.zone_list.setUniformItemSizes(True)
+        self.zone_list.setMinimumHeight(400)
+        self.zone_list.setFocusPolicy(Qt.StrongFocus)
+        self.zone_list.activated.connect(self.config_time)
+        layout.addWidget(self.zone_list)
         btn = QPushButton("Ustaw strefę czasową")
         btn.clicked.connect(self.config_time)
         layout.addWidget(btn)
+        self.status_label = QLabel("Wczytywanie stref czasowych...")
+        layout.addWidget(self.status_label)
         layout.addStretch()
         self.setWidget(widget)
+        self.time_backend = TimeBackend(parent=self)
+        self.time_backend.timezone_changed.connect(self.timezone_set)
+        self.time_backend.failed.connect(self.timezone_failed)
+        self.time_backend.current_timezone(self.sync_current_zone)
+        self.zone_loader = TimezoneLoader(parent=self)
+        self.zone_loader.loaded.connect(self.zones_loaded)
+        self.zone_loader.start()
+
+    def zones_loaded(self, index):
+        self.zone_index = index
+        self.status_label.setText(f"Strefa czasowa: {self.current_zone or '?'}")
+        self.filter_zones(self.search_edit.text())
+
+    def sync_current_zone(self, timezone):
+        if timezone:
+            self.current_zone = timezone
+        if self.zone_index:
+            self.status_label.setText(f"Strefa czasowa: {self.current_zone or '?'}")
+            self.select_zone(self.current_zone)
+
+    def filter_zones(self, text):
+        if self.zone_index is None:
+            return
+        self.zone_model.set_results(self.zone_index.search(text))
+        if not text:
+            self.select_zone(self.current_zone)
+        elif self.zone_model.rowCount():
+            self.zone_list.setCurrentIndex(self.zone_model.index(0))
+
+    def select_zone(self, timezone):
+        row = self.zone_model.row_of(timezone) if timezone else None
+        if row is not None:
+            index = self.zone_model.index(row)
+            self.zone_list.setCurrentIndex(index)
+            self.zone_list.scrollTo(index, QListView.PositionAtCenter)
 
     def config_time(self):
-        timezone = self.time_combo.currentText()
-        subprocess.run(["timedatectl", "set-timezone", timezone])
+        index = self.zone_list.currentIndex()
+        if not index.isValid():
+            return
+        timezone = self.zone_model.timezone(index.row())
+        self.status_label.setText(f"Ustawianie {timezone}...")
+        self.time_backend.set_timezone(timezone)
+
+    def timezone_set(self, timezone):
+        self.current_zone = timezone
+        self.status_label.setText(f"Strefa czasowa: {timezone}")
+
+    def timezone_failed(self, action, error):
+        self.status_label.setText(f"Błąd: {error}")
 
 class UpdateConfig(QScrollArea):
     def __init__(self, parent=None):
@@ -140,15 +292,50 @@ class UpdateConfig(QScrollArea):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(40, 40, 40, 40)
         label = QLabel("Aktualizacja Systemu")
-        label.setStyleSheet("font-size: 36px;")
+        label.setProperty("role", "page-title")
         layout.addWidget(label)
-        btn = QPushButton("Uruchom update-system")
-        btn.clicked.connect(self.update_system)
-        layout.addWidget(btn)
+        self.start_btn = QPushButton("Uruchom update-system")
+        self.start_btn.clicked.connect(self.update_system)
+        layout.addWidget(self.start_btn)
+        self.cancel_btn = QPushButton("Anuluj aktualizację")
+        self.cancel_btn.clicked.connect(self.cancel_update)
+        layout.addWidget(self.cancel_btn)
+        self.phase_label = QLabel("")
+        layout.addWidget(self.phase_label)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        layout.addWidget(self.progress_bar)
         self.terminal = TerminalWidget()
         layout.addWidget(self.terminal)
         layout.addStretch()
         self.setWidget(widget)
+        # The job outlives this page; attach to whatever it is doing right now
+        self.job = get_update_job()
+        self.job.output.connect(self.terminal.append_text)
+        self.job.progress.connect(self.show_progress)
+        self.job.state_changed.connect(self.sync_state)
+        self.job.finished.connect(self.update_finished)
+        self.terminal.append_text(self.job.backlog())
+        self.show_progress(*self.job.current_progress())
+        self.sync_state(self.job.is_running())
+        if not self.job.is_running() and self.job.status:
+            self.phase_label.setText(self.job.status)
 
     def update_system(self):
-        self.terminal.run_command("/usr/bin/update-system")
+        self.terminal.clear()
+        self.job.start()
+
+    def cancel_update(self):
+        self.job.cancel()
+
+    def sync_state(self, running):
+        self.start_btn.setEnabled(not running)
+        self.cancel_btn.setEnabled(running)
+
+    def show_progress(self, phase, value, maximum):
+        self.progress_bar.setValue(value)
+        if phase:
+            self.phase_label.setText(f"{phase} ({value * 100 // maximum}%)")
+
+    def update_finished(self, exit_code, status):
+        self.phase_label.setText(status)
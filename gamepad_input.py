@@ -0,0 +1,330 @@
+import os
+import time
+import glob
+import fcntl
+import struct
+from PySide6.QtCore import QObject, QSocketNotifier, QTimer, QFileSystemWatcher, QEvent, Qt, Signal
+from PySide6.QtGui import QKeyEvent
+from PySide6.QtWidgets import (QApplication, QAbstractButton, QAbstractItemView, QAbstractScrollArea, QAbstractSlider,
+                               QLineEdit, QTabBar, QWidget)
+from instrumentation import tracer
+
+INPUT_DIR = "/dev/input"
+EVENT = struct.Struct("llHHi")  # struct input_event: timeval, type, code, value
+ABSINFO = struct.Struct("6i")
+EV_SYN, EV_KEY, EV_ABS = 0, 1, 3
+ABS_X, ABS_Y, ABS_HAT0X, ABS_HAT0Y = 0x00, 0x01, 0x10, 0x11
+BTN_SOUTH, BTN_EAST, BTN_START, BTN_SELECT = 0x130, 0x131, 0x13B, 0x13A
+BTN_DPAD = {0x220: "up", 0x221: "down", 0x222: "left", 0x223: "right"}
+BUTTONS = {BTN_SOUTH: "accept", BTN_EAST: "back", BTN_START: "menu", BTN_SELECT: "back", **BTN_DPAD}
+DIRECTIONS = ("up", "down", "left", "right")
+KEY_FOR_ACTION = {"up": Qt.Key_Up, "down": Qt.Key_Down, "left": Qt.Key_Left, "right": Qt.Key_Right}
+STICK_THRESHOLD = 0.5  # fraction of the half-range a stick has to travel before it counts as a press
+# Repeat acceleration: first repeat after REPEAT_DELAY_MS, then each interval shrinks by REPEAT_ACCELERATION
+REPEAT_DELAY_MS = 350
+REPEAT_INTERVAL_MS = 150
+REPEAT_MIN_INTERVAL_MS = 40
+REPEAT_ACCELERATION = 0.8
+LATENCY_SAMPLES = 200
+
+def ioc(direction, number, size):
+    return (direction << 30) | (size << 16) | (ord("E") << 8) | number
+
+def eviocgbit(event_type, size):
+    return ioc(2, 0x20 + event_type, size)
+
+def eviocgabs(axis):
+    return ioc(2, 0x40 + axis, ABSINFO.size)
+
+def is_gamepad(fd):
+    keys = bytearray(0x300 // 8)
+    try:
+        fcntl.ioctl(fd, eviocgbit(EV_KEY, len(keys)), keys)
+    except OSError:
+        return False
+    return bool(keys[BTN_SOUTH // 8] & (1 << (BTN_SOUTH % 8)))
+
+def axis_ranges(fd):
+    ranges = {}
+    for axis in (ABS_X, ABS_Y, ABS_HAT0X, ABS_HAT0Y):
+        info = bytearray(ABSINFO.size)
+        try:
+            fcntl.ioctl(fd, eviocgabs(axis), info)
+        except OSError:
+            continue
+        _, minimum, maximum, _, _, _ = ABSINFO.unpack(info)
+        if maximum > minimum:
+            ranges[axis] = (minimum, maximum)
+    return ranges
+
+class GamepadDecoder:
+    # Pure translation from raw input_event records to (action, pressed, timestamp); no Qt, no devices
+    def __init__(self, ranges=None):
+        self.ranges = {ABS_X: (-32768, 32767), ABS_Y: (-32768, 32767), ABS_HAT0X: (-1, 1), ABS_HAT0Y: (-1, 1)}
+        self.ranges.update(ranges or {})
+        self.pending = b""
+        self.axis_state = {}
+
+    def feed(self, data):
+        data = self.pending + data
+        usable = len(data) - len(data) % EVENT.size
+        self.pending = data[usable:]
+        actions = []
+        for offset in range(0, usable, EVENT.size):
+            seconds, micros, kind, code, value = EVENT.unpack_from(data, offset)
+            actions += self.decode(kind, code, value, seconds + micros / 1e6)
+        return actions
+
+    def decode(self, kind, code, value, timestamp):
+        if kind == EV_KEY and code in BUTTONS and value in (0, 1):
+            return [(BUTTONS[code], value == 1, timestamp)]
+        if kind == EV_ABS and code in self.ranges:
+            return self._axis(code, value, timestamp)
+        return []
+
+    def _axis(self, code, value, timestamp):
+        minimum, maximum = self.ranges[code]
+        center = (minimum + maximum) / 2
+        position = (value - center) / ((maximum - minimum) / 2)
+        negative, positive = ("left", "right") if code in (ABS_X, ABS_HAT0X) else ("up", "down")
+        state = negative if position <= -STICK_THRESHOLD else positive if position >= STICK_THRESHOLD else None
+        previous = self.axis_state.get(code)
+        if state == previous:
+            return []
+        self.axis_state[code] = state
+        actions = []
+        if previous:
+            actions.append((previous, False, timestamp))
+        if state:
+            actions.append((state, True, timestamp))
+        return actions
+
+class GamepadDevice(QObject):
+    action = Signal(str, bool, float)
+    closed = Signal(str)
+
+    def __init__(self, path, fd=None, ranges=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.fd = fd if fd is not None else os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        self.decoder = GamepadDecoder(axis_ranges(self.fd) if ranges is None else ranges)
+        self.notifier = QSocketNotifier(self.fd, QSocketNotifier.Read, self)
+        self.notifier.activated.connect(self._read)
+
+    def close(self):
+        if self.fd is None:
+            return
+        self.notifier.setEnabled(False)
+        os.close(self.fd)
+        self.fd = None
+        self.closed.emit(self.path)
+
+    def _read(self):
+        chunks = []
+        while True:
+            try:
+                data = os.read(self.fd, EVENT.size * 64)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b""  # ENODEV: the pad was unplugged
+            if not data:
+                self.close()
+                break
+            chunks.append(data)
+            if len(data) < EVENT.size * 64:
+                break
+        for action, pressed, timestamp in self.decoder.feed(b"".join(chunks)):
+            self.action.emit(action, pressed, timestamp)
+
+class GamepadInput(QObject):
+    # Reads pads straight from evdev and turns them into focus moves and activations on the window
+    back = Signal()
+    menu = Signal()
+
+    def __init__(self, window, input_dir=INPUT_DIR, repeat_delay=REPEAT_DELAY_MS, repeat_interval=REPEAT_INTERVAL_MS,
+                 repeat_min=REPEAT_MIN_INTERVAL_MS, acceleration=REPEAT_ACCELERATION, parent=None):
+        super().__init__(parent or window)
+        self.window = window
+        self.input_dir = input_dir
+        self.repeat_delay = repeat_delay
+        self.repeat_interval = repeat_interval
+        self.repeat_min = repeat_min
+        self.acceleration = acceleration
+        self.devices = {}
+        self.ignored = set()
+        self.held = None
+        self.interval = repeat_interval
+        self.latencies = []
+        self.repeat_timer = QTimer(self)
+        self.repeat_timer.setSingleShot(True)
+        self.repeat_timer.setTimerType(Qt.PreciseTimer)
+        self.repeat_timer.timeout.connect(self._repeat)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.scan)
+
+    def start(self):
+        if os.path.isdir(self.input_dir):
+            self.watcher.addPath(self.input_dir)
+        self.scan()
+
+    def stop(self):
+        self.repeat_timer.stop()
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        for device in list(self.devices.values()):
+            device.close()
+
+    def scan(self):
+        # Hotplug: new event nodes are probed once; nodes that turned out not to be pads are remembered
+        present = set(glob.glob(os.path.join(self.input_dir, "event*")))
+        self.ignored &= present
+        for path in sorted(present - set(self.devices) - self.ignored):
+            try:
+                fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            except OSError:
+                continue  # not readable yet (udev is still fixing permissions) or gone again
+            if not is_gamepad(fd):
+                os.close(fd)
+                self.ignored.add(path)
+                continue
+            self.attach(GamepadDevice(path, fd, parent=self))
+
+    def attach(self, device):
+        self.devices[device.path] = device
+        device.action.connect(self.handle_action)
+        device.closed.connect(self._device_closed)
+        return device
+
+    def handle_action(self, action, pressed, timestamp):
+        if action in DIRECTIONS:
+            if pressed:
+                self.held = action
+                self.interval = self.repeat_interval
+                self.move(action, timestamp)
+                self.repeat_timer.start(self.repeat_delay)
+            elif self.held == action:
+                self.held = None
+                self.repeat_timer.stop()
+        elif pressed:
+            self.held = None
+            self.repeat_timer.stop()
+            if action == "accept":
+                self.activate(timestamp)
+            elif action == "back":
+                self.back.emit()
+            elif action == "menu":
+                self.menu.emit()
+
+    def move(self, direction, timestamp=None):
+        widget = QApplication.focusWidget()
+        if widget is not None and widget.window() is not self.window:
+            widget = None
+        consumed = False
+        # Buttons would only cycle through their siblings; they always move spatially
+        if widget is not None and not isinstance(widget, QAbstractButton) and self._handles(widget, direction):
+            # Lists, sliders and the letter wheel use the arrows themselves until they hit an edge
+            before = self._state(widget)
+            press = QKeyEvent(QEvent.KeyPress, KEY_FOR_ACTION[direction], Qt.NoModifier)
+            QApplication.sendEvent(widget, press)
+            QApplication.sendEvent(widget, QKeyEvent(QEvent.KeyRelease, KEY_FOR_ACTION[direction], Qt.NoModifier))
+            consumed = QApplication.focusWidget() is not widget or (
+                press.isAccepted() and (before is None or self._state(widget) != before))
+        if not consumed:
+            target = self.neighbour(widget, direction)
+            if target is not None:
+                target.setFocus(Qt.OtherFocusReason)
+        if timestamp is not None:
+            self._record_latency(timestamp)
+
+    def activate(self, timestamp=None):
+        widget = QApplication.focusWidget()
+        if isinstance(widget, QAbstractButton):
+            widget.click()
+        elif widget is not None:
+            QApplication.sendEvent(widget, QKeyEvent(QEvent.KeyPress, Qt.Key_Return, Qt.NoModifier))
+            QApplication.sendEvent(widget, QKeyEvent(QEvent.KeyRelease, Qt.Key_Return, Qt.NoModifier))
+        if timestamp is not None:
+            self._record_latency(timestamp)
+
+    def neighbour(self, widget, direction):
+        # Nearest focusable widget in the pressed direction; off-axis distance counts double
+        candidates = [w for w in self.window.findChildren(QWidget)
+                      if w is not widget and w.isVisible() and w.isEnabled() and w.focusPolicy() & Qt.TabFocus]
+        if widget is None:
+            return candidates[0] if candidates else None
+        origin = widget.mapTo(self.window, widget.rect().center())
+        best, best_score = None, None
+        for candidate in candidates:
+            if candidate.isAncestorOf(widget) or widget.isAncestorOf(candidate):
+                continue
+            point = candidate.mapTo(self.window, candidate.rect().center())
+            dx, dy = point.x() - origin.x(), point.y() - origin.y()
+            primary, secondary = {"up": (-dy, dx), "down": (dy, dx), "left": (-dx, dy), "right": (dx, dy)}[direction]
+            if primary <= 0:
+                continue
+            score = primary + 2 * abs(secondary)
+            if best_score is None or score < best_score:
+                best, best_score = candidate, score
+        return best
+
+    def latency_summary(self):
+        if not self.latencies:
+            return {}
+        ordered = sorted(self.latencies)
+        return {
+            "count": len(ordered),
+            "mean_ms": round(sum(ordered) / len(ordered), 3),
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "max_ms": ordered[-1],
+        }
+
+    def _handles(self, widget, direction):
+        # One-axis controls leave the other axis to focus navigation, so moving past a slider never changes it
+        axis = getattr(widget, "gamepad_axis", None)
+        if axis is None and isinstance(widget, QAbstractSlider):
+            axis = "horizontal" if widget.orientation() == Qt.Horizontal else "vertical"
+        if axis == "horizontal":
+            return direction in ("left", "right")
+        if axis == "vertical":
+            return direction in ("up", "down")
+        return True
+
+    def _state(self, widget):
+        # Many widgets accept arrows even at their ends, so look at what actually moved;
+        # None means the widget's own accept/ignore is trusted
+        if isinstance(widget, QAbstractItemView):
+            index = widget.currentIndex()
+            return index.row(), index.column()
+        if isinstance(widget, QAbstractScrollArea):
+            return widget.horizontalScrollBar().value(), widget.verticalScrollBar().value()
+        if isinstance(widget, QAbstractSlider):
+            return widget.value()
+        if isinstance(widget, QLineEdit):
+            return widget.cursorPosition()
+        if isinstance(widget, QTabBar):
+            return widget.currentIndex()
+        return None
+
+    def _repeat(self):
+        if self.held is None:
+            return
+        self.move(self.held)
+        self.interval = max(self.repeat_min, int(self.interval * self.acceleration))
+        self.repeat_timer.start(self.interval)
+
+    def _record_latency(self, timestamp):
+        # Kernel event timestamps are CLOCK_REALTIME by default
+        latency = round((time.time() - timestamp) * 1000, 3)
+        if latency < 0 or latency > 10000:
+            return  # replayed or synthetic timestamps
+        self.latencies = (self.latencies + [latency])[-LATENCY_SAMPLES:]
+        tracer.record("input_latency", self.latency_summary())
+
+    def _device_closed(self, path):
+        device = self.devices.pop(path, None)
+        if device:
+            device.deleteLater()
+        if self.held:
+            self.held = None
+            self.repeat_timer.stop()
@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "legendaryos-session", "images")
+ICON_DIR = "/usr/share/LegendaryOS/Icons"
+MEMORY_LIMIT = 32 * 1024 * 1024
+MAX_WORKERS = 4
+REVALIDATE_AFTER = 7 * 24 * 3600
+FETCH_TIMEOUT = 10
+RETRY_FAILED_AFTER = 300  # missing art is asked for on every paint; don't re-read or re-fetch it each time
+
+def is_remote(source):
+    return source.startswith(("http://", "https://"))
+
+class DiskCache:
+    # refs/<sha256(url)>.json points at blobs/<sha256(content)>; blobs are verified on read
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+        self.refs = os.path.join(root, "refs")
+        self.blobs = os.path.join(root, "blobs")
+
+    def ref_path(self, url):
+        return os.path.join(self.refs, hashlib.sha256(url.encode("utf8")).hexdigest() + ".json")
+
+    def lookup(self, url):
+        try:
+            with open(self.ref_path(url)) as f:
+                ref = json.load(f)
+            blob = os.path.join(self.blobs, ref["sha256"])
+            with open(blob, "rb") as f:
+                data = f.read()
+        except (OSError, ValueError, KeyError):
+            return None, None
+        if hashlib.sha256(data).hexdigest() != ref["sha256"]:
+            # Drop it, or store() would keep the damaged blob because the name already exists
+            try:
+                os.unlink(blob)
+            except OSError:
+                pass
+            return None, None
+        return ref, data
+
+    def store(self, url, data, headers):
+        digest = hashlib.sha256(data).hexdigest()
+        ref = {
+            "url": url,
+            "sha256": digest,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched": time.time(),
+        }
+        try:
+            os.makedirs(self.refs, exist_ok=True)
+            os.makedirs(self.blobs, exist_ok=True)
+            blob = os.path.join(self.blobs, digest)
+            if not os.path.exists(blob):
+                self._write_atomic(blob, data)
+            self._write_atomic(self.ref_path(url), json.dumps(ref).encode("utf8"))
+        except OSError as e:
+            print(f"Error caching {url}: {e}")
+        return ref
+
+    def touch(self, url, ref):
+        ref["fetched"] = time.time()
+        try:
+            self._write_atomic(self.ref_path(url), json.dumps(ref).encode("utf8"))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _write_atomic(path, data):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            os.unlink(tmp)
+            raise
+
+class ImageLoader(QObject):
+    # Emitted from pool threads, delivered on the GUI thread
+    _decoded = Signal(object, QImage)
+
+    def __init__(self, cache_dir=CACHE_DIR, memory_limit=MEMORY_LIMIT, max_workers=MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self.disk = DiskCache(cache_dir)
+        self.memory_limit = memory_limit
+        self.memory_used = 0
+        self.pixmaps = OrderedDict()
+        self.pending = {}
+        self.failed = {}
+        self.placeholders = {}
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-loader")
+        self._decoded.connect(self._deliver)
+
+    def request(self, sources, size, callback=None):
+        # Returns the cached pixmap or a placeholder right away; callback gets the real one later
+        if isinstance(sources, str):
+            sources = [sources]
+        size = QSize(size) if isinstance(size, QSize) else QSize(size, size)
+        key = (tuple(sources), size.width(), size.height())
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            return pixmap
+        failed_at = self.failed.get(key)
+        if failed_at is not None and time.monotonic() - failed_at < RETRY_FAILED_AFTER:
+            return self.placeholder(size)
+        if key in self.pending:
+            if callback:
+                self.pending[key].append(callback)
+        else:
+            self.pending[key] = [callback] if callback else []
+            self.pool.submit(self._load, key)
+        return self.placeholder(size)
+
+    def placeholder(self, size):
+        key = (size.width(), size.height())
+        if key not in self.placeholders:
+            pixmap = QPixmap(size)
+            pixmap.fill(Qt.transparent)
+            self.placeholders[key] = pixmap
+        return self.placeholders[key]
+
+    def clear(self):
+        self.pixmaps.clear()
+        self.failed.clear()
+        self.memory_used = 0
+
+    def stop(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self, key):
+        sources, width, height = key
+        image = QImage()
+        for source in sources:
+            try:
+                data = self._fetch(source)
+            except Exception as e:
+                print(f"Error loading image from {source}: {e}")
+                continue
+            if data and image.loadFromData(data):
+                break
+        if not image.isNull():
+            image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        try:
+            self._decoded.emit(key, image)
+        except RuntimeError:
+            pass  # loader was deleted while we were decoding
+
+    def _fetch(self, source):
+        if source.startswith("file://"):
+            source = source[len("file://"):]
+        if not is_remote(source):
+            if not os.path.isfile(source):
+                return None
+            with open(source, "rb") as f:
+                return f.read()
+        from urllib.request import Request, urlopen
+        from urllib.error import HTTPError
+        ref, cached = self.disk.lookup(source)
+        if cached is not None and time.time() - ref["fetched"] < REVALIDATE_AFTER:
+            return cached
+        request = Request(source, headers={"User-Agent": "LegendaryOS-Session"})
+        if ref and ref.get("etag"):
+            request.add_header("If-None-Match", ref["etag"])
+        if ref and ref.get("last_modified"):
+            request.add_header("If-Modified-Since", ref["last_modified"])
+        try:
+            with urlopen(request, timeout=FETCH_TIMEOUT) as response:
+                data = response.read()
+                self.disk.store(source, data, response.headers)
+                return data
+        except HTTPError as e:
+            if e.code == 304 and cached is not None:
+                self.disk.touch(source, ref)
+                return cached
+            if cached is not None:
+                return cached
+            raise
+        except OSError:
+            # Offline: stale art beats no art
+            if cached is not None:
+                return cached
+            raise
+
+    def _deliver(self, key, image):
+        callbacks = self.pending.pop(key, [])
+        if image.isNull():
+            self.failed[key] = time.monotonic()
+            return
+        self.failed.pop(key, None)
+        pixmap = QPixmap.fromImage(image)
+        self.pixmaps[key] = pixmap
+        self.memory_used += pixmap.width() * pixmap.height() * 4
+        while self.memory_used > self.memory_limit and len(self.pixmaps) > 1:
+            _, evicted = self.pixmaps.popitem(last=False)
+            self.memory_used -= evicted.width() * evicted.height() * 4
+        for callback in callbacks:
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                pass  # the widget waiting for it is gone
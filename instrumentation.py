@@ -0,0 +1,150 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Import this module first: every timestamp is relative to this point
+PROCESS_START = time.perf_counter()
+DEFAULT_TRACE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "legendaryos-session", "trace.json")
+LOOP_INTERVAL_MS = 16
+STALL_THRESHOLD_MS = 50
+
+def rss_kb(path="/proc/self/status"):
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def flag_enabled(flag, env):
+    return flag in sys.argv or os.environ.get(env, "") not in ("", "0")
+
+class Tracer:
+    def __init__(self):
+        self.enabled = flag_enabled("--trace", "LEGENDARYOS_TRACE")
+        self.overlay = flag_enabled("--trace-overlay", "LEGENDARYOS_TRACE_OVERLAY")
+        self.enabled = self.enabled or self.overlay
+        self.path = os.environ.get("LEGENDARYOS_TRACE_FILE", DEFAULT_TRACE_FILE)
+        self.phases = []
+        self.marks = {}
+        self.stats = {}
+        self.stalls = []
+        self.max_stall_ms = 0.0
+        self.loop_ticks = 0
+
+    def now_ms(self):
+        return (time.perf_counter() - PROCESS_START) * 1000
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = self.now_ms()
+        try:
+            yield
+        finally:
+            self.phases.append({"name": name, "start_ms": round(start, 3), "duration_ms": round(self.now_ms() - start, 3)})
+
+    def mark(self, name):
+        if self.enabled and name not in self.marks:
+            self.marks[name] = round(self.now_ms(), 3)
+
+    def record(self, name, value):
+        if self.enabled:
+            self.stats[name] = value
+
+    def record_stall(self, drift_ms):
+        self.loop_ticks += 1
+        self.max_stall_ms = max(self.max_stall_ms, drift_ms)
+        if drift_ms >= STALL_THRESHOLD_MS:
+            self.stalls.append({"at_ms": round(self.now_ms(), 3), "stall_ms": round(drift_ms, 3)})
+
+    def report(self):
+        return {
+            "pid": os.getpid(),
+            "phases": self.phases,
+            "marks": self.marks,
+            "stats": self.stats,
+            "event_loop": {
+                "interval_ms": LOOP_INTERVAL_MS,
+                "ticks": self.loop_ticks,
+                "max_stall_ms": round(self.max_stall_ms, 3),
+                "stalls": self.stalls,
+            },
+        }
+
+    def dump(self):
+        if not self.enabled:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(self.report(), f, indent=2)
+        except OSError as e:
+            print(f"Error writing trace to {self.path}: {e}")
+
+tracer = Tracer()
+
+def on_first_paint(window, callback):
+    # Qt is imported here so this module can be imported before PySide6
+    from PySide6.QtCore import QObject, QEvent
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                obj.removeEventFilter(self)
+                callback()
+            return False
+
+    window.installEventFilter(FirstPaintFilter(window))
+
+def install(app, window):
+    from PySide6.QtCore import QTimer, Qt
+    from PySide6.QtWidgets import QLabel
+
+    if not tracer.enabled:
+        return
+    on_first_paint(window, lambda: tracer.mark("first_frame"))
+    # Event-loop stalls show up as drift between when a tick was due and when it ran
+    timer = QTimer(window)
+    timer.setTimerType(Qt.PreciseTimer)
+    timer.setInterval(LOOP_INTERVAL_MS)
+    last = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        tracer.record_stall(max(0.0, (now - last[0]) * 1000 - LOOP_INTERVAL_MS))
+        last[0] = now
+
+    timer.timeout.connect(tick)
+    timer.start()
+    window.loop_monitor = timer
+    if tracer.overlay:
+        overlay = QLabel(window)
+        overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+        overlay.setObjectName("traceOverlay")
+        overlay.move(20, 20)
+
+        def refresh_overlay():
+            report = tracer.report()
+            lines = [f"first frame: {report['marks'].get('first_frame', '-')} ms"]
+            lines += [f"{p['name']}: {p['duration_ms']:.1f} ms" for p in report["phases"][-8:]]
+            lines.append(f"max stall: {report['event_loop']['max_stall_ms']:.1f} ms, stalls: {len(tracer.stalls)}")
+            overlay.setText("\n".join(lines))
+            overlay.adjustSize()
+            overlay.raise_()
+
+        overlay_timer = QTimer(overlay)
+        overlay_timer.setInterval(1000)
+        overlay_timer.timeout.connect(refresh_overlay)
+        overlay_timer.start()
+        overlay.show()
+    # A soft restart installs onto the new window; the dump only needs hooking once
+    if not app.property("trace_dump_connected"):
+        app.setProperty("trace_dump_connected", True)
+        app.aboutToQuit.connect(tracer.dump)
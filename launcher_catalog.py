@@ -0,0 +1,329 @@
+import os
+import re
+import glob
+import json
+import shlex
+import tempfile
+import threading
+from dataclasses import dataclass
+from PySide6.QtCore import QObject, QTimer, QFileSystemWatcher, QSize, Qt, Signal, QAbstractListModel, QModelIndex
+from image_loader import ICON_DIR
+
+HOME = os.path.expanduser("~")
+INDEX_PATH = os.path.join(HOME, ".cache", "legendaryos-session", "launchers.json")
+INDEX_VERSION = 2
+HICOLOR = "/usr/share/icons/hicolor/256x256/apps"
+FLATPAK_HICOLOR = "/var/lib/flatpak/exports/share/icons/hicolor/256x256/apps"
+FLATPAK_EXPORTS = ["/var/lib/flatpak/exports/share/applications",
+                   os.path.join(HOME, ".local", "share", "flatpak", "exports", "share", "applications")]
+STEAM_ROOTS = [os.path.join(HOME, ".local", "share", "Steam"), os.path.join(HOME, ".steam", "steam")]
+# Only games make it into the catalog; everything else stays reachable from the built-in launchers
+CATEGORIES = {"Game"}
+STEAM_SKIPPED = ("Proton", "Steam Linux Runtime", "Steamworks Common Redistributables")
+FIELD_CODE_RE = re.compile(r"%[fFuUdDnNickvm%]")
+VDF_PAIR_RE = re.compile(r'"([^"]*)"\s+"([^"]*)"')
+REFRESH_DELAY_MS = 500
+FETCH_BATCH = 64
+
+@dataclass(frozen=True)
+class LauncherEntry:
+    id: str
+    label: str
+    command: tuple
+    icons: tuple
+    source: str
+
+    def to_json(self):
+        return [self.id, self.label, list(self.command), list(self.icons), self.source]
+
+    @classmethod
+    def from_json(cls, data):
+        id, label, command, icons, source = data
+        return cls(id, label, tuple(command), tuple(icons), source)
+
+# Icons are tried in order; the LegendaryOS set wins over whatever the packages ship
+BUILTIN_LAUNCHERS = {
+    "lutris": LauncherEntry("lutris", "Lutris", ("cage", "lutris"),
+                            (os.path.join(ICON_DIR, "lutris.png"), os.path.join(HICOLOR, "net.lutris.Lutris.png"),
+                             os.path.join(HICOLOR, "lutris.png")), "builtin"),
+    "heroic": LauncherEntry("heroic", "Heroic Games", ("cage", "flatpak", "run", "com.heroicgameslauncher.hgl"),
+                            (os.path.join(ICON_DIR, "heroic.png"),
+                             os.path.join(FLATPAK_HICOLOR, "com.heroicgameslauncher.hgl.png")), "builtin"),
+    "steam": LauncherEntry("steam", "Steam", ("gamescope-session-plus", "steam"),
+                           (os.path.join(ICON_DIR, "steam.png"), os.path.join(HICOLOR, "steam.png"),
+                            "/usr/share/pixmaps/steam.png"), "builtin"),
+    "brave": LauncherEntry("brave", "Brave", ("cage", "brave"),
+                           (os.path.join(ICON_DIR, "brave.png"), os.path.join(HICOLOR, "brave-browser.png"),
+                            os.path.join(HICOLOR, "brave-desktop.png")), "builtin"),
+}
+
+def desktop_dirs():
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(HOME, ".local", "share")
+    data_dirs = (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+    return [os.path.join(directory, "applications") for directory in [data_home, *data_dirs] if directory]
+
+def steam_dirs(roots=STEAM_ROOTS):
+    # Every library listed in libraryfolders.vdf has its own steamapps directory
+    dirs = []
+    for root in roots:
+        steamapps = os.path.join(root, "steamapps")
+        libraries = [steamapps]
+        try:
+            with open(os.path.join(steamapps, "libraryfolders.vdf"), encoding="utf8", errors="replace") as f:
+                libraries += [os.path.join(value, "steamapps") for key, value in VDF_PAIR_RE.findall(f.read())
+                              if key == "path"]
+        except OSError:
+            pass
+        for directory in libraries:
+            real = os.path.realpath(directory)
+            if real not in dirs:
+                dirs.append(real)
+    return dirs
+
+def icon_candidates(icon):
+    if not icon:
+        return ()
+    if os.path.isabs(icon):
+        return (icon,)
+    return (os.path.join(ICON_DIR, f"{icon}.png"), os.path.join(HICOLOR, f"{icon}.png"),
+            os.path.join(FLATPAK_HICOLOR, f"{icon}.png"), f"/usr/share/pixmaps/{icon}.png")
+
+def parse_desktop_file(path, source="desktop"):
+    values = {}
+    in_entry = False
+    try:
+        with open(path, encoding="utf8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    if in_entry:
+                        break  # actions and other groups follow the main entry
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and "=" in line and not line.startswith("#"):
+                    key, value = line.split("=", 1)
+                    values.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+    if values.get("Type") != "Application" or values.get("NoDisplay") == "true" or values.get("Hidden") == "true":
+        return None
+    if not CATEGORIES & set(values.get("Categories", "").split(";")):
+        return None
+    try:
+        command = [arg for arg in shlex.split(values.get("Exec", "")) if not FIELD_CODE_RE.fullmatch(arg)]
+    except ValueError:
+        return None
+    if not command or not values.get("Name"):
+        return None
+    name = os.path.splitext(os.path.basename(path))[0]
+    return LauncherEntry(f"{source}:{name}", values["Name"], ("cage", *command), icon_candidates(values.get("Icon")), source)
+
+def parse_appmanifest(path):
+    try:
+        with open(path, encoding="utf8", errors="replace") as f:
+            values = dict(VDF_PAIR_RE.findall(f.read()))
+    except OSError:
+        return None
+    appid, name = values.get("appid"), values.get("name")
+    if not appid or not name or name.startswith(STEAM_SKIPPED):
+        return None
+    cache = os.path.join(os.path.dirname(os.path.dirname(path)), "appcache", "librarycache")
+    icons = (os.path.join(cache, f"{appid}_library_600x900.jpg"), os.path.join(cache, f"{appid}_icon.jpg"))
+    return LauncherEntry(f"steam:{appid}", name, ("cage", "steam", f"steam://rungameid/{appid}"), icons, "steam")
+
+def scan_directory(directory, kind, previous):
+    # Files whose mtime and size are unchanged keep their parsed entry; only new or edited files are read
+    pattern = "appmanifest_*.acf" if kind == "steam" else "*.desktop"
+    files = {}
+    for path in glob.glob(os.path.join(glob.escape(directory), pattern)):
+        name = os.path.basename(path)  # the directory is already the outer key of the index
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        known = previous.get(name)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            files[name] = known
+            continue
+        entry = parse_appmanifest(path) if kind == "steam" else parse_desktop_file(path, kind)
+        files[name] = [stat.st_mtime_ns, stat.st_size, entry.to_json() if entry else None]
+    return files
+
+class LauncherCatalog(QObject):
+    # Renders from the saved index at once, then reconciles it with the disk and follows inotify events
+    changed = Signal()
+    _scanned = Signal(object, object)
+
+    def __init__(self, index_path=INDEX_PATH, desktop=None, flatpak=None, steam=None, parent=None):
+        super().__init__(parent)
+        self.index_path = index_path
+        self.sources = {}
+        for directory in desktop if desktop is not None else desktop_dirs():
+            self.sources[directory] = "desktop"
+        for directory in flatpak if flatpak is not None else FLATPAK_EXPORTS:
+            self.sources[directory] = "flatpak"
+        for directory in steam if steam is not None else steam_dirs():
+            self.sources[directory] = "steam"
+        self.files = {}
+        self.entries = []
+        self.dirty = set()
+        self.scanning = False
+        self.started = False
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._directory_changed)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(REFRESH_DELAY_MS)
+        self.refresh_timer.timeout.connect(self._refresh_dirty)
+        self._scanned.connect(self._apply)
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if index.get("version") != INDEX_VERSION:
+            return False
+        self.files = {directory: files for directory, files in index["dirs"].items() if directory in self.sources}
+        self.entries = self._collect()
+        return True
+
+    def save(self):
+        data = json.dumps({"version": INDEX_VERSION, "dirs": self.files}, separators=(",", ":")).encode("utf8")
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.index_path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            print(f"Error saving launcher index: {e}")
+
+    def start(self):
+        if self.started:
+            return
+        self.started = True
+        existing = [directory for directory in self.sources if os.path.isdir(directory)]
+        if existing:
+            self.watcher.addPaths(existing)
+        self.refresh(list(self.sources))
+
+    def stop(self):
+        self.started = False
+        self.refresh_timer.stop()
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+
+    def refresh(self, directories):
+        self.dirty.update(directories)
+        if not self.scanning:
+            self._refresh_dirty()
+
+    def entry(self, entry_id):
+        return BUILTIN_LAUNCHERS.get(entry_id) or next((entry for entry in self.entries if entry.id == entry_id), None)
+
+    def _directory_changed(self, directory):
+        # Installers touch several files in a burst; one rescan of that directory covers them all
+        self.dirty.add(directory)
+        self.refresh_timer.start()
+
+    def _refresh_dirty(self):
+        if self.scanning or not self.dirty:
+            return
+        directories, self.dirty = list(self.dirty), set()
+        previous = {directory: dict(self.files.get(directory, {})) for directory in directories}
+        self.scanning = True
+        threading.Thread(target=self._scan, args=(directories, previous), name="launcher-catalog", daemon=True).start()
+
+    def _scan(self, directories, previous):
+        results = {directory: scan_directory(directory, self.sources[directory], previous[directory])
+                   for directory in directories}
+        try:
+            self._scanned.emit(directories, results)
+        except RuntimeError:
+            pass  # catalog deleted mid-scan
+
+    def _apply(self, directories, results):
+        self.scanning = False
+        changed = False
+        for directory in directories:
+            files = results[directory]
+            if files != self.files.get(directory, {}):
+                changed = True
+                if files:
+                    self.files[directory] = files
+                else:
+                    self.files.pop(directory, None)
+        if changed:
+            self.entries = self._collect()
+            self.save()
+            self.changed.emit()
+        # Directories created after start (first Flatpak install, new Steam library) get watched too
+        missing = [directory for directory in directories
+                   if os.path.isdir(directory) and directory not in self.watcher.directories()]
+        if missing:
+            self.watcher.addPaths(missing)
+        if self.dirty:
+            self.refresh_timer.start()
+
+    def _collect(self):
+        # Earlier XDG directories shadow later ones, as the spec asks
+        seen = {}
+        for directory in self.sources:
+            for name, (_, _, data) in sorted(self.files.get(directory, {}).items()):
+                if data and data[0] not in seen:
+                    seen[data[0]] = LauncherEntry.from_json(data)
+        return sorted(seen.values(), key=lambda entry: entry.label.lower())
+
+class LauncherListModel(QAbstractListModel):
+    EntryRole = Qt.UserRole + 1
+
+    def __init__(self, catalog, images, icon_size=96, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.images = images
+        self.icon_size = QSize(icon_size, icon_size)
+        self.entries = []
+        self.fetched = 0
+        catalog.changed.connect(self.reload)
+        self.reload()
+
+    def reload(self):
+        self.beginResetModel()
+        self.entries = list(self.catalog.entries)
+        self.fetched = min(FETCH_BATCH, len(self.entries))
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.fetched
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.fetched < len(self.entries)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(FETCH_BATCH, len(self.entries) - self.fetched)
+        self.beginInsertRows(QModelIndex(), self.fetched, self.fetched + count - 1)
+        self.fetched += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        if role == Qt.DisplayRole:
+            return entry.label
+        if role == Qt.DecorationRole:
+            # Art is only requested for rows the view actually paints
+            return self.images.request(list(entry.icons), self.icon_size,
+                                       lambda pixmap, entry_id=entry.id: self._icon_ready(entry_id))
+        if role == self.EntryRole:
+            return entry
+        return None
+
+    def _icon_ready(self, entry_id):
+        for row in range(self.fetched):
+            if self.entries[row].id == entry_id:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+                return
@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import ctypes
+import shutil
+import struct
+import platform
+import tempfile
+import threading
+from PySide6.QtCore import QObject, Signal
+from instrumentation import tracer
+from page_registry import available_memory_kb
+
+STATS_PATH = os.path.join(os.path.expanduser("~"), ".cache", "legendaryos-session", "launch_stats.json")
+MEMORY_BUDGET = 256 * 1024 * 1024
+AVAILABLE_SHARE = 0.25  # never ask for more than a quarter of what is currently free
+TOP_LAUNCHERS = 2
+HALF_LIFE_DAYS = 14
+MAX_SAMPLES = 20
+LIBRARY_DIRS = ["/usr/lib", "/usr/lib64", "/lib", "/lib64", "/usr/lib/x86_64-linux-gnu", "/lib/x86_64-linux-gnu",
+                "/usr/lib/aarch64-linux-gnu", "/usr/local/lib"]
+FLATPAK_APPS = "/var/lib/flatpak/app"
+# ioprio_set isn't wrapped by the os module
+IOPRIO_SET = {"x86_64": 251, "aarch64": 30, "i686": 289}
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_WHO_PROCESS = 1
+
+def prewarm_enabled():
+    return os.environ.get("LEGENDARYOS_PREWARM", "1") not in ("", "0")
+
+def elf_needed(path):
+    # DT_NEEDED names of a 64-bit little-endian ELF file, without running the dynamic loader
+    try:
+        with open(path, "rb") as f:
+            header = f.read(64)
+            if header[:4] != b"\x7fELF" or header[4] != 2 or header[5] != 1:
+                return []
+            phoff, = struct.unpack_from("<Q", header, 32)
+            phentsize, phnum = struct.unpack_from("<HH", header, 54)
+            f.seek(phoff)
+            table = f.read(phentsize * phnum)
+            segments = [struct.unpack_from("<IIQQQQ", table, i * phentsize) for i in range(phnum)]
+            loads = [(vaddr, offset, filesz) for kind, _, offset, vaddr, _, filesz in segments if kind == 1]
+            dynamic = next(((offset, filesz) for kind, _, offset, _, _, filesz in segments if kind == 2), None)
+            if not dynamic:
+                return []
+            f.seek(dynamic[0])
+            data = f.read(dynamic[1])
+            needed, strtab = [], None
+            for i in range(0, len(data) - 15, 16):
+                tag, value = struct.unpack_from("<qQ", data, i)
+                if tag == 0:
+                    break
+                if tag == 1:
+                    needed.append(value)
+                elif tag == 5:
+                    strtab = value
+            if strtab is None:
+                return []
+            # DT_STRTAB is a virtual address; map it back to a file offset through the LOAD segments
+            base = next((offset + strtab - vaddr for vaddr, offset, size in loads if vaddr <= strtab < vaddr + size), None)
+            if base is None:
+                return []
+            names = []
+            for offset in needed:
+                f.seek(base + offset)
+                names.append(f.read(256).split(b"\0", 1)[0].decode("utf8", "replace"))
+            return names
+    except (OSError, struct.error):
+        return []
+
+def resolve_library(name, dirs=LIBRARY_DIRS):
+    for directory in dirs:
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return os.path.realpath(path)
+    return None
+
+def interpreter(path):
+    try:
+        with open(path, "rb") as f:
+            line = f.readline(256)
+    except OSError:
+        return None
+    if not line.startswith(b"#!"):
+        return None
+    parts = line[2:].decode("utf8", "replace").split()
+    if not parts:
+        return None
+    if os.path.basename(parts[0]) == "env" and len(parts) > 1:
+        return shutil.which(parts[1])
+    return parts[0]
+
+def command_files(command):
+    # Executables named on the command line, their interpreters and their shared library closure
+    files, queue = [], []
+    for arg in command:
+        path = shutil.which(arg) if not os.path.isabs(arg) else arg
+        if path and os.path.isfile(path):
+            queue.append(os.path.realpath(path))
+    if "flatpak" in command and "run" in command:
+        # A Flatpak app's own binaries live under its deploy directory
+        app_id = next((arg for arg in command[command.index("run") + 1:] if not arg.startswith("-")), None)
+        bin_dir = os.path.join(FLATPAK_APPS, app_id or "", "current", "active", "files", "bin")
+        if app_id and os.path.isdir(bin_dir):
+            queue += [os.path.join(bin_dir, name) for name in sorted(os.listdir(bin_dir))]
+    seen = set()
+    while queue:
+        path = queue.pop(0)
+        if path in seen or not os.path.isfile(path):
+            continue
+        seen.add(path)
+        files.append(path)
+        script = interpreter(path)
+        if script:
+            queue.append(os.path.realpath(script))
+        for name in elf_needed(path):
+            library = resolve_library(name)
+            if library:
+                queue.append(library)
+    return files
+
+def set_idle_io_priority():
+    number = IOPRIO_SET.get(platform.machine())
+    if number is None:
+        return False
+    libc = ctypes.CDLL(None, use_errno=True)
+    return libc.syscall(number, IOPRIO_WHO_PROCESS, threading.get_native_id(),
+                        IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT) == 0
+
+class LaunchStats:
+    # Launch counts decayed by age, plus first-window times split by whether the launcher was prewarmed
+    def __init__(self, path=STATS_PATH):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def record_launch(self, name):
+        entry = self.data.setdefault(name, {"launches": [], "prewarmed_ms": [], "cold_ms": []})
+        entry["launches"] = (entry["launches"] + [time.time()])[-MAX_SAMPLES:]
+        self.save()
+
+    def record_first_window(self, name, elapsed_ms, prewarmed):
+        entry = self.data.setdefault(name, {"launches": [], "prewarmed_ms": [], "cold_ms": []})
+        key = "prewarmed_ms" if prewarmed else "cold_ms"
+        entry[key] = (entry[key] + [round(elapsed_ms, 1)])[-MAX_SAMPLES:]
+        self.save()
+
+    def score(self, name, now=None):
+        now = now or time.time()
+        launches = self.data.get(name, {}).get("launches", [])
+        return sum(0.5 ** ((now - launched) / (HALF_LIFE_DAYS * 86400)) for launched in launches)
+
+    def ranked(self, limit=TOP_LAUNCHERS):
+        now = time.time()
+        names = sorted(self.data, key=lambda name: -self.score(name, now))
+        return [name for name in names if self.score(name, now) > 0][:limit]
+
+    def summary(self, name):
+        entry = self.data.get(name, {})
+        mean = lambda values: round(sum(values) / len(values), 1) if values else None
+        return {"prewarmed_ms": mean(entry.get("prewarmed_ms", [])), "cold_ms": mean(entry.get("cold_ms", []))}
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path))
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.data, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Error saving launch stats: {e}")
+
+class LauncherPrewarm(QObject):
+    # Pulls the likeliest launchers' binaries and libraries into the page cache at idle I/O priority
+    finished = Signal(object)
+
+    def __init__(self, catalog, stats_path=STATS_PATH, budget=MEMORY_BUDGET, enabled=None, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.stats = LaunchStats(stats_path)
+        self.budget = budget
+        self.enabled = prewarm_enabled() if enabled is None else enabled
+        self.prewarmed = set()
+        self.running = False
+        self.cancelled = False
+        self.finished.connect(self._handle_finished)
+
+    def start(self):
+        if not self.enabled or self.running:
+            return
+        commands = {}
+        for name in self.stats.ranked():
+            entry = self.catalog.entry(name)
+            if entry and name not in self.prewarmed:
+                commands[name] = entry.command
+        if not commands:
+            return
+        available = available_memory_kb()
+        budget = self.budget if available is None else min(self.budget, int(available * 1024 * AVAILABLE_SHARE))
+        self.running = True
+        self.cancelled = False
+        threading.Thread(target=self._run, args=(commands, budget), name="launcher-prewarm", daemon=True).start()
+
+    def stop(self):
+        self.cancelled = True
+
+    def record_launch(self, name):
+        self.stats.record_launch(name)
+
+    def record_first_window(self, name, elapsed_ms):
+        # Only the first launch after a prewarm pass counts; later ones are warm for other reasons
+        prewarmed = name in self.prewarmed
+        self.prewarmed.discard(name)
+        self.stats.record_first_window(name, elapsed_ms, prewarmed)
+        tracer.record("prewarm_launches", self.stats.data)
+        if not tracer.enabled:
+            return
+        summary = self.stats.summary(name)
+        print(f"Launch {name}: first window in {elapsed_ms:.0f} ms ({'prewarmed' if prewarmed else 'cold'}; "
+              f"mean prewarmed {summary['prewarmed_ms']} ms, cold {summary['cold_ms']} ms)")
+
+    def _run(self, commands, budget):
+        start = time.perf_counter()
+        io_idle = set_idle_io_priority()
+        used, done, files = 0, [], 0
+        for name, command in commands.items():
+            for path in command_files(command):
+                if self.cancelled:
+                    break
+                try:
+                    size = os.path.getsize(path)
+                    if used + size > budget:
+                        continue
+                    fd = os.open(path, os.O_RDONLY)
+                    try:
+                        # The kernel queues readahead and returns; the pages land in cache in the background
+                        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                    finally:
+                        os.close(fd)
+                except OSError:
+                    continue
+                used += size
+                files += 1
+            if self.cancelled:
+                break
+            done.append(name)
+        result = {"launchers": done, "files": files, "bytes": used, "budget": budget, "io_idle": io_idle,
+                  "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)}
+        try:
+            self.finished.emit(result)
+        except RuntimeError:
+            pass  # window rebuilt while we were reading
+
+    def _handle_finished(self, result):
+        self.running = False
+        self.prewarmed.update(result["launchers"])
+        tracer.record("prewarm", result)
@@ -0,0 +1,92 @@
+import time
+from PySide6.QtCore import QObject, QProcess, QTimer, Signal, Qt
+from PySide6.QtGui import QGuiApplication
+from instrumentation import tracer
+from command_runner import get_runner
+
+FIRST_WINDOW_TIMEOUT_MS = 10000
+
+class LauncherSupervisor(QObject):
+    started = Signal(str)
+    first_window = Signal(str, float)  # launcher name, ms since launch (-1 if never seen)
+    finished = Signal(str, int, float)  # launcher name, exit code, seconds of runtime
+    failed = Signal(str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name = None
+        self.launch_time = None
+        self.window_seen = False
+        self.first_window_ms = None
+        self.history = []
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.ForwardedChannels)
+        self.process.started.connect(self._handle_started)
+        self.process.finished.connect(self._handle_finished)
+        self.process.errorOccurred.connect(self._handle_error)
+        self.window_timer = QTimer(self)
+        self.window_timer.setSingleShot(True)
+        self.window_timer.setInterval(FIRST_WINDOW_TIMEOUT_MS)
+        self.window_timer.timeout.connect(lambda: self._report_window(-1.0))
+        QGuiApplication.instance().applicationStateChanged.connect(self._handle_state)
+
+    def is_running(self):
+        return self.process.state() != QProcess.NotRunning
+
+    def launch(self, name, program, args=None):
+        if self.is_running():
+            return False
+        self.name = name
+        self.window_seen = False
+        self.first_window_ms = None
+        self.launch_time = time.perf_counter()
+        get_runner().start_process(self.process, program, args)
+        return True
+
+    def stop(self):
+        if self.is_running():
+            self.process.terminate()
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.launch_time) * 1000
+
+    def _handle_started(self):
+        self.window_timer.start()
+        self.started.emit(self.name)
+
+    def _handle_state(self, state):
+        # The launcher's first toplevel takes activation away from the session
+        if self.is_running() and not self.window_seen and state != Qt.ApplicationActive:
+            self._report_window(self.elapsed_ms())
+
+    def _report_window(self, elapsed):
+        if self.window_seen:
+            return
+        self.window_seen = True
+        self.first_window_ms = round(elapsed, 1) if elapsed >= 0 else None
+        self.window_timer.stop()
+        self.first_window.emit(self.name, elapsed)
+
+    def _handle_finished(self, exit_code, exit_status):
+        self.window_timer.stop()
+        if exit_status == QProcess.CrashExit:
+            exit_code = -1
+        runtime = self.elapsed_ms() / 1000
+        self._record(exit_code, runtime)
+        self.finished.emit(self.name, exit_code, runtime)
+
+    def _handle_error(self, error):
+        if error == QProcess.FailedToStart:
+            self.window_timer.stop()
+            self._record(None, 0.0)
+            self.failed.emit(self.name, self.process.errorString())
+
+    def _record(self, exit_code, runtime):
+        entry = {
+            "name": self.name,
+            "first_window_ms": self.first_window_ms,
+            "exit_code": exit_code,
+            "runtime_s": round(runtime, 3),
+        }
+        self.history.append(entry)
+        tracer.record("launches", self.history)
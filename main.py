@@ -1,17 +1,65 @@
 import sys
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QFont, QColor, QPalette
-from app import MainApp
+import time
+import importlib
+import instrumentation
+from instrumentation import tracer
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    font = QFont("Courier New", 16)
-    app.setFont(font)
-    # Set palette for overall theme
-    palette = QPalette()
-    palette.setColor(QPalette.Window, QColor("#0F1E2B"))
-    palette.setColor(QPalette.WindowText, QColor("#C7D5E0"))
-    app.setPalette(palette)
+# Reloaded in dependency order on a soft restart; Qt, instrumentation, the command runner and a
+# running update job stay loaded
+RELOAD_MODULES = ["styles", "terminal_widget", "volume_backend", "brightness_backend", "page_registry", "transitions", "system_status", "image_loader", "banner", "network_model", "bluetooth_backend",
+                  "system_services", "timezone_index", "launcher_catalog", "launcher_prewarm", "launcher_supervisor", "gamepad_input", "config_pages", "app"]
+
+# The top-level window has no Qt parent, so Python has to hold on to it
+session = {}
+
+def create_window(app):
+    with tracer.phase("import.app"):
+        from app import MainApp
     window = MainApp()
-    window.show()
+    window.restart_requested.connect(lambda: soft_restart(app, window))
+    instrumentation.install(app, window)
+    session["window"] = window
+    return window
+
+def soft_restart(app, window):
+    from page_registry import dispose
+    start = time.perf_counter()
+    try:
+        window.hide()
+        dispose(window)
+        for name in RELOAD_MODULES:
+            if name in sys.modules:
+                importlib.reload(sys.modules[name])
+        new_window = create_window(app)
+    except Exception as e:
+        print(f"Soft restart failed ({e}), falling back to a full restart")
+        window.hard_restart()
+        return
+
+    def report():
+        elapsed = round((time.perf_counter() - start) * 1000, 3)
+        tracer.record("soft_restart_ms", elapsed)
+        print(f"Session soft-restarted in {elapsed} ms")
+
+    if tracer.enabled:
+        instrumentation.on_first_paint(new_window, report)
+    new_window.show()
+
+if __name__ == "__main__":
+    with tracer.phase("import.pyside"):
+        from PySide6.QtWidgets import QApplication
+        from PySide6.QtGui import QFont, QColor, QPalette
+    with tracer.phase("qapplication"):
+        app = QApplication(sys.argv)
+        font = QFont("Courier New", 16)
+        app.setFont(font)
+        # Set palette for overall theme
+        palette = QPalette()
+        palette.setColor(QPalette.Window, QColor("#0F1E2B"))
+        palette.setColor(QPalette.WindowText, QColor("#C7D5E0"))
+        app.setPalette(palette)
+    with tracer.phase("mainapp"):
+        window = create_window(app)
+    with tracer.phase("show"):
+        window.show()
     sys.exit(app.exec())
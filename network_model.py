@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, QAbstractListModel, QModelIndex
+from command_runner import get_runner
+
+WIFI_FIELDS = ["IN-USE", "BSSID", "SSID", "SIGNAL", "SECURITY", "CHAN"]
+MIN_REFRESH_MS = 5000
+MAX_REFRESH_MS = 60000
+SIGNAL_BARS = "▂▄▆█"
+
+@dataclass(frozen=True)
+class WifiNetwork:
+    bssid: str
+    ssid: str
+    signal: int
+    security: str
+    channel: int
+    in_use: bool
+
+    @property
+    def secured(self):
+        return self.security not in ("", "--")
+
+    def label(self):
+        bars = SIGNAL_BARS[:max(1, min(4, (self.signal + 24) // 25))]
+        marker = "* " if self.in_use else "  "
+        lock = " [zabezpieczona]" if self.secured else ""
+        return f"{marker}{bars:<4} {self.ssid} ({self.signal}%){lock}"
+
+def split_terse(line):
+    # nmcli --terse escapes ':' and '\' inside values with a backslash
+    fields, current, escaped = [], [], False
+    for char in line:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ":":
+            fields.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    fields.append("".join(current))
+    return fields
+
+def parse_wifi_list(text):
+    networks = {}
+    for line in text.splitlines():
+        fields = split_terse(line)
+        if len(fields) != len(WIFI_FIELDS):
+            continue
+        in_use, bssid, ssid, signal, security, channel = fields
+        if not ssid:
+            continue  # hidden networks can't be picked from the list
+        try:
+            network = WifiNetwork(bssid, ssid, int(signal), security, int(channel), in_use.strip() == "*")
+        except ValueError:
+            continue
+        networks[bssid] = network
+    return networks
+
+def diff_networks(old, new):
+    added = [bssid for bssid in new if bssid not in old]
+    removed = [bssid for bssid in old if bssid not in new]
+    changed = [bssid for bssid in new if bssid in old and new[bssid] != old[bssid]]
+    return added, removed, changed
+
+class WifiListModel(QAbstractListModel):
+    NetworkRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.order = []
+        self.networks = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        network = self.networks[self.order[index.row()]]
+        if role == Qt.DisplayRole:
+            return network.label()
+        if role == self.NetworkRole:
+            return network
+        return None
+
+    def network(self, row):
+        return self.networks[self.order[row]]
+
+    def apply(self, networks):
+        # Only rows that actually changed are touched, so selection and scroll position survive a rescan
+        added, removed, changed = diff_networks(self.networks, networks)
+        for bssid in removed:
+            row = self.order.index(bssid)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.order[row]
+            del self.networks[bssid]
+            self.endRemoveRows()
+        for bssid in changed:
+            self.networks[bssid] = networks[bssid]
+            index = self.index(self.order.index(bssid))
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+        if added:
+            added.sort(key=lambda bssid: -networks[bssid].signal)
+            start = len(self.order)
+            self.beginInsertRows(QModelIndex(), start, start + len(added) - 1)
+            for bssid in added:
+                self.order.append(bssid)
+                self.networks[bssid] = networks[bssid]
+            self.endInsertRows()
+        return bool(added or removed or changed)
+
+class WifiScanner(QObject):
+    # Refreshes quickly while things change and backs off while the air is quiet
+    scan_finished = Signal(bool)
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.interval = MIN_REFRESH_MS
+        self.rescan_pending = False
+        self.scan = None
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.refresh)
+
+    def start(self):
+        self.interval = MIN_REFRESH_MS
+        self.refresh()
+
+    def stop(self):
+        self.timer.stop()
+        if self.scan:
+            self.scan.cancel()
+            self.scan = None
+
+    def rescan(self):
+        self.interval = MIN_REFRESH_MS
+        self.rescan_pending = True
+        self.refresh()
+
+    def refresh(self):
+        if self.scan:
+            return
+        rescan = "yes" if self.rescan_pending else "auto"
+        self.rescan_pending = False
+        args = ["nmcli", "--terse", "--fields", ",".join(WIFI_FIELDS), "device", "wifi", "list", "--rescan", rescan]
+        self.scan = get_runner().run(args, self._handle_finished, timeout=30)
+
+    def _handle_finished(self, result):
+        self.scan = None
+        changed = result.ok and self.model.apply(parse_wifi_list(result.stdout))
+        self.interval = MIN_REFRESH_MS if changed else min(self.interval * 2, MAX_REFRESH_MS)
+        self.timer.start(self.interval)
+        self.scan_finished.emit(changed)
@@ -0,0 +1,180 @@
+import time
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QTabWidget
+from PySide6.QtCore import QObject, QProcess, QTimer, Signal
+from instrumentation import tracer
+
+IDLE_BUILD_INTERVAL_MS = 50
+MEMORY_CHECK_INTERVAL_MS = 30000
+LOW_MEMORY_KB = 256 * 1024
+
+def available_memory_kb(path="/proc/meminfo"):
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def is_busy(widget):
+    # Never tear down a page while one of its commands is still running;
+    # long-lived event monitors are marked and don't count
+    return any(process.state() != QProcess.NotRunning and not process.property("monitor")
+               for process in widget.findChildren(QProcess))
+
+def dispose(widget):
+    # Let backends join their workers and kill monitors before Qt deletes them
+    for child in widget.findChildren(QObject):
+        stop = getattr(child, "stop", None)
+        if callable(stop):
+            stop()
+    widget.deleteLater()
+
+class PageRegistry(QObject):
+    page_created = Signal(str, QWidget)
+
+    def __init__(self, stack, parent=None):
+        super().__init__(parent)
+        self.stack = stack
+        self.factories = {}
+        self.pinned = set()
+        self.pages = {}
+        self.last_used = {}
+        self.build_times = {}
+        self.idle_queue = []
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(IDLE_BUILD_INTERVAL_MS)
+        self.idle_timer.timeout.connect(self._build_next_idle)
+        self.memory_timer = QTimer(self)
+        self.memory_timer.setInterval(MEMORY_CHECK_INTERVAL_MS)
+        self.memory_timer.timeout.connect(self.check_memory_pressure)
+        self.memory_timer.start()
+
+    def register(self, name, factory, pinned=False):
+        self.factories[name] = factory
+        if pinned:
+            self.pinned.add(name)
+
+    def is_built(self, name):
+        return name in self.pages
+
+    def estimate(self, name):
+        # Seconds the next build of this page is expected to take; pages never built borrow the average
+        if name in self.build_times:
+            return self.build_times[name]
+        if self.build_times:
+            return sum(self.build_times.values()) / len(self.build_times)
+        return 0.0
+
+    def get(self, name):
+        page = self.pages.get(name)
+        if page is None:
+            start = time.perf_counter()
+            with tracer.phase(f"page.{name}"):
+                page = self.factories[name]()
+            self.build_times[name] = time.perf_counter() - start
+            self.pages[name] = page
+            self.stack.addWidget(page)
+            self.page_created.emit(name, page)
+        self.last_used[name] = time.monotonic()
+        return page
+
+    def prebuild(self, names):
+        # Build one page per idle tick so no single tick holds the event loop for long
+        self.idle_queue.extend(name for name in names if name not in self.idle_queue)
+        if self.idle_queue and not self.idle_timer.isActive():
+            self.idle_timer.start()
+
+    def _build_next_idle(self):
+        while self.idle_queue:
+            name = self.idle_queue.pop(0)
+            if name not in self.pages:
+                page = self.get(name)
+                prebuild = getattr(page, "prebuild", None)
+                if prebuild:
+                    prebuild()
+                return
+        self.idle_timer.stop()
+
+    def release(self, name):
+        page = self.pages.get(name)
+        if page is None or name in self.pinned or page is self.stack.currentWidget() or is_busy(page):
+            return False
+        del self.pages[name]
+        self.stack.removeWidget(page)
+        dispose(page)
+        return True
+
+    def release_idle(self, keep=1):
+        # Free least recently used pages, keeping the `keep` most recent ones
+        released = []
+        candidates = sorted(self.pages, key=lambda name: self.last_used.get(name, 0))
+        for name in candidates[:max(0, len(candidates) - keep)]:
+            page = self.pages[name]
+            release_tabs = getattr(page, "release_idle", None)
+            if self.release(name):
+                released.append(name)
+            elif release_tabs:
+                release_tabs()
+        return released
+
+    def check_memory_pressure(self):
+        available = available_memory_kb()
+        if available is not None and available < LOW_MEMORY_KB:
+            self.idle_queue.clear()
+            return self.release_idle()
+        return []
+
+class LazyTabWidget(QTabWidget):
+    # Tabs hold empty containers until first shown; the real page is built on demand
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.factories = []
+        self.idle_index = 0
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(IDLE_BUILD_INTERVAL_MS)
+        self.idle_timer.timeout.connect(self._build_next_idle)
+        self.currentChanged.connect(self.ensure_built)
+
+    def add_lazy_tab(self, factory, label):
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.factories.append(factory)
+        return self.addTab(container, label)
+
+    def page(self, index):
+        layout = self.widget(index).layout()
+        return layout.itemAt(0).widget() if layout.count() else None
+
+    def ensure_built(self, index):
+        if index < 0:
+            return None
+        page = self.page(index)
+        if page is None:
+            page = self.factories[index]()
+            self.widget(index).layout().addWidget(page)
+        return page
+
+    def showEvent(self, event):
+        self.ensure_built(self.currentIndex())
+        super().showEvent(event)
+
+    def prebuild(self):
+        self.idle_index = 0
+        self.idle_timer.start()
+
+    def _build_next_idle(self):
+        if self.idle_index >= self.count():
+            self.idle_timer.stop()
+            return
+        self.ensure_built(self.idle_index)
+        self.idle_index += 1
+
+    def release_idle(self):
+        for index in range(self.count()):
+            page = self.page(index)
+            if page is not None and index != self.currentIndex() and not is_busy(page):
+                self.widget(index).layout().removeWidget(page)
+                dispose(page)
@@ -1,45 +1,117 @@
-def get_stylesheet():
-    return """
+from functools import lru_cache
+from string import Template
+
+# Palettes fill the one stylesheet template; widgets pick rules by object name or "role" property
+THEMES = {
+    "steam": {
+        "window": "#0F1E2B",  # Dark blue-grey like Steam
+        "panel": "#1B2838",  # Steam dark panel
+        "border": "#2A475E",
+        "accent": "#66C0F4",  # Steam blue
+        "text": "#C7D5E0",
+        "heading": "#EBEBEB",
+        "highlight": "#FFFFFF",
+        "terminal_background": "#001020",
+        "terminal_text": "#00FF80",
+        "terminal_border": "#004080",
+    },
+    "contrast": {
+        "window": "#000000",
+        "panel": "#101010",
+        "border": "#FFFFFF",
+        "accent": "#FFD700",
+        "text": "#FFFFFF",
+        "heading": "#FFFFFF",
+        "highlight": "#000000",
+        "terminal_background": "#000000",
+        "terminal_text": "#FFFFFF",
+        "terminal_border": "#FFD700",
+    },
+}
+DEFAULT_THEME = "steam"
+
+STYLESHEET = Template("""
             QMainWindow {
-                background-color: #0F1E2B;  /* Dark blue-grey like Steam */
+                background-color: $window;
             }
             QWidget {
-                color: #C7D5E0;  /* Light text */
+                color: $text;  /* Light text */
                 font-family: 'Courier New', monospace;
                 font-size: 22px;
                 font-weight: bold;
             }
             QPushButton {
-                background-color: #1B2838;  /* Steam dark panel */
-                border: 8px solid #2A475E;  /* Thicker blocky pixel border */
-                color: #66C0F4;  /* Steam blue text */
+                background-color: $panel;
+                border: 8px solid $border;  /* Thicker blocky pixel border */
+                color: $accent;
                 padding: 25px;
                 border-radius: 0px;  /* Sharp corners */
                 min-height: 70px;  /* Larger for gamepad */
             }
             QPushButton:hover, QPushButton:focus {
-                background-color: #2A475E;
-                border: 8px solid #66C0F4;  /* Highlight */
-                color: #FFFFFF;
+                background-color: $border;
+                border: 8px solid $accent;  /* Highlight */
+                color: $highlight;
             }
             QPushButton:pressed {
-                background-color: #66C0F4;
-                color: #1B2838;
+                background-color: $accent;
+                color: $panel;
             }
             QLabel {
-                color: #66C0F4;  /* Steam accent */
+                color: $accent;
                 font-size: 30px;
                 padding: 5px;  /* Improved padding */
             }
+            QLabel[role="heading"] {
+                font-size: 40px;
+                color: $heading;
+            }
+            QLabel[role="subheading"] {
+                font-size: 26px;
+                color: $accent;
+            }
+            QLabel[role="page-title"] {
+                font-size: 36px;
+            }
+            QLabel[role="section"] {
+                font-size: 28px;
+            }
+            QLabel[role="status"] {
+                font-size: 22px;
+                color: $text;
+            }
             QTextEdit {
-                background-color: #0F1E2B;
-                color: #C7D5E0;
-                border: 8px solid #2A475E;
+                background-color: $window;
+                color: $text;
+                border: 8px solid $border;
+            }
+            QListView, QLineEdit {
+                background-color: $panel;
+                border: 8px solid $border;
+                color: $accent;
+                padding: 10px;
+            }
+            QListView::item {
+                min-height: 60px;
+            }
+            QListView::item:selected {
+                background-color: $border;
+                color: $highlight;
+            }
+            QLabel#letterWheel {
+                background-color: $panel;
+                border: 8px solid $border;
+                font-size: 36px;
+                min-height: 70px;
+            }
+            QLabel#letterWheel:focus {
+                border: 8px solid $accent;
+                color: $highlight;
             }
             QComboBox {
-                background-color: #1B2838;
-                border: 8px solid #2A475E;
-                color: #66C0F4;
+                background-color: $panel;
+                border: 8px solid $border;
+                color: $accent;
                 padding: 20px;
                 min-height: 60px;
             }
@@ -48,52 +120,120 @@ def get_stylesheet():
                 subcontrol-position: top right;
                 width: 40px;
                 border-left-width: 1px;
-                border-left-color: #2A475E;
+                border-left-color: $border;
                 border-left-style: solid;
             }
             QSlider::groove:horizontal {
-                border: 6px solid #2A475E;
+                border: 6px solid $border;
                 height: 40px;
-                background: #1B2838;
+                background: $panel;
             }
             QSlider::handle:horizontal {
-                background: #66C0F4;
-                border: 8px solid #2A475E;
+                background: $accent;
+                border: 8px solid $border;
                 width: 80px;
                 margin: -20px 0;
             }
             QTabWidget::pane {
-                border: 8px solid #2A475E;
-                background-color: #0F1E2B;
+                border: 8px solid $border;
+                background-color: $window;
+            }
+            QTabBar {
+                font-size: 26px;
             }
             QTabBar::tab {
-                background-color: #1B2838;
-                color: #66C0F4;
+                background-color: $panel;
+                color: $accent;
                 padding: 25px;
-                border: 8px solid #2A475E;
+                border: 8px solid $border;
                 border-bottom: 0px;
                 min-width: 180px;
             }
             QTabBar::tab:selected {
-                background-color: #2A475E;
-                border: 8px solid #66C0F4;
-                color: #FFFFFF;
+                background-color: $border;
+                border: 8px solid $accent;
+                color: $highlight;
             }
             QScrollArea {
-                border: 8px solid #2A475E;
-                background-color: #0F1E2B;
+                border: 8px solid $border;
+                background-color: $window;
+            }
+            QScrollArea > QWidget, QScrollArea > QWidget > QWidget {
+                background-color: $window;  /* viewport and page body */
             }
             QFocusFrame {
-                border: 6px dashed #66C0F4;  /* Gamepad focus */
+                border: 6px dashed $accent;  /* Gamepad focus */
             }
             QProgressBar {
-                background-color: #1B2838;
-                border: 6px solid #2A475E;
+                background-color: $panel;
+                border: 6px solid $border;
                 height: 30px;
                 text-align: center;
-                color: #FFFFFF;
+                color: $highlight;
             }
             QProgressBar::chunk {
-                background-color: #66C0F4;
+                background-color: $accent;
+            }
+            QWidget#sidebar {
+                background-color: $panel;
+                border-right: 8px solid $border;
+            }
+            QLabel#sessionTitle {
+                font-size: 42px;
+                color: $accent;
+                border-bottom: 8px solid $border;
+                padding: 35px;
+            }
+            QLabel#versionLabel {
+                font-size: 18px;
+                color: $text;
+                padding: 10px;
+            }
+            QLabel#logo {
+                padding: 10px;
+            }
+            QStackedWidget#content, QTabWidget#settings {
+                background-color: $window;
+            }
+            QProgressBar#operationProgress {
+                border: 4px solid $border;
+                height: 20px;
+            }
+            QWidget#banner {
+                font-family: monospace;
+                font-size: 30px;
             }
-        """
+            QAbstractScrollArea#terminal {
+                background-color: $terminal_background;
+                color: $terminal_text;
+                border: 6px solid $terminal_border;
+                font-family: 'Courier New';
+                font-size: 18px;
+            }
+            QLabel#traceOverlay {
+                background-color: rgba(0, 0, 0, 180);
+                color: $terminal_text;
+                font-size: 16px;
+                padding: 8px;
+            }
+        """)
+
+current_theme = DEFAULT_THEME
+
+def theme_colors(theme=None):
+    return THEMES[theme or current_theme]
+
+@lru_cache(maxsize=None)
+def get_stylesheet(theme=DEFAULT_THEME):
+    # Compiled once per theme; Qt caches the parsed sheet as long as the string is unchanged
+    return STYLESHEET.substitute(THEMES[theme])
+
+def apply_theme(app, theme=None):
+    # One application-wide sheet: switching re-polishes existing widgets instead of rebuilding them
+    global current_theme
+    # The choice lives on the QApplication so it survives a soft restart reloading this module
+    current_theme = theme or app.property("theme") or current_theme
+    app.setProperty("theme", current_theme)
+    stylesheet = get_stylesheet(current_theme)
+    if app.styleSheet() != stylesheet:
+        app.setStyleSheet(stylesheet)
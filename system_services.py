@@ -0,0 +1,124 @@
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtDBus import QDBusConnection, QDBusMessage, QDBusPendingCallWatcher, QDBusVariant
+from command_runner import get_runner
+
+LOGIND = ("org.freedesktop.login1", "/org/freedesktop/login1", "org.freedesktop.login1.Manager")
+TIMEDATED = ("org.freedesktop.timedate1", "/org/freedesktop/timedate1", "org.freedesktop.timedate1")
+PROPERTIES = "org.freedesktop.DBus.Properties"
+# Bus errors that mean "the service can't do this for us", as opposed to a real refusal like a bad zone name
+FALLBACK_ERRORS = {
+    "org.freedesktop.DBus.Error.ServiceUnknown",
+    "org.freedesktop.DBus.Error.NameHasNoOwner",
+    "org.freedesktop.DBus.Error.NoServer",
+    "org.freedesktop.DBus.Error.Disconnected",
+    "org.freedesktop.DBus.Error.NoReply",
+    "org.freedesktop.DBus.Error.TimedOut",
+    "org.freedesktop.DBus.Error.AccessDenied",
+    "org.freedesktop.DBus.Error.InteractiveAuthorizationRequired",
+}
+
+class SystemService(QObject):
+    # Calls a system bus service asynchronously and drops to its CLI when the bus can't help
+    succeeded = Signal(str)
+    failed = Signal(str, str)
+
+    def __init__(self, service, bus=None, parent=None):
+        super().__init__(parent)
+        self.bus = bus if bus is not None else QDBusConnection.systemBus()
+        self.service, self.path, self.interface = service
+        self.watchers = set()
+
+    def call(self, method, args, callback, interface=None):
+        if not self.bus.isConnected():
+            callback(None, "org.freedesktop.DBus.Error.NoServer", "system bus unavailable")
+            return
+        message = QDBusMessage.createMethodCall(self.service, self.path, interface or self.interface, method)
+        message.setArguments(args)
+        message.setInteractiveAuthorizationAllowed(True)
+        watcher = QDBusPendingCallWatcher(self.bus.asyncCall(message), self)
+        self.watchers.add(watcher)
+
+        def finished(watcher):
+            self.watchers.discard(watcher)
+            watcher.deleteLater()
+            if watcher.isError():
+                callback(None, watcher.error().name(), watcher.error().message())
+            else:
+                callback(watcher.reply().arguments(), None, None)
+
+        watcher.finished.connect(finished)
+
+    def get_property(self, name, callback):
+        def unwrap(arguments, error, message):
+            value = arguments[0] if arguments else None
+            if isinstance(value, QDBusVariant):
+                value = value.variant()
+            callback(value, error, message)
+
+        self.call("Get", [self.interface, name], unwrap, interface=PROPERTIES)
+
+    def invoke(self, action, method, args, fallback, on_success=None):
+        # fallback is the equivalent command line, run only when the service itself is out of reach
+        def done():
+            if on_success:
+                on_success()
+            self.succeeded.emit(action)
+
+        def handle(arguments, error, message):
+            if error is None:
+                done()
+            elif error in FALLBACK_ERRORS and fallback:
+                get_runner().run(fallback, lambda result: self._fallback_done(action, error, result, done), timeout=30)
+            else:
+                self.failed.emit(action, message or error)
+
+        self.call(method, args, handle)
+
+    def stop(self):
+        for watcher in list(self.watchers):
+            watcher.deleteLater()
+        self.watchers.clear()
+
+    def _fallback_done(self, action, error, result, done):
+        if result.ok:
+            done()
+        else:
+            lines = result.stderr.strip().splitlines()
+            self.failed.emit(action, result.error or (lines[-1] if lines else error))
+
+class PowerBackend(SystemService):
+    # logind refuses to bypass "block" inhibitors for unprivileged callers, so report them up front
+    def __init__(self, bus=None, parent=None):
+        super().__init__(LOGIND, bus, parent)
+
+    def power_off(self):
+        self._unless_inhibited("poweroff", "shutdown", "PowerOff", ["sudo", "shutdown", "0"])
+
+    def reboot(self):
+        self._unless_inhibited("reboot", "shutdown", "Reboot", ["sudo", "reboot"])
+
+    def suspend(self):
+        self._unless_inhibited("suspend", "sleep", "Suspend", ["systemctl", "suspend"])
+
+    def _unless_inhibited(self, action, what, method, fallback):
+        def check(blocked, error, message):
+            if error is None and what in (blocked or "").split(":"):
+                self.failed.emit(action, f"Zablokowane przez inną aplikację ({blocked})")
+            else:
+                self.invoke(action, method, [True], fallback)
+
+        self.get_property("BlockInhibited", check)
+
+class TimeBackend(SystemService):
+    timezone_changed = Signal(str)
+
+    def __init__(self, bus=None, parent=None):
+        super().__init__(TIMEDATED, bus, parent)
+
+    def set_timezone(self, timezone):
+        self.invoke("timezone", "SetTimezone", [timezone, True], ["timedatectl", "set-timezone", timezone],
+                    lambda: self.timezone_changed.emit(timezone))
+
+    def current_timezone(self, callback):
+        self.get_property("Timezone", lambda value, error, message: callback(value if error is None else None))
+
@@ -0,0 +1,302 @@
+import os
+import time
+import threading
+from dataclasses import dataclass
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel
+from PySide6.QtCore import QObject, Signal
+from instrumentation import tracer
+
+ACTIVE_INTERVAL_S = 2.0
+IDLE_INTERVAL_S = 10.0
+HIDDEN_INTERVAL_S = 30.0
+IDLE_AFTER_S = 60.0
+READ_SIZE = 64 * 1024
+# Interfaces that never carry the user's traffic
+IGNORED_INTERFACES = ("lo", "docker", "veth", "virbr", "br-")
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    cpu_percent: float = None
+    memory_percent: float = None
+    battery_percent: int = None
+    charging: bool = None
+    temperature_c: float = None
+    rx_rate: float = None
+    tx_rate: float = None
+    storage_percent: float = None
+    sampled_at: float = 0.0
+    cost_us: float = 0.0
+
+def format_rate(rate):
+    for unit, size in (("MB/s", 1024 * 1024), ("kB/s", 1024)):
+        if rate >= size:
+            return f"{rate / size:.1f} {unit}"
+    return f"{rate:.0f} B/s"
+
+class StatusProbe:
+    # One pass over /proc and /sys per sample; files stay open and are re-read with pread from offset 0
+    def __init__(self, root="/", storage_path="/"):
+        self.root = root
+        self.storage_path = storage_path
+        self.fds = {}
+        self.battery = None
+        self.thermal = []
+        self.previous_cpu = None
+        self.previous_net = None
+        self.discover()
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def discover(self):
+        supplies = self.path("sys", "class", "power_supply")
+        self.battery = None
+        for name in self._listdir(supplies):
+            if self._read(os.path.join(supplies, name, "type"), keep=False) == "Battery":
+                self.battery = os.path.join(supplies, name)
+                break
+        thermal = self.path("sys", "class", "thermal")
+        self.thermal = [os.path.join(thermal, name, "temp") for name in self._listdir(thermal)
+                        if name.startswith("thermal_zone")]
+
+    def close(self):
+        for fd in self.fds.values():
+            os.close(fd)
+        self.fds.clear()
+
+    def sample(self):
+        start = time.thread_time()
+        now = time.monotonic()
+        cpu = self._cpu()
+        rx_rate, tx_rate = self._network(now)
+        battery_percent, charging = self._battery()
+        snapshot = dict(cpu_percent=cpu, memory_percent=self._memory(), battery_percent=battery_percent,
+                        charging=charging, temperature_c=self._temperature(), rx_rate=rx_rate, tx_rate=tx_rate,
+                        storage_percent=self._storage(), sampled_at=now)
+        return StatusSnapshot(cost_us=round((time.thread_time() - start) * 1e6, 1), **snapshot)
+
+    def _cpu(self):
+        text = self._read(self.path("proc", "stat"))
+        if not text:
+            return None
+        try:
+            values = [int(value) for value in text.split("\n", 1)[0].split()[1:]]
+        except ValueError:
+            return None
+        # idle + iowait count as not busy; guest time is already folded into user
+        idle, total = values[3] + (values[4] if len(values) > 4 else 0), sum(values[:8])
+        previous, self.previous_cpu = self.previous_cpu, (idle, total)
+        if previous is None or total <= previous[1]:
+            return None
+        return round(100 * (1 - (idle - previous[0]) / (total - previous[1])), 1)
+
+    def _memory(self):
+        text = self._read(self.path("proc", "meminfo"))
+        fields = {}
+        for line in (text or "").splitlines():
+            name, _, value = line.partition(":")
+            if name in ("MemTotal", "MemAvailable"):
+                fields[name] = int(value.split()[0])
+        if not fields.get("MemTotal") or "MemAvailable" not in fields:
+            return None
+        return round(100 * (1 - fields["MemAvailable"] / fields["MemTotal"]), 1)
+
+    def _network(self, now):
+        text = self._read(self.path("proc", "net", "dev"))
+        if not text:
+            return None, None
+        rx = tx = 0
+        for line in text.splitlines()[2:]:
+            name, _, counters = line.partition(":")
+            if name.strip().startswith(IGNORED_INTERFACES):
+                continue
+            values = counters.split()
+            if len(values) >= 9:
+                rx += int(values[0])
+                tx += int(values[8])
+        previous, self.previous_net = self.previous_net, (now, rx, tx)
+        if previous is None or now <= previous[0] or rx < previous[1] or tx < previous[2]:
+            return None, None
+        elapsed = now - previous[0]
+        return (rx - previous[1]) / elapsed, (tx - previous[2]) / elapsed
+
+    def _battery(self):
+        if not self.battery:
+            return None, None
+        capacity = self._read(os.path.join(self.battery, "capacity"))
+        status = self._read(os.path.join(self.battery, "status"))
+        if capacity is None:
+            # Unplugged or renamed; look again on the next sample
+            self.discover()
+            return None, None
+        try:
+            return int(capacity), status in ("Charging", "Full")
+        except ValueError:
+            return None, None
+
+    def _temperature(self):
+        readings = []
+        for path in self.thermal:
+            value = self._read(path)
+            if value and value.lstrip("-").isdigit():
+                readings.append(int(value) / 1000)
+        return max(readings) if readings else None
+
+    def _storage(self):
+        try:
+            stat = os.statvfs(self.storage_path)
+        except OSError:
+            return None
+        if not stat.f_blocks:
+            return None
+        return round(100 * (1 - stat.f_bavail / stat.f_blocks), 1)
+
+    def _listdir(self, path):
+        try:
+            return sorted(os.listdir(path))
+        except OSError:
+            return []
+
+    def _read(self, path, keep=True):
+        fd = self.fds.get(path)
+        try:
+            if fd is None:
+                fd = os.open(path, os.O_RDONLY)
+                if keep:
+                    self.fds[path] = fd
+            try:
+                return os.pread(fd, READ_SIZE, 0).decode("utf8", "replace").strip()
+            finally:
+                if not keep:
+                    os.close(fd)
+        except OSError:
+            if path in self.fds:
+                os.close(self.fds.pop(path))
+            return None
+
+class StatusSampler(QObject):
+    # A single worker samples everything; widgets subscribe instead of polling on their own
+    sampled = Signal(object)
+    _measured = Signal(object)
+
+    def __init__(self, root="/", storage_path="/", parent=None):
+        super().__init__(parent)
+        self.probe = StatusProbe(root, storage_path)
+        self.latest = None
+        self.visible = True
+        self.last_activity = time.monotonic()
+        self.samples = 0
+        self.cost_us = 0.0
+        self._cond = threading.Condition()
+        self._running = False
+        self._worker = None
+        self._measured.connect(self._handle_measured)
+
+    def subscribe(self, callback):
+        self.sampled.connect(callback)
+        if self.latest is not None:
+            callback(self.latest)
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+        if self._worker is not None:
+            self._worker.join()  # a stopped worker finishes its pass and exits; never run two probes
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name="system-status", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def set_visible(self, visible):
+        with self._cond:
+            self.visible = visible
+            self.last_activity = time.monotonic()
+            self._cond.notify()
+
+    def touch(self):
+        # Called on user input; a worker sleeping on the idle interval is woken to catch up
+        with self._cond:
+            was_idle = self._idle()
+            self.last_activity = time.monotonic()
+            if was_idle:
+                self._cond.notify()
+
+    def interval(self):
+        if not self.visible:
+            return HIDDEN_INTERVAL_S
+        return IDLE_INTERVAL_S if self._idle() else ACTIVE_INTERVAL_S
+
+    def summary(self):
+        return {"samples": self.samples, "cpu_ms": round(self.cost_us / 1000, 3),
+                "mean_cost_us": round(self.cost_us / self.samples, 1) if self.samples else None,
+                "interval_s": self.interval()}
+
+    def _idle(self):
+        return time.monotonic() - self.last_activity >= IDLE_AFTER_S
+
+    def _run(self):
+        while True:
+            snapshot = self.probe.sample()
+            try:
+                self._measured.emit(snapshot)
+            except RuntimeError:
+                break  # window rebuilt while we were reading
+            with self._cond:
+                while self._running:
+                    # Re-evaluated on every wake-up so that becoming active shortens the wait
+                    remaining = snapshot.sampled_at + self.interval() - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._running:
+                    break
+        self.probe.close()
+
+    def _handle_measured(self, snapshot):
+        # Published from the GUI thread so that subscribe() can never miss a snapshot in flight
+        self.latest = snapshot
+        self.samples += 1
+        self.cost_us += snapshot.cost_us
+        tracer.record("status_sampler", self.summary())
+        self.sampled.emit(snapshot)
+
+class StatusStrip(QWidget):
+    def __init__(self, sampler, parent=None):
+        super().__init__(parent)
+        self.setObjectName("statusStrip")
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(30)
+        layout.addStretch()
+        self.labels = {}
+        for key in ("cpu", "memory", "temperature", "battery", "network", "storage"):
+            label = QLabel()
+            label.setProperty("role", "status")
+            label.hide()
+            layout.addWidget(label)
+            self.labels[key] = label
+        layout.addStretch()
+        sampler.subscribe(self.show_snapshot)
+
+    def show_snapshot(self, snapshot):
+        self._set("cpu", snapshot.cpu_percent, lambda value: f"CPU {value:.0f}%")
+        self._set("memory", snapshot.memory_percent, lambda value: f"RAM {value:.0f}%")
+        self._set("temperature", snapshot.temperature_c, lambda value: f"{value:.0f}°C")
+        self._set("battery", snapshot.battery_percent,
+                  lambda value: f"Bateria {value}%" + (" (ładowanie)" if snapshot.charging else ""))
+        self._set("network", snapshot.rx_rate,
+                  lambda value: f"↓ {format_rate(value)}  ↑ {format_rate(snapshot.tx_rate)}")
+        self._set("storage", snapshot.storage_percent, lambda value: f"Dysk {value:.0f}%")
+
+    def _set(self, key, value, text):
+        label = self.labels[key]
+        if value is None:
+            label.hide()
+            return
+        label.setText(text(value))
+        label.show()
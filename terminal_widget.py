@@ -1,31 +1,184 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QTextEdit
-from PySide6.QtCore import QProcess
+import codecs
+from collections import deque
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QAbstractScrollArea
+from PySide6.QtCore import QProcess, QTimer
+from PySide6.QtGui import QPainter, QPalette
+from command_runner import get_runner
+
+FLUSH_INTERVAL_MS = 16  # at most one repaint per frame
+MAX_LINES = 5000
+
+class LineBuffer:
+    # Fixed-capacity ring of complete lines plus the line still being written
+    def __init__(self, capacity=MAX_LINES):
+        self.lines = deque(maxlen=capacity)
+        self.partial = ""
+        self.total = 0  # lines ever completed, including those already evicted
+
+    def __len__(self):
+        return len(self.lines) + (1 if self.partial else 0)
+
+    def __getitem__(self, index):
+        if index == len(self.lines):
+            return self.partial[:-1] if self.partial.endswith("\r") else self.partial
+        return self.lines[index]
+
+    def clear(self):
+        self.lines.clear()
+        self.partial = ""
+        self.total = 0
+
+    def feed(self, text):
+        # The partial line is prepended so a CRLF or a redraw split across reads is seen whole
+        parts = (self.partial + text).split("\n")
+        for part in parts[:-1]:
+            if part.endswith("\r"):
+                part = part[:-1]
+            self.lines.append(part.rsplit("\r", 1)[-1])
+            self.total += 1
+        self.partial = self._collapse(parts[-1])
+
+    @staticmethod
+    def _collapse(text):
+        # Carriage returns redraw the line in place, as progress bars expect; only the last redraw is kept,
+        # along with a trailing \r that the next read will draw over
+        cut = text.rfind("\r", 0, len(text) - 1)
+        return text[cut + 1:] if cut >= 0 else text
+
+class TerminalView(QAbstractScrollArea):
+    # Read-only view that only lays out and paints the visible slice of the buffer
+    def __init__(self, buffer, parent=None):
+        super().__init__(parent)
+        self.buffer = buffer
+        self.follow = True
+        self.widest = 0  # widest line seen on screen so far; long nmcli lines scroll sideways
+        self.verticalScrollBar().valueChanged.connect(self.viewport().update)
+        self.verticalScrollBar().valueChanged.connect(self._measure_visible)
+        self.horizontalScrollBar().valueChanged.connect(self.viewport().update)
+        self.verticalScrollBar().sliderMoved.connect(self._update_follow)
+
+    def line_height(self):
+        return self.viewport().fontMetrics().lineSpacing()
+
+    def visible_lines(self):
+        return max(1, self.viewport().height() // self.line_height())
+
+    def refresh(self):
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setRange(0, max(0, len(self.buffer) - self.visible_lines()))
+        scroll_bar.setPageStep(self.visible_lines())
+        if self.follow:
+            scroll_bar.setValue(scroll_bar.maximum())
+        self._measure_visible()
+        self.viewport().update()
+
+    def _measure_visible(self):
+        # Only the visible slice is measured, so the cost stays flat however long the buffer grows
+        metrics = self.viewport().fontMetrics()
+        first = self.verticalScrollBar().value()
+        for index in range(first, min(len(self.buffer), first + self.visible_lines() + 1)):
+            self.widest = max(self.widest, metrics.horizontalAdvance(self.buffer[index]) + 8)
+        horizontal = self.horizontalScrollBar()
+        horizontal.setRange(0, max(0, self.widest - self.viewport().width()))
+        horizontal.setPageStep(self.viewport().width())
+
+    def reset(self):
+        self.follow = True
+        self.widest = 0
+        self.horizontalScrollBar().setValue(0)
+        self.refresh()
+
+    def _update_follow(self, value):
+        self.follow = value >= self.verticalScrollBar().maximum()
+
+    def wheelEvent(self, event):
+        super().wheelEvent(event)
+        self._update_follow(self.verticalScrollBar().value())
+
+    def keyPressEvent(self, event):
+        super().keyPressEvent(event)
+        self._update_follow(self.verticalScrollBar().value())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.refresh()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.setPen(self.palette().color(QPalette.Text))
+        metrics = painter.fontMetrics()
+        height = self.line_height()
+        first = self.verticalScrollBar().value()
+        last = min(len(self.buffer), first + self.visible_lines() + 1)
+        x = 4 - self.horizontalScrollBar().value()
+        y = metrics.ascent()
+        for index in range(first, last):
+            painter.drawText(x, y, self.buffer[index])
+            y += height
 
 class TerminalWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
-        self.output = QTextEdit(self)
-        self.output.setReadOnly(True)
-        self.output.setStyleSheet("background-color: #001020; color: #00FF80; border: 6px solid #004080; font-family: 'Courier New'; font-size: 18px;")
+        self.buffer = LineBuffer()
+        self.output = TerminalView(self.buffer, self)
+        self.output.setObjectName("terminal")
+        self.output.setMinimumHeight(300)
         self.layout.addWidget(self.output)
-        self.process = QProcess(self)
-        self.process.readyReadStandardOutput.connect(self.handle_stdout)
-        self.process.readyReadStandardError.connect(self.handle_stderr)
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.output.refresh)
+        self.process = self.create_process()
+        self.reset_decoders()
+
+    def create_process(self):
+        process = QProcess(self)
+        process.readyReadStandardOutput.connect(self.handle_stdout)
+        process.readyReadStandardError.connect(self.handle_stderr)
+        process.finished.connect(self.handle_finished)
+        return process
+
+    def reset_decoders(self):
+        # Separate incremental decoders so multibyte characters split across reads survive
+        self.stdout_decoder = codecs.getincrementaldecoder("utf8")(errors="replace")
+        self.stderr_decoder = codecs.getincrementaldecoder("utf8")(errors="replace")
 
-    def run_command(self, command, args=None):
-        self.output.clear()
-        if args:
-            self.process.start(command, args)
-        else:
-            self.process.start(command)
+    def run_command(self, program, args=None, stdin=None):
+        # Qt 6 no longer splits a command line, so the program and its arguments are always separate
+        if self.process.state() != QProcess.NotRunning:
+            # The old child is killed without waiting for it; a fresh process takes its place
+            self.process.readyReadStandardOutput.disconnect(self.handle_stdout)
+            self.process.readyReadStandardError.disconnect(self.handle_stderr)
+            self.process.finished.disconnect(self.handle_finished)
+            get_runner().retire_process(self.process)
+            self.process = self.create_process()
+        self.clear()
+        get_runner().start_process(self.process, program, args)
+        if stdin is not None:
+            # Secrets go through the pipe, never argv, where every local user could read them
+            self.process.write(stdin.encode("utf8"))
+            self.process.closeWriteChannel()
+
+    def clear(self):
+        self.buffer.clear()
+        self.reset_decoders()
+        self.output.reset()
+
+    def append_text(self, text):
+        if text:
+            self.buffer.feed(text)
+            if not self.flush_timer.isActive():
+                self.flush_timer.start()
 
     def handle_stdout(self):
         data = self.process.readAllStandardOutput()
-        stdout = bytes(data).decode("utf8")
-        self.output.append(stdout)
+        self.append_text(self.stdout_decoder.decode(bytes(data)))
 
     def handle_stderr(self):
         data = self.process.readAllStandardError()
-        stderr = bytes(data).decode("utf8")
-        self.output.append(stderr)
+        self.append_text(self.stderr_decoder.decode(bytes(data)))
+
+    def handle_finished(self):
+        self.append_text(self.stdout_decoder.decode(b"", final=True))
+        self.append_text(self.stderr_decoder.decode(b"", final=True))
@@ -0,0 +1,43 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def wait_until(qapp):
+    # Spins the real event loop until the predicate holds; queued runner callbacks need it
+    from PySide6.QtCore import QEventLoop, QTimer, QElapsedTimer
+
+    def wait(predicate, timeout_ms=5000):
+        clock = QElapsedTimer()
+        clock.start()
+        loop = QEventLoop()
+        while not predicate() and clock.elapsed() < timeout_ms:
+            QTimer.singleShot(5, loop.quit)
+            loop.exec()
+        return predicate()
+
+    return wait
+
+@pytest.fixture
+def stub_bin(tmp_path, monkeypatch):
+    # Writes executable stubs into a directory that shadows the real tools on PATH
+    directory = tmp_path / "bin"
+    directory.mkdir()
+    monkeypatch.setenv("PATH", f"{directory}{os.pathsep}{os.environ['PATH']}")
+
+    def install(name, text):
+        path = directory / name
+        path.write_text(text)
+        path.chmod(0o755)
+        return path
+
+    return install
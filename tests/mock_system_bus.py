@@ -0,0 +1,66 @@
+# Stand-ins for logind and timedated, exported on whatever bus DBUS_SYSTEM_BUS_ADDRESS points at.
+# Usage: mock_system_bus.py LOG_FILE [BLOCK_INHIBITED]
+import sys
+from PySide6.QtCore import QCoreApplication, QObject, Slot, ClassInfo, Property
+from PySide6.QtDBus import QDBusConnection, QDBusMessage
+
+app = QCoreApplication(sys.argv)
+bus = QDBusConnection.systemBus()
+log = open(sys.argv[1], "a")
+
+def record(line):
+    log.write(line + "\n")
+    log.flush()
+
+@ClassInfo({"D-Bus Interface": "org.freedesktop.login1.Manager"})
+class Login(QObject):
+    def __init__(self, blocked):
+        super().__init__()
+        self._blocked = blocked
+
+    def block_inhibited(self):
+        return self._blocked
+
+    BlockInhibited = Property(str, block_inhibited)
+
+    @Slot(bool)
+    def PowerOff(self, interactive):
+        record(f"PowerOff {interactive}")
+
+    @Slot(bool)
+    def Reboot(self, interactive):
+        record(f"Reboot {interactive}")
+
+    @Slot(bool)
+    def Suspend(self, interactive):
+        record(f"Suspend {interactive}")
+
+@ClassInfo({"D-Bus Interface": "org.freedesktop.timedate1"})
+class TimeDate(QObject):
+    def __init__(self):
+        super().__init__()
+        self._timezone = "Europe/Warsaw"
+
+    def timezone(self):
+        return self._timezone
+
+    Timezone = Property(str, timezone)
+
+    @Slot(str, bool, QDBusMessage)
+    def SetTimezone(self, timezone, interactive, message):
+        if "/" not in timezone:
+            bus.send(message.createErrorReply("org.freedesktop.DBus.Error.InvalidArgs",
+                                              f"Invalid or not installed time zone '{timezone}'"))
+            return
+        self._timezone = timezone
+        record(f"SetTimezone {timezone}")
+
+login = Login(sys.argv[2] if len(sys.argv) > 2 else "")
+timedate = TimeDate()
+flags = QDBusConnection.ExportAllSlots | QDBusConnection.ExportAllProperties
+ready = all([bus.registerObject("/org/freedesktop/login1", login, flags),
+             bus.registerObject("/org/freedesktop/timedate1", timedate, flags),
+             bus.registerService("org.freedesktop.login1"),
+             bus.registerService("org.freedesktop.timedate1")])
+print("ready" if ready else "failed", flush=True)
+app.exec()
@@ -0,0 +1,25 @@
+from PySide6.QtGui import QFont
+from PySide6.QtTest import QTest
+from banner import BannerWidget
+
+def test_repaints_do_not_measure_the_text_again(qapp, tmp_path, monkeypatch):
+    banner = BannerWidget(cache_dir=str(tmp_path))
+    measured = []
+    measure = banner.measure
+    monkeypatch.setattr(banner, "measure", lambda: measured.append(True) or measure())
+    banner.resize(banner.sizeHint() / 2)
+    banner.show()
+    assert QTest.qWaitForWindowExposed(banner)
+    for _ in range(5):
+        banner.repaint()
+    assert len(measured) == 1
+    assert banner.scale == 0.5
+    assert len(list(tmp_path.glob("*.png"))) == 1
+    font = QFont(banner.font())
+    font.setPointSize(font.pointSize() + 4)
+    banner.setFont(font)
+    banner.repaint()
+    assert len(measured) == 2
+    assert banner.scale < 0.5
+    assert len(list(tmp_path.glob("*.png"))) == 2
+    banner.close()
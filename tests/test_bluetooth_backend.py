@@ -0,0 +1,110 @@
+import sys
+import time
+import pytest
+from bluetooth_backend import BluetoothController, BluetoothDevice, parse_rssi, clean_line
+
+def test_parse_rssi_formats():
+    assert parse_rssi("0xffffffc4 (-60)") == -60
+    assert parse_rssi("-60") == -60
+    assert parse_rssi("0xffffffc4") == -60
+    assert parse_rssi("0x0000000a") == 10
+    assert parse_rssi("n/a") is None
+
+def test_rssi_change_events_update_the_device(qapp):
+    controller = BluetoothController(program="/nonexistent")
+    controller.feed("[NEW] Device AA:BB:CC:DD:EE:FF Pad\n")
+    controller.feed("[CHG] Device AA:BB:CC:DD:EE:FF RSSI: 0xffffffc4 (-60)\n")
+    assert controller.devices["AA:BB:CC:DD:EE:FF"].rssi == -60
+    controller.feed("[\x1b[0;93mCHG\x1b[0m] Device AA:BB:CC:DD:EE:FF RSSI: -42\n")
+    assert controller.devices["AA:BB:CC:DD:EE:FF"].rssi == -42
+
+def test_clean_line_strips_colours():
+    assert clean_line("[\x1b[0;92mNEW\x1b[0m] Device AA:BB:CC:DD:EE:FF Pad") == "[NEW] Device AA:BB:CC:DD:EE:FF Pad"
+
+# Scripted bluetoothctl: logs every command it reads and answers like the real one
+BLUETOOTHCTL = """#!{python}
+import sys
+def out(text):
+    sys.stdout.write(text + "\\n")
+    sys.stdout.flush()
+paired = set()
+log = open({log!r}, "a")
+for line in sys.stdin:
+    command = line.split()
+    log.write(line)
+    log.flush()
+    if command == ["devices"]:
+        out("Device 11:22:33:44:55:66 Sluchawki")
+    elif command[:1] == ["info"]:
+        out("Device 11:22:33:44:55:66 (public)")
+        out("\\tName: Sluchawki")
+        out("\\tPaired: yes")
+        out("\\tConnected: no")
+    elif command == ["scan", "on"]:
+        out("[CHG] Controller 00:00:00:00:00:01 Discovering: yes")
+        out("[NEW] Device AA:BB:CC:DD:EE:FF Pad")
+    elif command == ["scan", "off"]:
+        out("[CHG] Controller 00:00:00:00:00:01 Discovering: no")
+    elif command[:1] == ["pair"]:
+        out("Pairing successful")
+        out(f"[CHG] Device {{command[1]}} Paired: yes")
+    elif command[:1] == ["connect"]:
+        out(f"[CHG] Device {{command[1]}} Connected: yes")
+        out("Connection successful")
+    elif command == ["quit"]:
+        break
+"""
+
+def commands(log):
+    return log.read_text().splitlines() if log.exists() else []
+
+@pytest.fixture
+def bluetoothctl(stub_bin, tmp_path):
+    log = tmp_path / "commands"
+    stub_bin("bluetoothctl", BLUETOOTHCTL.format(python=sys.executable, log=str(log)))
+    return log
+
+def test_start_lists_devices_and_asks_for_their_state(qapp, wait_until, bluetoothctl):
+    controller = BluetoothController()
+    controller.start()
+    assert wait_until(lambda: controller.devices.get("11:22:33:44:55:66", BluetoothDevice("", "")).paired)
+    assert commands(bluetoothctl) == ["devices", "info 11:22:33:44:55:66"]
+    assert controller.devices["11:22:33:44:55:66"].name == "Sluchawki"
+    controller.stop()
+
+def test_discovery_switches_itself_off(qapp, wait_until, bluetoothctl):
+    controller = BluetoothController(discovery_timeout=200)
+    states = []
+    controller.discovering_changed.connect(states.append)
+    controller.start()
+    controller.start_discovery()
+    assert wait_until(lambda: states == [True, False])
+    sent = commands(bluetoothctl)
+    assert sent.count("scan off") == 1 and sent.index("scan on") < sent.index("scan off")
+    assert "AA:BB:CC:DD:EE:FF" in controller.devices
+    controller.stop()
+
+def test_unpaired_device_is_paired_trusted_and_connected(qapp, wait_until, bluetoothctl):
+    controller = BluetoothController()
+    messages = []
+    controller.message.connect(messages.append)
+    controller.start()
+    controller.start_discovery()
+    assert wait_until(lambda: "AA:BB:CC:DD:EE:FF" in controller.devices)
+    controller.connect_device("AA:BB:CC:DD:EE:FF")
+    assert wait_until(lambda: controller.devices["AA:BB:CC:DD:EE:FF"].connected)
+    sent = [command for command in commands(bluetoothctl) if command.endswith("AA:BB:CC:DD:EE:FF")]
+    assert sent == ["pair AA:BB:CC:DD:EE:FF", "trust AA:BB:CC:DD:EE:FF", "connect AA:BB:CC:DD:EE:FF"]
+    assert messages == ["Pairing successful", "Connection successful"]
+    controller.stop()
+
+def test_stop_ends_the_scan_and_quits_without_waiting(qapp, wait_until, bluetoothctl):
+    controller = BluetoothController()
+    controller.start()
+    controller.start_discovery()
+    assert wait_until(lambda: controller.discovering)
+    start = time.monotonic()
+    controller.stop()
+    assert time.monotonic() - start < 0.1
+    assert not controller.discovering
+    assert wait_until(lambda: commands(bluetoothctl)[-2:] == ["scan off", "quit"])
@@ -0,0 +1,102 @@
+import os
+import time
+import brightness_backend
+from brightness_backend import BrightnessBackend, find_backlight
+
+BRIGHTNESSCTL = """#!/bin/sh
+case "$1" in
+  get) echo 40;;
+  max) echo 100;;
+  set)
+    # Two writes running at once would find the other's marker
+    [ -e {marker} ] && echo overlap >> {log}
+    touch {marker}
+    sleep 0.05
+    echo "$2" >> {log}
+    rm -f {marker};;
+esac
+"""
+
+def test_cli_writes_are_serialized_and_end_on_the_last_value(qapp, wait_until, stub_bin, tmp_path):
+    log, marker = tmp_path / "writes", tmp_path / "writing"
+    stub_bin("brightnessctl", BRIGHTNESSCTL.format(log=log, marker=marker))
+    backend = BrightnessBackend(root=str(tmp_path / "no-backlight"))
+    assert not backend.uses_sysfs
+    for value in range(10, 61, 2):
+        backend.set_brightness(value)
+    assert wait_until(lambda: backend.level == 60)
+    writes = log.read_text().split()
+    assert "overlap" not in writes
+    assert writes[-1] == "60%"
+    assert len(writes) < 26  # values sent during a write were coalesced
+    backend.stop()
+
+def test_level_is_kept_when_the_write_fails(qapp, wait_until, stub_bin, tmp_path):
+    stub_bin("brightnessctl", "#!/bin/sh\n[ \"$1\" = set ] && exit 1\necho 100\n")
+    backend = BrightnessBackend(root=str(tmp_path / "no-backlight"))
+    backend.level = 30
+    backend.set_brightness(80)
+    wait_until(lambda: False, timeout_ms=300)
+    assert backend.level == 30
+    backend.stop()
+
+def backlight(root, name, kind, maximum, actual=None, brightness=0):
+    device = root / name
+    device.mkdir(parents=True)
+    (device / "type").write_text(kind + "\n")
+    (device / "max_brightness").write_text(f"{maximum}\n")
+    (device / "brightness").write_text(f"{brightness}\n")
+    if actual is not None:
+        (device / "actual_brightness").write_text(f"{actual}\n")
+    return device
+
+def test_find_backlight_prefers_firmware_then_platform_then_raw(tmp_path):
+    backlight(tmp_path, "intel_backlight", "raw", 96000)
+    backlight(tmp_path, "nv_backlight", "platform", 100)
+    backlight(tmp_path, "acpi_video0", "firmware", 0)  # a zero maximum can't be driven
+    assert find_backlight(str(tmp_path)) == str(tmp_path / "nv_backlight")
+    backlight(tmp_path, "acpi_video1", "firmware", 15)
+    assert find_backlight(str(tmp_path)) == str(tmp_path / "acpi_video1")
+    assert find_backlight(str(tmp_path / "missing")) is None
+
+def test_initial_level_comes_from_actual_brightness(qapp, tmp_path):
+    backlight(tmp_path, "panel", "raw", 200, actual=100, brightness=150)
+    backend = BrightnessBackend(root=str(tmp_path))
+    assert backend.uses_sysfs and backend.level == 50
+    backend.stop()
+    (tmp_path / "panel" / "actual_brightness").unlink()
+    backend = BrightnessBackend(root=str(tmp_path))
+    assert backend.level == 75
+    backend.stop()
+
+def test_sysfs_writes_are_coalesced_and_rate_capped(qapp, tmp_path, wait_until, monkeypatch):
+    device = backlight(tmp_path, "panel", "raw", 200, actual=0)
+    writes = []
+    pwrite = os.pwrite
+    monkeypatch.setattr(brightness_backend.os, "pwrite",
+                        lambda fd, data, offset: writes.append((time.monotonic(), data)) or pwrite(fd, data, offset))
+    backend = BrightnessBackend(root=str(tmp_path), max_rate=20)
+    for value in range(10, 61, 2):
+        backend.set_brightness(value)
+        time.sleep(0.005)
+    assert wait_until(lambda: backend.level == 60)
+    backend.stop()
+    assert writes[-1][1] == b"120\n"
+    assert (device / "brightness").read_text().split("\n")[0] == "120"
+    assert len(writes) < 26
+    gaps = [later[0] - earlier[0] for earlier, later in zip(writes, writes[1:])]
+    assert min(gaps) >= 0.05 - 0.005
+
+def test_unwritable_brightness_falls_back_to_brightnessctl(qapp, tmp_path, wait_until, stub_bin):
+    log = tmp_path / "writes"
+    stub_bin("brightnessctl", BRIGHTNESSCTL.format(log=log, marker=tmp_path / "writing"))
+    device = backlight(tmp_path / "sys", "panel", "raw", 200, actual=100)
+    # Stands in for a read-only node; chmod alone doesn't stop root, and tests may run as root
+    (device / "brightness").unlink()
+    (device / "brightness").mkdir()
+    backend = BrightnessBackend(root=str(tmp_path / "sys"))
+    assert not backend.uses_sysfs and backend.level == 50
+    backend.set_brightness(70)
+    assert wait_until(lambda: backend.level == 70)
+    assert log.read_text().split() == ["70%"]
+    backend.stop()
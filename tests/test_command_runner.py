@@ -0,0 +1,47 @@
+import time
+from PySide6.QtCore import QObject, QProcess
+from command_runner import get_runner
+
+def test_cached_query_spawns_once(qapp, wait_until, stub_bin, tmp_path):
+    log = tmp_path / "calls"
+    stub_bin("query-tool", f"#!/bin/sh\necho run >> {log}\necho 100\n")
+    runner = get_runner()
+    results = []
+    runner.run(["query-tool"], results.append, cache_ttl=60)
+    assert wait_until(lambda: len(results) == 1)
+    runner.run(["query-tool"], results.append, cache_ttl=60)
+    assert wait_until(lambda: len(results) == 2)
+    assert results[1].cached and results[1].stdout == "100\n"
+    assert log.read_text().count("run") == 1
+    runner.invalidate(["query-tool"])
+    runner.run(["query-tool"], results.append, cache_ttl=60)
+    assert wait_until(lambda: len(results) == 3)
+    assert not results[2].cached
+    assert log.read_text().count("run") == 2
+
+def test_identical_commands_in_flight_share_one_child(qapp, wait_until, stub_bin, tmp_path):
+    log = tmp_path / "calls"
+    stub_bin("slow-tool", f"#!/bin/sh\necho run >> {log}\nsleep 0.2\n")
+    runner = get_runner()
+    results = []
+    runner.run(["slow-tool"], results.append)
+    runner.run(["slow-tool"], results.append)
+    assert wait_until(lambda: len(results) == 2)
+    assert log.read_text().count("run") == 1
+
+def test_retired_process_is_killed_after_its_grace_without_waiting(qapp, wait_until, stub_bin):
+    program = stub_bin("stubborn", "#!/bin/sh\ntrap '' TERM\nexec sleep 30\n")
+    runner = get_runner()
+    owner = QObject()
+    process = QProcess(owner)
+    runner.start_process(process, str(program))
+    assert process.waitForStarted(5000)
+    gone = []
+    process.destroyed.connect(lambda: gone.append(True))
+    start = time.monotonic()
+    runner.retire_process(process, grace_ms=200)
+    assert time.monotonic() - start < 0.1
+    assert process.parent() is runner
+    owner.deleteLater()
+    assert wait_until(lambda: gone)
+    assert time.monotonic() - start >= 0.15  # coarse timers may fire a little early
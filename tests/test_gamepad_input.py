@@ -0,0 +1,160 @@
+import os
+import re
+from pathlib import Path
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QSlider
+from gamepad_input import EVENT, GamepadDecoder, GamepadDevice, GamepadInput
+from terminal_widget import TerminalWidget
+from timezone_index import LetterWheel, WHEEL_ENTRIES, WHEEL_ERASE
+
+DATA = Path(__file__).parent / "data"
+EVTEST_RE = re.compile(r"time (\d+)\.(\d+), (?:type (\d+) .*code (\d+) .*value (-?\d+)|-+ SYN_REPORT)")
+
+def recorded_stream(name):
+    # evtest's text dump turned back into the struct input_event records the kernel hands out
+    records = []
+    for line in (DATA / name).read_text().splitlines():
+        seconds, micros, kind, code, value = EVTEST_RE.search(line).groups()
+        records.append(EVENT.pack(int(seconds), int(micros), int(kind or 0), int(code or 0), int(value or 0)))
+    return b"".join(records)
+
+EXPECTED = [
+    ("down", True, 1760791200.104512), ("down", False, 1760791200.236097),
+    ("right", True, 1760791201.059338), ("right", False, 1760791201.195117),
+    ("left", True, 1760791202.402661), ("left", False, 1760791202.530018),
+    ("accept", True, 1760791203.310455), ("accept", False, 1760791203.421987),
+]
+
+def test_decoder_replays_recording():
+    actions = GamepadDecoder().feed(recorded_stream("gamepad_evtest.txt"))
+    assert [(action, pressed) for action, pressed, _ in actions] == [entry[:2] for entry in EXPECTED]
+    assert [timestamp for _, _, timestamp in actions] == pytest.approx([entry[2] for entry in EXPECTED])
+
+def test_decoder_keeps_records_split_between_reads():
+    data = recorded_stream("gamepad_evtest.txt")
+    decoder = GamepadDecoder()
+    actions = []
+    for offset in range(0, len(data), 7):
+        actions += decoder.feed(data[offset:offset + 7])
+    assert [(action, pressed) for action, pressed, _ in actions] == [entry[:2] for entry in EXPECTED]
+
+@pytest.fixture
+def screen(qapp):
+    #         [edit ]
+    # [side]  [wheel]
+    # horizontal slider
+    # terminal
+    # [ok]
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    window.edit = QLineEdit("ab")
+    top = QHBoxLayout()
+    top.addSpacing(80 + top.spacing())
+    top.addWidget(window.edit)
+    layout.addLayout(top)
+    row = QHBoxLayout()
+    window.side = QPushButton("side")
+    window.side.setFixedWidth(80)
+    window.wheel = LetterWheel()
+    window.typed = []
+    window.wheel.letter_chosen.connect(window.typed.append)
+    window.wheel.erase.connect(lambda: window.typed.append(WHEEL_ERASE))
+    row.addWidget(window.side)
+    row.addWidget(window.wheel)
+    layout.addLayout(row)
+    window.slider = QSlider(Qt.Horizontal)
+    window.slider.setRange(0, 100)
+    window.slider.setValue(50)
+    layout.addWidget(window.slider)
+    window.terminal = TerminalWidget()
+    window.terminal.append_text("".join(f"line {index}\n" for index in range(200)))
+    layout.addWidget(window.terminal)
+    window.ok = QPushButton("ok")
+    layout.addWidget(window.ok)
+    window.resize(600, 800)
+    window.show()
+    window.activateWindow()
+    assert QTest.qWaitForWindowActive(window)
+    window.terminal.output.refresh()
+    window.pad = GamepadInput(window)
+    yield window
+    window.close()
+
+def focus(widget):
+    widget.setFocus(Qt.OtherFocusReason)
+    assert widget.hasFocus()
+
+def test_slider_only_takes_its_own_axis(screen):
+    focus(screen.slider)
+    screen.pad.move("right")
+    assert screen.slider.value() == 51 and screen.slider.hasFocus()
+    screen.pad.move("down")
+    assert screen.slider.value() == 51
+    assert screen.terminal.output.hasFocus()
+    screen.terminal.output.verticalScrollBar().setValue(0)
+    screen.pad.move("up")
+    assert screen.slider.hasFocus() and screen.slider.value() == 51
+
+def test_terminal_scrolls_then_lets_go(screen):
+    view = screen.terminal.output
+    bar = view.verticalScrollBar()
+    focus(view)
+    assert bar.value() == bar.maximum() > 0
+    screen.pad.move("up")
+    assert view.hasFocus() and bar.value() == bar.maximum() - 1
+    screen.pad.move("down")
+    assert view.hasFocus() and bar.value() == bar.maximum()
+    screen.pad.move("down")
+    assert screen.ok.hasFocus()
+    bar.setValue(0)
+    focus(view)
+    screen.pad.move("up")
+    assert screen.slider.hasFocus()
+
+def test_line_edit_lets_go_at_the_cursor_ends(screen):
+    focus(screen.edit)
+    screen.edit.setCursorPosition(2)
+    screen.pad.move("left")
+    assert screen.edit.hasFocus() and screen.edit.cursorPosition() == 1
+    screen.pad.move("down")
+    assert not screen.edit.hasFocus()
+
+def test_letter_wheel_has_exits(screen):
+    wheel = screen.wheel
+    focus(wheel)
+    beside = screen.pad.neighbour(wheel, "left")
+    screen.pad.move("left")
+    assert beside is not None and beside.hasFocus() and wheel.letter() == "A"
+    focus(wheel)
+    screen.pad.move("right")
+    assert wheel.hasFocus() and wheel.letter() == "B"
+    screen.pad.activate()
+    screen.pad.move("up")
+    assert screen.edit.hasFocus()
+    focus(wheel)
+    screen.pad.move("down")
+    assert screen.slider.hasFocus() and screen.slider.value() == 50
+    focus(wheel)
+    for _ in range(len(WHEEL_ENTRIES) + 3):
+        screen.pad.move("right")
+    assert wheel.hasFocus() and wheel.letter() == WHEEL_ERASE
+    screen.pad.activate()
+    assert screen.typed == ["B", WHEEL_ERASE]
+
+def test_recorded_pad_drives_focus(screen, wait_until):
+    # The recording goes through a pipe standing in for /dev/input/eventN: down, stick right, hat left, A
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    screen.pad.attach(GamepadDevice("event-test", read_fd, ranges={}, parent=screen.pad))
+    focus(screen.edit)
+    os.write(write_fd, recorded_stream("gamepad_evtest.txt"))
+    try:
+        assert wait_until(lambda: screen.typed)
+    finally:
+        os.close(write_fd)
+        screen.pad.stop()
+    assert screen.wheel.hasFocus()
+    assert screen.typed == ["A"]
+    assert screen.edit.text() == "ab" and screen.slider.value() == 50
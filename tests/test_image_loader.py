@@ -0,0 +1,146 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PySide6.QtGui import QColor, QImage
+import image_loader
+from image_loader import ImageLoader
+
+def png(color, size=16):
+    image = QImage(size, size, QImage.Format_ARGB32)
+    image.fill(color)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+def load(loader, sources, wait_until, size=16):
+    delivered = []
+    loader.request(sources, size, delivered.append)
+    key = (tuple([sources] if isinstance(sources, str) else sources), size, size)
+    assert wait_until(lambda: key not in loader.pending)
+    return delivered[0] if delivered else None
+
+class ArtHandler(BaseHTTPRequestHandler):
+    # Serves server.files {path: (body, etag)} and answers If-None-Match with 304
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        entry = self.server.files.get(self.path)
+        if entry is None:
+            self.send_error(404)
+            return
+        body, etag = entry
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def art_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ArtHandler)
+    server.files = {"/cover.png": (png(Qt.blue), '"v1"')}
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def make_loader(qapp, tmp_path):
+    loaders = []
+
+    def make(**kwargs):
+        loaders.append(ImageLoader(cache_dir=str(tmp_path / "cache"), **kwargs))
+        return loaders[-1]
+
+    yield make
+    for loader in loaders:
+        loader.stop()
+
+def test_missing_art_is_not_reread_on_every_paint(make_loader, tmp_path, wait_until, monkeypatch):
+    loader = make_loader()
+    fetched = []
+    fetch = loader._fetch
+    monkeypatch.setattr(loader, "_fetch", lambda source: fetched.append(source) or fetch(source))
+    sources = [str(tmp_path / "missing.jpg"), str(tmp_path / "missing.png")]
+    assert load(loader, sources, wait_until) is None
+    for _ in range(5):
+        assert loader.request(sources, 16).toImage().pixelColor(0, 0).alpha() == 0
+    assert not loader.pending
+    assert fetched == sources
+    # clear() runs when a launcher takes over; art installed meanwhile is picked up afterwards
+    (tmp_path / "missing.png").write_bytes(png(Qt.red))
+    loader.clear()
+    assert load(loader, sources, wait_until) is not None
+
+def test_second_session_is_served_from_disk(make_loader, art_server, wait_until):
+    url = art_server.url + "/cover.png"
+    assert load(make_loader(), url, wait_until).toImage().pixelColor(0, 0) == QColor(Qt.blue)
+    assert load(make_loader(), url, wait_until).toImage().pixelColor(0, 0) == QColor(Qt.blue)
+    assert art_server.requests == [("/cover.png", None)]
+
+def test_old_copy_is_revalidated_with_etag(make_loader, art_server, wait_until, monkeypatch):
+    url = art_server.url + "/cover.png"
+    load(make_loader(), url, wait_until)
+    ref, _ = make_loader().disk.lookup(url)
+    monkeypatch.setattr(image_loader, "REVALIDATE_AFTER", 0)
+    assert load(make_loader(), url, wait_until) is not None
+    assert art_server.requests == [("/cover.png", None), ("/cover.png", '"v1"')]
+    refreshed, _ = make_loader().disk.lookup(url)
+    assert refreshed["fetched"] > ref["fetched"] and refreshed["sha256"] == ref["sha256"]
+
+def test_corrupt_blob_is_rejected_and_fetched_again(make_loader, art_server, wait_until):
+    url = art_server.url + "/cover.png"
+    loader = make_loader()
+    load(loader, url, wait_until)
+    ref, _ = loader.disk.lookup(url)
+    with open(os.path.join(loader.disk.blobs, ref["sha256"]), "r+b") as f:
+        f.seek(40)
+        f.write(b"\0\0\0\0")
+    assert loader.disk.lookup(url) == (None, None)
+    assert load(make_loader(), url, wait_until).toImage().pixelColor(0, 0) == QColor(Qt.blue)
+    assert len(art_server.requests) == 2
+    assert make_loader().disk.lookup(url)[1] == art_server.files["/cover.png"][0]
+
+def test_stale_copy_is_served_offline(make_loader, art_server, wait_until, monkeypatch):
+    url = art_server.url + "/cover.png"
+    load(make_loader(), url, wait_until)
+    art_server.shutdown()
+    art_server.server_close()
+    monkeypatch.setattr(image_loader, "REVALIDATE_AFTER", 0)
+    assert load(make_loader(), url, wait_until).toImage().pixelColor(0, 0) == QColor(Qt.blue)
+
+def test_local_paths_and_file_urls_load(make_loader, tmp_path, wait_until):
+    path = tmp_path / "icon.png"
+    path.write_bytes(png(Qt.green, size=64))
+    loader = make_loader()
+    pixmap = load(loader, ["/nonexistent/icon.png", str(path)], wait_until)
+    assert (pixmap.width(), pixmap.height()) == (16, 16)
+    assert load(loader, "file://" + str(path), wait_until, size=32).width() == 32
+    assert not os.path.exists(loader.disk.root)  # local art never goes through the disk cache
+
+def test_memory_limit_evicts_least_recently_used(make_loader, tmp_path, wait_until):
+    paths = []
+    for name, color in (("a", Qt.red), ("b", Qt.green), ("c", Qt.blue)):
+        paths.append(str(tmp_path / f"{name}.png"))
+        (tmp_path / f"{name}.png").write_bytes(png(color))
+    loader = make_loader(memory_limit=2 * 16 * 16 * 4)
+    first, _, third = [(path,) for path in paths]
+    load(loader, paths[0], wait_until)
+    load(loader, paths[1], wait_until)
+    loader.request(paths[0], 16)  # a hit makes "a" the most recently used
+    load(loader, paths[2], wait_until)
+    assert [key[0] for key in loader.pixmaps] == [first, third]
+    assert loader.memory_used == 2 * 16 * 16 * 4
@@ -0,0 +1,12 @@
+from launcher_prewarm import LauncherPrewarm
+
+def test_only_the_first_launch_after_a_prewarm_counts_as_prewarmed(qapp, tmp_path):
+    prewarm = LauncherPrewarm(catalog=None, stats_path=str(tmp_path / "stats.json"), enabled=False)
+    prewarm._handle_finished({"launchers": ["steam"]})
+    prewarm.record_first_window("steam", 900)
+    prewarm.record_first_window("steam", 1500)
+    entry = prewarm.stats.data["steam"]
+    assert (entry["prewarmed_ms"], entry["cold_ms"]) == ([900], [1500])
+    prewarm._handle_finished({"launchers": ["steam"]})
+    prewarm.record_first_window("steam", 1000)
+    assert entry["prewarmed_ms"] == [900, 1000]
@@ -0,0 +1,65 @@
+import os
+from network_model import WifiListModel, WifiNetwork, split_terse, parse_wifi_list, diff_networks
+
+# Recorded from `nmcli --terse --fields IN-USE,BSSID,SSID,SIGNAL,SECURITY,CHAN device wifi list`
+RECORDED = os.path.join(os.path.dirname(__file__), "data", "nmcli_wifi_list.txt")
+
+def recorded():
+    with open(RECORDED, encoding="utf8") as f:
+        return f.read()
+
+def test_split_terse_unescapes_colons_and_backslashes():
+    assert split_terse(r"*:F4\:92\:BF\:12\:34\:56:Dom_5G:87:WPA2:36") == [
+        "*", "F4:92:BF:12:34:56", "Dom_5G", "87", "WPA2", "36"]
+    assert split_terse(r" :00\:11:Kawiarnia\: Free:54::11") == [" ", "00:11", "Kawiarnia: Free", "54", "", "11"]
+    assert split_terse(r"a\\b:c") == ["a\\b", "c"]
+
+def test_parse_wifi_list_from_recorded_output():
+    networks = parse_wifi_list(recorded())
+    assert list(networks) == ["F4:92:BF:12:34:56", "F4:92:BF:12:34:57", "00:11:22:33:44:55", "12:34:56:78:9A:BC"]
+    home = networks["F4:92:BF:12:34:56"]
+    assert home == WifiNetwork("F4:92:BF:12:34:56", "Dom_5G", 87, "WPA2", 36, True)
+    assert home.secured
+    cafe = networks["00:11:22:33:44:55"]
+    assert cafe.ssid == "Kawiarnia: Free" and not cafe.secured and not cafe.in_use
+    assert networks["12:34:56:78:9A:BC"].ssid == "back\\slash"
+
+def test_parse_skips_hidden_and_malformed_rows():
+    networks = parse_wifi_list(recorded())
+    assert "AA:BB:CC:DD:EE:FF" not in networks  # hidden SSID
+    assert "12:34:56:78:9A:BD" not in networks  # non-numeric signal
+    assert parse_wifi_list("garbage\n\n") == {}
+
+def test_diff_networks():
+    old = parse_wifi_list(recorded())
+    new = dict(old)
+    del new["F4:92:BF:12:34:57"]
+    new["00:11:22:33:44:55"] = WifiNetwork("00:11:22:33:44:55", "Kawiarnia: Free", 20, "", 11, False)
+    new["99:99:99:99:99:99"] = WifiNetwork("99:99:99:99:99:99", "Nowa", 60, "WPA2", 1, False)
+    assert diff_networks(old, new) == (["99:99:99:99:99:99"], ["F4:92:BF:12:34:57"], ["00:11:22:33:44:55"])
+    assert diff_networks(old, old) == ([], [], [])
+
+def test_model_applies_only_the_difference(qapp):
+    model = WifiListModel()
+    assert model.apply(parse_wifi_list(recorded()))
+    assert model.rowCount() == 4
+    assert not model.apply(parse_wifi_list(recorded()))
+    removed = []
+    model.rowsRemoved.connect(lambda parent, first, last: removed.append(first))
+    networks = parse_wifi_list(recorded())
+    del networks["F4:92:BF:12:34:57"]
+    assert model.apply(networks)
+    assert removed == [1] and model.rowCount() == 3
+
+def test_password_never_reaches_argv(qapp):
+    from config_pages import NetworkConfig
+    page = NetworkConfig()
+    calls = []
+    page.terminal.run_command = lambda program, args=None, stdin=None: calls.append((program, args, stdin))
+    page.wifi_model.apply(parse_wifi_list(recorded()))
+    page.password_edit.setText("tajne haslo")
+    page.connect_wifi(page.wifi_model.index(0))
+    program, args, stdin = calls[0]
+    assert "tajne haslo" not in " ".join(args)
+    assert args[:1] == ["--ask"] and stdin == "tajne haslo\n"
+    assert page.password_edit.text() == ""
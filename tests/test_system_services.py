@@ -0,0 +1,112 @@
+import os
+import sys
+import shutil
+import subprocess
+import pytest
+from PySide6.QtDBus import QDBusConnection
+from system_services import PowerBackend, TimeBackend
+
+MOCK = os.path.join(os.path.dirname(__file__), "mock_system_bus.py")
+
+pytestmark = pytest.mark.skipif(shutil.which("dbus-daemon") is None, reason="needs dbus-daemon")
+
+@pytest.fixture
+def private_bus(qapp, tmp_path):
+    # A throwaway bus daemon; the session config lets any local client own names on it
+    daemon = subprocess.Popen(["dbus-daemon", "--session", "--nofork", "--print-address=1",
+                               f"--address=unix:path={tmp_path / 'bus'}"], stdout=subprocess.PIPE, text=True)
+    address = daemon.stdout.readline().strip()
+    connection = QDBusConnection.connectToBus(address, f"test-{os.getpid()}-{id(tmp_path)}")
+    assert connection.isConnected()
+    yield address, connection
+    QDBusConnection.disconnectFromBus(connection.name())
+    daemon.terminate()
+    daemon.wait()
+
+@pytest.fixture
+def mock_services(private_bus, tmp_path):
+    address, connection = private_bus
+    log = tmp_path / "calls"
+    children = []
+
+    def start(block_inhibited=""):
+        env = dict(os.environ, DBUS_SYSTEM_BUS_ADDRESS=address)
+        child = subprocess.Popen([sys.executable, MOCK, str(log), block_inhibited], env=env,
+                                 stdout=subprocess.PIPE, text=True)
+        children.append(child)
+        assert child.stdout.readline().strip() == "ready"
+        return connection, log
+
+    yield start
+    for child in children:
+        child.terminate()
+        child.wait()
+
+def collect(backend):
+    events = []
+    backend.succeeded.connect(lambda action: events.append(("ok", action)))
+    backend.failed.connect(lambda action, message: events.append(("failed", action, message)))
+    return events
+
+def test_power_off_goes_through_logind(mock_services, wait_until):
+    bus, log = mock_services()
+    power = PowerBackend(bus=bus)
+    events = collect(power)
+    power.power_off()
+    assert wait_until(lambda: events)
+    assert events == [("ok", "poweroff")]
+    assert log.read_text().split("\n")[0] == "PowerOff True"
+
+def test_block_inhibitor_refuses_before_calling(mock_services, wait_until):
+    bus, log = mock_services("shutdown:sleep")
+    power = PowerBackend(bus=bus)
+    events = collect(power)
+    power.reboot()
+    power.suspend()
+    assert wait_until(lambda: len(events) == 2)
+    assert [event[:2] for event in events] == [("failed", "reboot"), ("failed", "suspend")]
+    assert "shutdown:sleep" in events[0][2]
+    assert log.read_text() == ""
+
+def test_timezone_change_and_real_refusal(mock_services, wait_until, stub_bin, tmp_path):
+    fallback_log = tmp_path / "timedatectl"
+    stub_bin("timedatectl", f"#!/bin/sh\necho \"$@\" >> {fallback_log}\n")
+    bus, log = mock_services()
+    timedate = TimeBackend(bus=bus)
+    events, changed, current = collect(timedate), [], []
+    timedate.timezone_changed.connect(changed.append)
+    timedate.set_timezone("Asia/Tokyo")
+    timedate.set_timezone("Bogus")
+    assert wait_until(lambda: len(events) == 2)
+    assert ("ok", "timezone") in events
+    failure = next(event for event in events if event[0] == "failed")
+    assert "Invalid or not installed time zone 'Bogus'" in failure[2]
+    assert changed == ["Asia/Tokyo"]
+    timedate.current_timezone(current.append)
+    assert wait_until(lambda: current)
+    assert current == ["Asia/Tokyo"]
+    # A refusal from the service is final; the CLI must not be tried behind its back
+    assert not fallback_log.exists()
+
+def test_unreachable_bus_falls_back_to_the_cli(qapp, wait_until, stub_bin, tmp_path):
+    fallback_log = tmp_path / "timedatectl"
+    stub_bin("timedatectl", f"#!/bin/sh\necho \"$@\" >> {fallback_log}\n")
+    dead = QDBusConnection.connectToBus(f"unix:path={tmp_path / 'missing'}", "test-dead-bus")
+    assert not dead.isConnected()
+    timedate = TimeBackend(bus=dead)
+    events, changed = collect(timedate), []
+    timedate.timezone_changed.connect(changed.append)
+    timedate.set_timezone("Asia/Tokyo")
+    assert wait_until(lambda: events)
+    assert events == [("ok", "timezone")] and changed == ["Asia/Tokyo"]
+    assert fallback_log.read_text().strip() == "set-timezone Asia/Tokyo"
+    QDBusConnection.disconnectFromBus("test-dead-bus")
+
+def test_missing_service_falls_back_and_reports_cli_errors(private_bus, wait_until, stub_bin):
+    stub_bin("timedatectl", "#!/bin/sh\necho 'Failed to set time zone:' >&2\necho 'Access denied' >&2\nexit 1\n")
+    address, bus = private_bus
+    timedate = TimeBackend(bus=bus)  # nothing owns org.freedesktop.timedate1 on this bus
+    events = collect(timedate)
+    timedate.set_timezone("Asia/Tokyo")
+    assert wait_until(lambda: events)
+    assert events == [("failed", "timezone", "Access denied")]
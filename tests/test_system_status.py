@@ -0,0 +1,110 @@
+import os
+import time
+import errno
+import pytest
+import system_status
+from system_status import (StatusProbe, StatusSampler, ACTIVE_INTERVAL_S, IDLE_INTERVAL_S, HIDDEN_INTERVAL_S,
+                           IDLE_AFTER_S)
+
+NET_DEV = """Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo: {lo} 10 0 0 0 0 0 0 {lo} 10 0 0 0 0 0 0
+docker0: {lo} 10 0 0 0 0 0 0 {lo} 10 0 0 0 0 0 0
+  eth0: {rx} 10 0 0 0 0 0 0 {tx} 10 0 0 0 0 0 0
+"""
+
+def write(root, path, text):
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(text)  # same inode, like a kernel file; the probe keeps it open
+
+@pytest.fixture
+def fake_root(tmp_path):
+    write(tmp_path, "proc/stat", "cpu  100 0 100 700 100 0 0 0 0 0\ncpu0 100 0 100 700 100 0 0 0 0 0\n")
+    write(tmp_path, "proc/meminfo", "MemTotal:       8000000 kB\nMemFree:         500000 kB\n"
+                                    "MemAvailable:   6000000 kB\n")
+    write(tmp_path, "proc/net/dev", NET_DEV.format(lo=1000, rx=5000, tx=3000))
+    write(tmp_path, "sys/class/power_supply/AC/type", "Mains\n")
+    write(tmp_path, "sys/class/power_supply/BAT0/type", "Battery\n")
+    write(tmp_path, "sys/class/power_supply/BAT0/capacity", "87\n")
+    write(tmp_path, "sys/class/power_supply/BAT0/status", "Discharging\n")
+    write(tmp_path, "sys/class/thermal/thermal_zone0/temp", "41000\n")
+    write(tmp_path, "sys/class/thermal/thermal_zone1/temp", "63500\n")
+    write(tmp_path, "sys/class/thermal/cooling_device0/cur_state", "3\n")
+    return tmp_path
+
+def test_cpu_is_the_busy_share_between_two_reads(fake_root):
+    probe = StatusProbe(str(fake_root), str(fake_root))
+    assert probe.sample().cpu_percent is None
+    write(fake_root, "proc/stat", "cpu  200 0 200 1000 100 0 0 0 0 0\n")
+    assert probe.sample().cpu_percent == 40.0
+    probe.close()
+
+def test_memory_uses_mem_available(fake_root):
+    probe = StatusProbe(str(fake_root), str(fake_root))
+    assert probe.sample().memory_percent == 25.0
+    probe.close()
+
+def test_network_ignores_loopback_and_bridges(fake_root):
+    probe = StatusProbe(str(fake_root), str(fake_root))
+    assert probe.sample().rx_rate is None
+    write(fake_root, "proc/net/dev", NET_DEV.format(lo=900000, rx=5000, tx=3000))
+    time.sleep(0.01)
+    snapshot = probe.sample()
+    assert snapshot.rx_rate == 0 and snapshot.tx_rate == 0
+    write(fake_root, "proc/net/dev", NET_DEV.format(lo=900000, rx=15000, tx=3000))
+    time.sleep(0.01)
+    snapshot = probe.sample()
+    assert snapshot.rx_rate > 0 and snapshot.tx_rate == 0
+    probe.close()
+
+def test_battery_is_found_again_after_it_goes_away(fake_root, monkeypatch):
+    probe = StatusProbe(str(fake_root), str(fake_root))
+    # sysfs answers ENODEV on open attributes of a removed device; a regular file would keep reading
+    pread = os.pread
+
+    def sysfs_pread(fd, size, offset):
+        paths = [path for path, open_fd in probe.fds.items() if open_fd == fd]
+        if paths and not os.path.exists(paths[0]):
+            raise OSError(errno.ENODEV, "No such device")
+        return pread(fd, size, offset)
+
+    monkeypatch.setattr(system_status.os, "pread", sysfs_pread)
+    snapshot = probe.sample()
+    assert (snapshot.battery_percent, snapshot.charging) == (87, False)
+    supplies = fake_root / "sys/class/power_supply"
+    (supplies / "BAT0/capacity").unlink()
+    (supplies / "BAT0/type").unlink()
+    write(fake_root, "sys/class/power_supply/BAT1/type", "Battery\n")
+    write(fake_root, "sys/class/power_supply/BAT1/capacity", "55\n")
+    write(fake_root, "sys/class/power_supply/BAT1/status", "Charging\n")
+    assert probe.sample().battery_percent is None
+    snapshot = probe.sample()
+    assert (snapshot.battery_percent, snapshot.charging) == (55, True)
+    probe.close()
+
+def test_temperature_is_the_hottest_zone(fake_root):
+    probe = StatusProbe(str(fake_root), str(fake_root))
+    assert probe.sample().temperature_c == 63.5
+    write(fake_root, "sys/class/thermal/thermal_zone0/temp", "70250\n")
+    assert probe.sample().temperature_c == 70.25
+    probe.close()
+
+def test_empty_root_reports_nothing(tmp_path):
+    snapshot = StatusProbe(str(tmp_path), str(tmp_path)).sample()
+    assert (snapshot.cpu_percent, snapshot.memory_percent, snapshot.battery_percent, snapshot.temperature_c,
+            snapshot.rx_rate) == (None, None, None, None, None)
+    assert snapshot.storage_percent is not None
+
+def test_interval_follows_activity_and_visibility(qapp, fake_root):
+    sampler = StatusSampler(str(fake_root), str(fake_root))
+    assert sampler.interval() == ACTIVE_INTERVAL_S
+    sampler.last_activity -= IDLE_AFTER_S
+    assert sampler.interval() == IDLE_INTERVAL_S
+    sampler.touch()
+    assert sampler.interval() == ACTIVE_INTERVAL_S
+    sampler.set_visible(False)
+    assert sampler.interval() == HIDDEN_INTERVAL_S
+    sampler.set_visible(True)
+    assert sampler.interval() == ACTIVE_INTERVAL_S
+    sampler.probe.close()
@@ -0,0 +1,46 @@
+import time
+from terminal_widget import LineBuffer, TerminalWidget
+
+def test_crlf_split_across_reads_keeps_the_whole_line():
+    buffer = LineBuffer()
+    buffer.feed("hello wor")
+    buffer.feed("ld\r\nnext")
+    assert list(buffer.lines) == ["hello world"]
+    assert buffer[1] == "next"
+
+def test_carriage_return_redraws_the_line():
+    buffer = LineBuffer()
+    buffer.feed("10%\r")
+    assert buffer[0] == "10%"
+    buffer.feed("20%\r")
+    assert buffer[0] == "20%"
+    buffer.feed("30%\nb\rc\n")
+    assert list(buffer.lines) == ["30%", "c"]
+
+def test_capacity_evicts_oldest_lines():
+    buffer = LineBuffer(capacity=3)
+    buffer.feed("".join(f"{index}\n" for index in range(10)))
+    assert list(buffer.lines) == ["7", "8", "9"]
+    assert buffer.total == 10
+
+def test_long_lines_scroll_horizontally(qapp):
+    terminal = TerminalWidget()
+    terminal.resize(400, 300)
+    terminal.show()
+    terminal.append_text("x" * 500 + "\n")
+    terminal.output.refresh()
+    assert terminal.output.horizontalScrollBar().maximum() > 0
+    terminal.clear()
+    assert terminal.output.horizontalScrollBar().maximum() == 0
+
+def test_new_command_replaces_a_running_one_without_waiting(qapp, wait_until, stub_bin):
+    stub_bin("slow-scan", "#!/bin/sh\necho old\nexec sleep 30\n")
+    terminal = TerminalWidget()
+    terminal.run_command("slow-scan")
+    assert wait_until(lambda: terminal.buffer.total or terminal.buffer.partial)
+    old = terminal.process
+    start = time.monotonic()
+    terminal.run_command("sh", ["-c", "echo new"])
+    assert time.monotonic() - start < 0.5
+    assert terminal.process is not old
+    assert wait_until(lambda: list(terminal.buffer.lines) == ["new"])
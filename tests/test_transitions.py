@@ -0,0 +1,32 @@
+from PySide6.QtWidgets import QProgressBar, QStackedWidget
+from transitions import TransitionController
+
+def controller(threshold_ms=0):
+    bar = QProgressBar()
+    return TransitionController(QStackedWidget(), pages=None, progress_bar=bar, threshold_ms=threshold_ms), bar
+
+def test_counted_operation_fills_the_bar(qapp):
+    transitions, bar = controller()
+    operation = transitions.begin("update")
+    operation.progress(250, 1000)
+    assert not bar.isHidden()
+    assert (bar.minimum(), bar.maximum(), bar.value()) == (0, 1000, 250)
+    operation.progress(800, 1000)
+    assert bar.value() == 800
+    operation.finish()
+    assert bar.isHidden()
+
+def test_uncounted_operation_makes_the_bar_busy(qapp):
+    transitions, bar = controller()
+    transitions.begin("update").progress(500, 1000)
+    transitions.begin("page.settings")
+    transitions.update()
+    assert (bar.minimum(), bar.maximum()) == (0, 0)
+
+def test_short_operation_never_shows_the_bar(qapp):
+    transitions, bar = controller(threshold_ms=10000)
+    operation = transitions.begin("update")
+    operation.progress(500, 1000)
+    assert bar.isHidden()
+    operation.finish()
+    assert bar.isHidden()
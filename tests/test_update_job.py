@@ -0,0 +1,91 @@
+import sys
+import pytest
+from PySide6.QtCore import QEvent
+from update_job import UpdateJob, BACKLOG_LINES, LOG_MAX_BYTES, PHASES
+
+PACKAGES = 15000
+# Same shape as update-system's pacman output; the package lines alone are over 1 MiB so update.log must rotate
+UPDATE_STUB = f"""#!{sys.executable}
+import sys, time
+def emit(text):
+    sys.stdout.write(text)
+    sys.stdout.flush()
+emit(":: Synchronizing package databases...\\n")
+emit(":: Retrieving packages...\\n")
+for percent in (10, 40, 70, 100):
+    emit(f" linux-6.9 downloading {{percent}}%\\r")
+    time.sleep(0.05)
+emit("\\n:: Starting full system upgrade...\\n")
+for index in range(1, {PACKAGES} + 1):
+    sys.stdout.write(f"({{index}}/{PACKAGES}) upgrading pkg-{{index}} " + "." * 40 + "\\n")
+emit(":: Running post-transaction hooks...\\n")
+"""
+
+HANGING_STUB = f"""#!{sys.executable}
+import sys, time
+sys.stdout.write(":: Synchronizing package databases...\\n")
+sys.stdout.flush()
+time.sleep(60)
+"""
+
+@pytest.fixture
+def make_job(qapp, tmp_path):
+    jobs = []
+
+    def make():
+        jobs.append(UpdateJob(log_dir=str(tmp_path / "logs")))
+        return jobs[-1]
+
+    yield make
+    for job in jobs:
+        job.process.kill()
+        job.process.waitForFinished()
+        job.deleteLater()
+    qapp.sendPostedEvents(None, QEvent.DeferredDelete)
+
+def run(job, program, wait_until):
+    done = []
+    job.finished.connect(lambda exit_code, status: done.append((exit_code, status)))
+    assert job.start(program=str(program))
+    assert wait_until(lambda: done, timeout_ms=30000)
+    return done[0]
+
+def test_update_progress_backlog_and_log(make_job, tmp_path, stub_bin, wait_until):
+    job = make_job()
+    reports = []
+    job.progress.connect(lambda phase, value, maximum: reports.append((phase, value, maximum)))
+    assert run(job, stub_bin("update-system", UPDATE_STUB), wait_until) == (0, "Zakończono")
+    names = [name for name, _ in PHASES]
+    phases = [names.index(phase) for phase, _, _ in reports if phase]
+    values = [value for _, value, _ in reports]
+    assert phases == sorted(phases) and values == sorted(values)
+    assert reports[-1] == (names[-1], 1000, 1000)
+    # The download line only ever ends in \r; its percentages still move the bar before the line completes
+    downloading = [value for phase, value, _ in reports if phase == "Pobieranie"]
+    assert len(downloading) > 1 and downloading[-1] > downloading[0]
+    assert len(job.lines) == BACKLOG_LINES
+    assert job.lines[-1] == ":: Running post-transaction hooks..."
+    assert job.lines[-2].startswith(f"({PACKAGES}/{PACKAGES})")
+    logs = tmp_path / "logs"
+    current, rotated = logs / "update.log", logs / "update.log.1"
+    assert rotated.exists()
+    assert current.stat().st_size <= LOG_MAX_BYTES and rotated.stat().st_size <= LOG_MAX_BYTES
+    assert "=== Zakończono po" in current.read_text().splitlines()[-1]
+    # The start of the run has left the backlog but not the rotated log; \r redraws kept only the last frame
+    start = [line.split(" ", 2)[2] for line in rotated.read_text().splitlines()[:4]]
+    assert start[1:] == [":: Synchronizing package databases...", ":: Retrieving packages...",
+                         " linux-6.9 downloading 100%"]
+    assert "downloading 10%" not in rotated.read_text()
+
+def test_cancel_reports_cancelled(make_job, tmp_path, stub_bin, wait_until):
+    logs = tmp_path / "logs"
+    job = make_job()
+    done = []
+    job.finished.connect(lambda exit_code, status: done.append(status))
+    assert job.start(program=str(stub_bin("update-system", HANGING_STUB)))
+    assert wait_until(lambda: job.lines or job.partial)
+    job.cancel()
+    assert wait_until(lambda: done)
+    assert done == ["Anulowano"] and job.status == "Anulowano"
+    assert not job.is_running()
+    assert "=== Anulowano po" in (logs / "update.log").read_text()
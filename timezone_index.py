@@ -0,0 +1,195 @@
+import os
+import bisect
+import threading
+import zoneinfo
+from PySide6.QtCore import QObject, Qt, Signal, QAbstractListModel, QModelIndex
+from PySide6.QtWidgets import QLabel
+
+ZONEINFO_ROOT = "/usr/share/zoneinfo"
+SKIPPED_PREFIXES = ("posix/", "right/")
+FETCH_BATCH = 64
+WHEEL_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ_/"
+WHEEL_ERASE = "⌫"
+WHEEL_ENTRIES = WHEEL_LETTERS + WHEEL_ERASE
+
+def load_timezones(root=ZONEINFO_ROOT):
+    # available_timezones() walks TZPATH and opens every file, which is why this runs off the GUI thread
+    if root == ZONEINFO_ROOT:
+        names = zoneinfo.available_timezones()
+    else:
+        names = set()
+        for directory, _, files in os.walk(root):
+            for name in files:
+                path = os.path.join(directory, name)
+                try:
+                    with open(path, "rb") as f:
+                        if f.read(4) == b"TZif":
+                            names.add(os.path.relpath(path, root))
+                except OSError:
+                    continue
+    return sorted(name for name in names if not name.startswith(SKIPPED_PREFIXES))
+
+def system_timezone(localtime="/etc/localtime"):
+    try:
+        target = os.path.realpath(localtime)
+    except OSError:
+        return None
+    marker = "/zoneinfo/"
+    return target.split(marker, 1)[1] if marker in target else None
+
+def normalize(text):
+    return text.lower().replace(" ", "_")
+
+def is_subsequence(query, text):
+    position = 0
+    for char in query:
+        position = text.find(char, position) + 1
+        if not position:
+            return False
+    return True
+
+class TimezoneIndex:
+    # Sorted keys for every name and every component of it, so "war" finds Europe/Warsaw by bisection
+    def __init__(self, names):
+        self.names = list(names)
+        keys = set()
+        for position, name in enumerate(self.names):
+            lowered = normalize(name)
+            keys.add((lowered, position))
+            for part in lowered.replace("/", " ").replace("_", " ").split()[1:]:
+                keys.add((part, position))
+        self.keys = sorted(keys)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query, limit=None):
+        query = normalize(query.strip())
+        if not query:
+            return self.names[:limit] if limit else list(self.names)
+        matches = []
+        seen = set()
+        start = bisect.bisect_left(self.keys, (query, -1))
+        for key, position in self.keys[start:]:
+            if not key.startswith(query):
+                break
+            if position not in seen:
+                seen.add(position)
+                matches.append(position)
+        matches.sort()
+        if len(matches) < (limit or len(self.names)):
+            # Fuzzy tail: the letters appear in order, e.g. "nyk" -> America/New_York
+            compact = query.replace("/", "").replace("_", "")
+            for position, name in enumerate(self.names):
+                if position not in seen and is_subsequence(compact, normalize(name)):
+                    matches.append(position)
+        names = [self.names[position] for position in matches]
+        return names[:limit] if limit else names
+
+class TimezoneLoader(QObject):
+    loaded = Signal(object)
+
+    def __init__(self, root=ZONEINFO_ROOT, parent=None):
+        super().__init__(parent)
+        self.root = root
+
+    def start(self):
+        threading.Thread(target=self._run, name="timezone-loader", daemon=True).start()
+
+    def _run(self):
+        index = TimezoneIndex(load_timezones(self.root))
+        try:
+            self.loaded.emit(index)
+        except RuntimeError:
+            pass  # the page was released before the scan finished
+
+class TimezoneModel(QAbstractListModel):
+    # Rows are handed to the view in batches, so filtering to hundreds of zones stays cheap
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = []
+        self.fetched = 0
+
+    def set_results(self, results):
+        self.beginResetModel()
+        self.results = results
+        self.fetched = min(FETCH_BATCH, len(results))
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.fetched
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.fetched < len(self.results)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(FETCH_BATCH, len(self.results) - self.fetched)
+        self.beginInsertRows(QModelIndex(), self.fetched, self.fetched + count - 1)
+        self.fetched += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole:
+            return self.results[index.row()].replace("_", " ")
+        return None
+
+    def timezone(self, row):
+        return self.results[row]
+
+    def row_of(self, timezone):
+        # Makes sure the row exists in the view before it is selected
+        try:
+            row = self.results.index(timezone)
+        except ValueError:
+            return None
+        while self.fetched <= row:
+            self.fetchMore()
+        return row
+
+class LetterWheel(QLabel):
+    # Typing without a keyboard: left/right turn the wheel, enter takes the letter (or erases on ⌫).
+    # The wheel stops at its ends and leaves those presses, like up/down, to focus navigation
+    letter_chosen = Signal(str)
+    erase = Signal()
+    gamepad_axis = "horizontal"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.position = 0
+        self.setObjectName("letterWheel")
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setAlignment(Qt.AlignCenter)
+        self._update()
+
+    def letter(self):
+        return WHEEL_ENTRIES[self.position]
+
+    def spin(self, step):
+        position = self.position + step
+        if not 0 <= position < len(WHEEL_ENTRIES):
+            return False
+        self.position = position
+        self._update()
+        return True
+
+    def choose(self):
+        if self.letter() == WHEEL_ERASE:
+            self.erase.emit()
+        else:
+            self.letter_chosen.emit(self.letter())
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key in (Qt.Key_Left, Qt.Key_Right) and self.spin(-1 if key == Qt.Key_Left else 1):
+            return
+        if key in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Space):
+            self.choose()
+        elif key == Qt.Key_Backspace:
+            self.erase.emit()
+        else:
+            super().keyPressEvent(event)
+
+    def _update(self):
+        before = WHEEL_ENTRIES[self.position - 1] if self.position > 0 else " "
+        after = WHEEL_ENTRIES[self.position + 1] if self.position + 1 < len(WHEEL_ENTRIES) else " "
+        self.setText(f"{before}  [ {self.letter()} ]  {after}")
@@ -0,0 +1,135 @@
+import time
+from PySide6.QtCore import QObject, QTimer, QEvent, Signal
+from instrumentation import tracer
+
+PROGRESS_THRESHOLD_MS = 150  # anything faster than this should feel instant, so no bar at all
+HISTORY_LIMIT = 100
+
+class Operation:
+    # Handle for one piece of work the user is waiting on; report progress if it can be counted
+    def __init__(self, controller, name):
+        self.controller = controller
+        self.name = name
+        self.started = time.perf_counter()
+        self.value = None
+        self.maximum = None
+        self.done = False
+
+    def progress(self, value, maximum):
+        self.value, self.maximum = value, maximum
+        self.controller.update()
+
+    def finish(self):
+        if not self.done:
+            self.done = True
+            self.controller.finish(self)
+
+class PaintWatcher(QObject):
+    # Calls back on the next paint of the watched widget, then detaches itself
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.widget = widget
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def cancel(self):
+        try:
+            self.widget.removeEventFilter(self)
+            self.deleteLater()
+        except RuntimeError:
+            pass  # the page was released and took the watcher with it
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            self.deleteLater()
+            self.callback()
+        return False
+
+class TransitionController(QObject):
+    # Shows the status bar progress only while real work outlasts the threshold
+    switched = Signal(str, float)
+
+    def __init__(self, stack, pages, progress_bar, threshold_ms=PROGRESS_THRESHOLD_MS, parent=None):
+        super().__init__(parent)
+        self.stack = stack
+        self.pages = pages
+        self.progress_bar = progress_bar
+        self.threshold_ms = threshold_ms
+        self.operations = []
+        self.switch_stats = {}
+        self.history = []
+        self.watcher = None
+        self.threshold_timer = QTimer(self)
+        self.threshold_timer.setSingleShot(True)
+        self.threshold_timer.timeout.connect(self.update)
+
+    def begin(self, name):
+        operation = Operation(self, name)
+        self.operations.append(operation)
+        if not self.threshold_timer.isActive():
+            self.threshold_timer.start(self.threshold_ms)
+        return operation
+
+    def finish(self, operation):
+        if operation in self.operations:
+            self.operations.remove(operation)
+        self.update()
+
+    def update(self):
+        now = time.perf_counter()
+        overdue = [op for op in self.operations if (now - op.started) * 1000 >= self.threshold_ms]
+        if not overdue:
+            self.progress_bar.hide()
+            if self.operations:
+                # The oldest pending operation decides when the bar may appear
+                remaining = self.threshold_ms - (now - self.operations[0].started) * 1000
+                self.threshold_timer.start(max(0, int(remaining)))
+            return
+        counted = [op for op in overdue if op.maximum]
+        if counted and len(counted) == len(overdue):
+            self.progress_bar.setRange(0, 1000)
+            self.progress_bar.setValue(int(sum(op.value / op.maximum for op in counted) / len(counted) * 1000))
+        else:
+            self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+
+    def switch_to(self, name):
+        requested = time.perf_counter()
+        if self.pages.is_built(name):
+            self._show(name, self.pages.get(name), requested)
+            return
+        operation = self.begin(f"page.{name}")
+        if self.pages.estimate(name) * 1000 >= self.threshold_ms:
+            # The build runs on the GUI thread, so the bar has to be on screen before it starts
+            operation.started -= self.threshold_ms / 1000
+            self.update()
+            self.progress_bar.repaint()
+        page = self.pages.get(name)
+        operation.finish()
+        self._show(name, page, requested)
+
+    def _show(self, name, page, requested):
+        if self.watcher is not None:
+            if self.stack.currentWidget() is page:
+                return  # the first request for this page is still waiting for its frame
+            # Superseded before it was ever painted; that switch never reached the screen
+            self.watcher.cancel()
+            self.watcher = None
+        if self.stack.currentWidget() is page:
+            self._record(name, requested)
+            return
+        self.watcher = PaintWatcher(page, lambda: self._record(name, requested))
+        self.stack.setCurrentWidget(page)
+
+    def _record(self, name, requested):
+        # Perceived latency: from the request to the first frame of the new page
+        self.watcher = None
+        elapsed = (time.perf_counter() - requested) * 1000
+        entry = self.switch_stats.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] = round(entry["total_ms"] + elapsed, 3)
+        entry["max_ms"] = max(entry["max_ms"], round(elapsed, 3))
+        self.history = (self.history + [(name, round(elapsed, 3))])[-HISTORY_LIMIT:]
+        tracer.record("page_switch", self.switch_stats)
+        self.switched.emit(name, elapsed)
@@ -0,0 +1,225 @@
+import os
+import re
+import time
+import queue
+import codecs
+import shutil
+import logging
+import logging.handlers
+from collections import deque
+from PySide6.QtCore import QObject, QProcess, QTimer, QCoreApplication, Signal
+from command_runner import get_runner
+from instrumentation import tracer
+
+UPDATE_PROGRAM = "/usr/bin/update-system"
+LOG_DIR = os.path.join(os.path.expanduser("~"), ".local", "state", "legendaryos-session")
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+BACKLOG_LINES = 5000
+CANCEL_GRACE_MS = 5000
+# Phases in the order update-system runs them; a phase only ever advances
+PHASES = [
+    ("Synchronizacja", re.compile(r"Synchronizing package databases|Hit:|Get:\d|Refreshing|Fetching metadata", re.I)),
+    ("Pobieranie", re.compile(r"Retrieving packages|downloading|Downloading", re.I)),
+    ("Instalacja", re.compile(r"Starting full system upgrade|upgrading|installing|Unpacking|Setting up", re.I)),
+    ("Flatpak", re.compile(r"flatpak|Updating app|Updating runtime", re.I)),
+    ("Porządkowanie", re.compile(r"post-transaction hooks|cleanup|Cleaning up|Removing unused", re.I)),
+]
+COUNTER_RE = re.compile(r"[\(\[]\s*(\d+)\s*/\s*(\d+)\s*[\)\]]|\b(\d+)/(\d+)\b")
+PERCENT_RE = re.compile(r"(\d{1,3})(?:\.\d+)?\s?%")
+
+def update_program():
+    return shutil.which("update-system") or UPDATE_PROGRAM
+
+class UpdateProgressParser:
+    # Turns output lines into (phase index, fraction of that phase); knows nothing about Qt
+    def __init__(self, phases=PHASES):
+        self.phases = phases
+        self.phase = -1
+        self.fraction = 0.0
+
+    def feed_line(self, line):
+        changed = False
+        for index in range(max(self.phase, 0), len(self.phases)):
+            if index > self.phase and self.phases[index][1].search(line):
+                self.phase, self.fraction = index, 0.0
+                changed = True
+                break
+        if self.phase < 0:
+            return changed
+        match = COUNTER_RE.search(line)
+        fraction = None
+        if match:
+            done, total = [int(value) for value in match.groups() if value is not None]
+            if 0 < total and done <= total:
+                fraction = done / total
+        else:
+            match = PERCENT_RE.search(line)
+            if match and int(match.group(1)) <= 100:
+                fraction = int(match.group(1)) / 100
+        if fraction is not None and fraction > self.fraction:
+            self.fraction = fraction
+            changed = True
+        return changed
+
+    def overall(self):
+        if self.phase < 0:
+            return 0.0
+        return (self.phase + self.fraction) / len(self.phases)
+
+    def phase_name(self):
+        return self.phases[self.phase][0] if self.phase >= 0 else None
+
+class UpdateLog:
+    # A RotatingFileHandler behind a QueueListener: the GUI thread only enqueues, a thread does the writes
+    def __init__(self, directory=LOG_DIR, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+        self.path = os.path.join(directory, "update.log")
+        self.queue = queue.SimpleQueue()
+        self.logger = logging.getLogger(f"legendaryos.update.{id(self)}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(logging.handlers.QueueHandler(self.queue))
+        self.listener = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(self.path, maxBytes=max_bytes, backupCount=backups,
+                                                           encoding="utf8")
+        except OSError as e:
+            print(f"Error opening update log: {e}")
+            return
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self.listener = logging.handlers.QueueListener(self.queue, handler)
+        self.listener.start()
+
+    def write(self, line):
+        if self.listener:
+            self.logger.info(line)
+
+    def close(self):
+        if self.listener:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+
+class UpdateJob(QObject):
+    # Lives on the QApplication, not the window, so it survives page releases and soft restarts
+    output = Signal(str)
+    progress = Signal(str, int, int)
+    state_changed = Signal(bool)
+    finished = Signal(int, str)
+
+    def __init__(self, log_dir=LOG_DIR, parent=None):
+        super().__init__(parent)
+        self.log_dir = log_dir
+        self.log = None
+        self.parser = UpdateProgressParser()
+        self.lines = deque(maxlen=BACKLOG_LINES)
+        self.partial = ""
+        self.status = ""
+        self.started = None
+        self.cancelled = False
+        self.decoder = codecs.getincrementaldecoder("utf8")(errors="replace")
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        self.process.readyReadStandardOutput.connect(self._read)
+        self.process.finished.connect(self._finished)
+        self.process.errorOccurred.connect(self._error)
+        self.kill_timer = QTimer(self)
+        self.kill_timer.setSingleShot(True)
+        self.kill_timer.timeout.connect(self.process.kill)
+
+    def is_running(self):
+        return self.process.state() != QProcess.NotRunning
+
+    def start(self, program=None, args=None):
+        if self.is_running():
+            return False
+        self.parser = UpdateProgressParser()
+        self.lines.clear()
+        self.partial = ""
+        self.status = ""
+        self.cancelled = False
+        self.decoder = codecs.getincrementaldecoder("utf8")(errors="replace")
+        self.log = UpdateLog(self.log_dir)
+        self.started = time.perf_counter()
+        program = program or update_program()
+        self.log.write(f"=== {program} {' '.join(args or [])}")
+        get_runner().start_process(self.process, program, args)
+        self.state_changed.emit(True)
+        self.progress.emit("", 0, 1000)
+        return True
+
+    def cancel(self):
+        # SIGTERM first so package managers can release their locks; SIGKILL if they ignore it
+        if self.is_running():
+            self.cancelled = True
+            self.process.terminate()
+            self.kill_timer.start(CANCEL_GRACE_MS)
+
+    def backlog(self):
+        return "\n".join(self.lines) + ("\n" if self.lines else "") + self.partial
+
+    def current_progress(self):
+        return self.parser.phase_name() or "", int(self.parser.overall() * 1000), 1000
+
+    def _read(self):
+        text = self.decoder.decode(bytes(self.process.readAllStandardOutput()))
+        if not text:
+            return
+        parts = (self.partial + text).split("\n")
+        self.partial = parts.pop()
+        changed = False
+        for line in parts:
+            line = line.rstrip("\r").rsplit("\r", 1)[-1]
+            self.lines.append(line)
+            self.log.write(line)
+            changed = self.parser.feed_line(line) or changed
+        if self.partial and self.parser.feed_line(self.partial.rstrip("\r").rsplit("\r", 1)[-1]):
+            changed = True  # progress bars redraw one line with \r and never finish it
+        self.output.emit(text)
+        if changed:
+            self.progress.emit(*self.current_progress())
+
+    def _finished(self, exit_code, exit_status):
+        self.kill_timer.stop()
+        tail = self.decoder.decode(b"", final=True)
+        if tail:
+            self.partial += tail
+            self.output.emit(tail)
+        if self.partial:
+            self.lines.append(self.partial)
+            self.log.write(self.partial)
+            self.partial = ""
+        if self.cancelled:
+            self.status = "Anulowano"
+        elif exit_status == QProcess.NormalExit and exit_code == 0:
+            self.status = "Zakończono"
+            self.parser.phase, self.parser.fraction = len(self.parser.phases) - 1, 1.0
+        else:
+            self.status = f"Błąd (kod {exit_code})"
+        elapsed = round(time.perf_counter() - self.started, 3)
+        self.log.write(f"=== {self.status} po {elapsed} s")
+        self.log.close()
+        tracer.record("update", {"status": self.status, "exit_code": exit_code, "runtime_s": elapsed,
+                                 "lines": len(self.lines)})
+        self.progress.emit(*self.current_progress())
+        self.state_changed.emit(False)
+        self.finished.emit(exit_code, self.status)
+
+    def _error(self, error):
+        if error == QProcess.FailedToStart:
+            self.status = f"Nie można uruchomić: {self.process.errorString()}"
+            self.log.write(self.status)
+            self.log.close()
+            self.state_changed.emit(False)
+            self.finished.emit(-1, self.status)
+
+_job = None
+
+def get_update_job():
+    # main.py doesn't reload this module, so a running update keeps its process, backlog and log across restarts
+    global _job
+    if _job is None:
+        _job = UpdateJob(parent=QCoreApplication.instance())
+    return _job
@@ -0,0 +1,81 @@
+import re
+from PySide6.QtCore import QObject, QProcess, Signal
+from command_runner import get_runner
+
+VOLUME_RE = re.compile(r"(\d+)%")
+# Only the first query of a rebuilt page may be answered from cache; writes drop the entry
+VOLUME_CACHE_S = 2
+# "Event 'change' on sink #0" or "... on server"; sink-input events are per-stream and don't move the sink volume
+EVENT_RE = re.compile(r"on (?:sink|server)(?: #\d+)?$")
+
+def parse_volume(output):
+    match = VOLUME_RE.search(output)
+    return int(match.group(1)) if match else None
+
+class VolumeBackend(QObject):
+    volume_changed = Signal(int)
+
+    def __init__(self, sink="@DEFAULT_SINK@", parent=None):
+        super().__init__(parent)
+        self.sink = sink
+        self.runner = get_runner()
+        self._pending = None
+        self._writing = None
+        # One streamed event feed instead of polling the sink volume
+        self._events = QProcess(self)
+        self._events.setProperty("monitor", True)
+        self._events.readyReadStandardOutput.connect(self._handle_events)
+        self.runner.start_process(self._events, "pactl", ["subscribe"])
+        self.refresh(cache_ttl=VOLUME_CACHE_S)
+
+    def set_volume(self, value):
+        # Only the latest value survives; it goes out once the write in flight returns
+        self._pending = value
+        if self._writing is None:
+            self._apply_pending()
+
+    def refresh(self, cache_ttl=0):
+        # Identical queries already in flight are shared by the runner
+        self.runner.run(self._query_args(), self._handle_volume, timeout=5, cache_ttl=cache_ttl)
+
+    def stop(self):
+        self._pending = None
+        if self._writing:
+            self._writing.cancel()
+            self._writing = None
+        if self._events is not None:
+            self._events.readyReadStandardOutput.disconnect(self._handle_events)
+            self.runner.retire_process(self._events)
+            self._events = None
+
+    def _handle_events(self):
+        data = bytes(self._events.readAllStandardOutput()).decode("utf8", "replace")
+        for line in data.splitlines():
+            if EVENT_RE.search(line.strip()):
+                self.refresh()
+                return
+
+    def _query_args(self):
+        return ["pactl", "get-sink-volume", self.sink]
+
+    def _apply_pending(self):
+        value, self._pending = self._pending, None
+        self.runner.invalidate(self._query_args())
+        self._writing = self.runner.run(["pactl", "set-sink-volume", self.sink, f"{value}%"], self._handle_written, timeout=5)
+
+    def _handle_written(self, result):
+        self._writing = None
+        self.runner.invalidate(self._query_args())  # a query that raced the write may have cached the old level
+        if not result.ok:
+            print(f"Error setting volume: {result.error or result.stderr.strip()}")
+        if self._pending is not None:
+            self._apply_pending()
+
+    def _handle_volume(self, result):
+        if not result.ok:
+            print(f"Error reading volume: {result.error or result.stderr.strip()}")
+            return
+        volume = parse_volume(result.stdout)
+        # A newer write is queued or in flight; reporting the old level would fight the slider
+        if volume is not None and self._pending is None and self._writing is None:
+            self.volume_changed.emit(volume)